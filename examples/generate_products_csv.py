@@ -32,6 +32,13 @@ def main():
     products = finite_state_sdk.get_all_products(token, ORGANIZATION_CONTEXT)
     product_data = []
 
+    # get the count of findings for each severity of every asset version, batched into a few aliased queries
+    severities = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+    asset_version_ids = [str(asset_version['id']) for product in products for asset_version in product['assets']]
+    findings_counts = {}
+    if asset_version_ids:
+        findings_counts = finite_state_sdk.get_findings_counts(token, ORGANIZATION_CONTEXT, asset_version_ids, severities=severities)
+
     for product in products:
         counts = {
             'CRITICAL': 0,
@@ -46,12 +53,8 @@ def main():
         for asset_version in product['assets']:
             asset_version_id = str(asset_version['id'])
 
-            # get the count of findings for each severity
-            severities = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
             for severity in severities:
-                # do this because we can't in-line the findings meta query via the API, yet, and it requires several calls to get the counts
-                count = finite_state_sdk.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=asset_version_id, severity=severity, count=True)['count']
-                counts[severity] += count
+                counts[severity] += findings_counts[asset_version_id][severity]
 
         product_data.append({
             'product_name': product_name,
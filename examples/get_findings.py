@@ -8,11 +8,11 @@ import finite_state_sdk
 
 def main():
     """
-    Get all Findings for a specific asset version
+    Get all Findings for one or more asset versions
     """
     parser = argparse.ArgumentParser(description='Compare two asset versions')
     parser.add_argument('--secrets-file', type=str, help='Path to the secrets file', required=True)
-    parser.add_argument('--asset-version', type=str, help='Asset Version ID', required=True)
+    parser.add_argument('--asset-version', type=str, nargs='+', help='Asset Version ID(s)', required=True)
 
     args = parser.parse_args()
 
@@ -27,15 +27,23 @@ def main():
     # The token is valid for 24 hours
     token = finite_state_sdk.get_auth_token(CLIENT_ID, CLIENT_SECRET)
 
-    # Get all CVE findings for a specific asset version
+    # Get all CRYPTO_MATERIAL findings for each asset version
     # For more info see: https://docs.finitestate.io/types/finding-category
-    findings = finite_state_sdk.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=args.asset_version, category="CRYPTO_MATERIAL")
+    def get_findings(asset_version_id):
+        return finite_state_sdk.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=asset_version_id, category="CRYPTO_MATERIAL")
 
-    print(f'Found {len(findings)} findings')
+    # the asset versions are queried concurrently, and a failure for one does not stop the others
+    for result in finite_state_sdk.fan_out(get_findings, args.asset_version, max_workers=8):
+        if result.error is not None:
+            print(f'Failed to get findings for {result.asset_version_id}: {result.error}')
+            continue
 
-    for finding in findings:
-        if finding["vulnIdFromTool"] and "FS-" in finding["vulnIdFromTool"]:
-            print(f'Finding: {json.dumps(finding, indent=2)}')
+        findings = result.value
+        print(f'Found {len(findings)} findings for {result.asset_version_id}')
+
+        for finding in findings:
+            if finding["vulnIdFromTool"] and "FS-" in finding["vulnIdFromTool"]:
+                print(f'Finding: {json.dumps(finding, indent=2)}')
 
 
 if __name__ == "__main__":
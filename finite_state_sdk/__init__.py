@@ -1,17 +1,69 @@
+import itertools
 import json
+import os
 from enum import Enum
+from threading import Lock
 
-import requests
-import time
 from warnings import warn
 import finite_state_sdk.queries as queries
-from tenacity import retry, retry_if_exception, stop_after_attempt, wait_fixed
+from finite_state_sdk.client import (  # noqa: F401
+    FiniteStateClient,
+    get_default_client,
+    set_default_client,
+    use_client,
+)
+from finite_state_sdk.polling import (  # noqa: F401
+    DEFAULT_POLLING_STRATEGY,
+    PollingCancelledError,
+    PollingStrategy,
+    PollingTimeoutError,
+)
+from finite_state_sdk.retry import DEFAULT_RETRY_POLICY, RetryBudget, RetryPolicy  # noqa: F401
+from finite_state_sdk.upload_journal import DEFAULT_JOURNAL_DIR
 from finite_state_sdk.utils import (
     BreakoutException,
+    FileSlice,
     is_mutation,
-    is_not_breakout_exception,
+    open_output_file,
+    prefetch as prefetch_iterator,
 )
 
+# Names exported by finite_state_sdk that are only imported from their module when first accessed, to keep
+# `import finite_state_sdk` fast
+_LAZY_ATTRIBUTES = {
+    "AdaptiveRateLimiter": "finite_state_sdk.rate_limit",
+    "BatchMetrics": "finite_state_sdk.batching",
+    "ComponentIndex": "finite_state_sdk.component_index",
+    "ExportJob": "finite_state_sdk.exports",
+    "ExportJobsFailedError": "finite_state_sdk.exports",
+    "FanOutResult": "finite_state_sdk.concurrency",
+    "FileRateLimitBackend": "finite_state_sdk.rate_limit",
+    "FindingsMirror": "finite_state_sdk.mirror",
+    "GraphQLBatcher": "finite_state_sdk.batching",
+    "InMemoryCacheBackend": "finite_state_sdk.cache",
+    "ResponseCache": "finite_state_sdk.cache",
+    "SQLiteCacheBackend": "finite_state_sdk.cache",
+    "TokenProvider": "finite_state_sdk.token_provider",
+    "UploadJournal": "finite_state_sdk.upload_journal",
+    "fan_out": "finite_state_sdk.concurrency",
+    "wait_for_exports": "finite_state_sdk.exports",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
+
+
 API_URL = 'https://platform.finitestate.io/api/v1/graphql'
 AUDIENCE = "https://platform.finitestate.io/api/v1/graphql"
 TOKEN_URL = "https://platform.finitestate.io/api/v1/auth/token"
@@ -28,6 +80,32 @@ MAX_CHUNK_SIZE = 1024**2 * 2000
 MIN CHUNK SIZE: 5 MiB
 """
 MIN_CHUNK_SIZE = 1024**2 * 5
+"""
+DEFAULT MAX PART ATTEMPTS: number of pre-signed URLs generated for each part of a multipart upload, a new one each time
+the previous one is rejected as expired
+"""
+DEFAULT_MAX_PART_ATTEMPTS = 3
+"""
+EXPIRED UPLOAD URL STATUS: the status S3 rejects an expired pre-signed URL with
+"""
+EXPIRED_UPLOAD_URL_STATUS = 403
+"""
+DEFAULT DOWNLOAD CHUNK SIZE: 1 MiB, the size of the blocks downloads are streamed to disk in
+"""
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024**2
+"""
+DEFAULT DOWNLOAD PART SIZE: 64 MiB, the size of each Range request when downloading with more than one worker
+"""
+DEFAULT_DOWNLOAD_PART_SIZE = 1024**2 * 64
+"""
+DEFAULT COUNTS BATCH SIZE: the number of finding counts requested in each aliased query by get_findings_counts
+"""
+DEFAULT_COUNTS_BATCH_SIZE = 100
+"""
+DEFAULT FINDINGS BATCH SIZE: the number of asset version IDs in each assetVersionRefId_in filter sent by
+get_findings_for_asset_versions. Larger batches need fewer queries, but each query is slower for the API to resolve
+"""
+DEFAULT_FINDINGS_BATCH_SIZE = 50
 
 
 class UploadMethod(Enum):
@@ -48,6 +126,450 @@ class UploadMethod(Enum):
     AZURE_DEVOPS_INTEGRATION = "AZURE_DEVOPS_INTEGRATION"
 
 
+def _prepare_findings_counts(asset_version_ids, severities=None, categories=None, status=None,
+                             batch_size=DEFAULT_COUNTS_BATCH_SIZE):
+    """
+    Validate the arguments for get_findings_counts and split the counts into batches of aliased count queries.
+
+    Returns:
+        list: (keys, query, variables) for each batch, where keys are the result dict keys of each count in the query
+    """
+    if not asset_version_ids:
+        raise ValueError("Asset Version IDs are required")
+    if isinstance(asset_version_ids, str):
+        asset_version_ids = [asset_version_ids]
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than 0")
+
+    # an empty dimension is not part of the keys, so the result only nests by the dimensions that were asked for
+    dimensions = [list(dict.fromkeys(str(asset_version_id) for asset_version_id in asset_version_ids))]
+    if severities:
+        dimensions.append(list(dict.fromkeys(severities)))
+    if categories:
+        dimensions.append(list(dict.fromkeys(categories)))
+
+    keys = list(itertools.product(*dimensions))
+    batches = []
+    for start in range(0, len(keys), batch_size):
+        batch_keys = keys[start:start + batch_size]
+        filters = []
+        for key in batch_keys:
+            severity = key[1] if severities else None
+            category = key[-1] if categories else None
+            variables = queries.GET_FINDINGS_COUNT['variables'](asset_version_id=key[0], severity=severity,
+                                                                category=category, status=status)
+            filters.append(variables['filter'])
+        batches.append((batch_keys, queries.GET_FINDINGS_COUNTS['query'](len(batch_keys)),
+                        queries.GET_FINDINGS_COUNTS['variables'](filters)))
+    return batches
+
+
+def _prepare_findings_for_asset_versions(asset_version_ids, category=None, status=None, severity=None, fields=None,
+                                         batch_size=DEFAULT_FINDINGS_BATCH_SIZE):
+    """
+    Validate the arguments for get_findings_for_asset_versions and split the asset versions into batches.
+
+    Returns:
+        tuple: (asset version IDs, query, list of variables for each batch)
+    """
+    if not asset_version_ids:
+        raise ValueError("Asset Version IDs are required")
+    if isinstance(asset_version_ids, str):
+        asset_version_ids = [asset_version_ids]
+    if batch_size < 1:
+        raise ValueError("batch_size must be greater than 0")
+
+    asset_version_ids = list(dict.fromkeys(str(asset_version_id) for asset_version_id in asset_version_ids))
+
+    # the findings are grouped by assetVersionRefId, so it is always selected. No profile includes it, so the queries of
+    # get_findings are unchanged
+    if fields is None:
+        fields = "full"
+    if isinstance(fields, str) and fields in queries.FINDING_FIELD_PROFILES:
+        fields = queries.FINDING_FIELD_PROFILES[fields]
+    if not isinstance(fields, str):
+        fields = (*fields, "assetVersionRefId")
+    query = queries.GET_FINDINGS['fields_query'](fields)
+
+    batches = []
+    for start in range(0, len(asset_version_ids), batch_size):
+        batch = asset_version_ids[start:start + batch_size]
+        batches.append(queries.GET_FINDINGS['variables'](asset_version_id=batch, category=category, status=status,
+                                                         severity=severity))
+    return asset_version_ids, query, batches
+
+
+def _group_findings_by_asset_version(asset_version_ids, findings):
+    grouped = {asset_version_id: [] for asset_version_id in asset_version_ids}
+    for finding in findings:
+        grouped.setdefault(str(finding['assetVersionRefId']), []).append(finding)
+    return grouped
+
+
+def _set_findings_count(counts, key, count):
+    """
+    Store a count from an aliased count query in the nested result of get_findings_counts.
+    """
+    for part in key[:-1]:
+        counts = counts.setdefault(part, {})
+    counts[key[-1]] = count
+
+
+def _prepare_report_export(asset_version_id=None, product_id=None, report_type=None, report_subtype=None):
+    """
+    Validate the arguments for a report export and build the launch mutation.
+
+    Returns:
+        tuple: (mutation, variables, name of the mutation field that holds the exportJobId)
+    """
+    if not report_type:
+        raise ValueError("Report Type is required")
+    if not report_subtype:
+        raise ValueError("Report Subtype is required")
+    if not asset_version_id and not product_id:
+        raise ValueError("Asset Version ID or Product ID is required")
+
+    if asset_version_id and product_id:
+        raise ValueError("Asset Version ID and Product ID are mutually exclusive")
+
+    if report_type not in ["CSV", "PDF"]:
+        raise Exception(f"Report Type {report_type} not supported")
+
+    if report_type == "CSV":
+        if report_subtype not in ["ALL_FINDINGS", "ALL_COMPONENTS", "EXPLOIT_INTELLIGENCE"]:
+            raise Exception(f"Report Subtype {report_subtype} not supported")
+
+        export_field = 'launchArtifactCSVExport' if asset_version_id else 'launchProductCSVExport'
+
+    if report_type == "PDF":
+        if report_subtype not in ["RISK_SUMMARY"]:
+            raise Exception(f"Report Subtype {report_subtype} not supported")
+
+        export_field = 'launchArtifactPdfExport' if asset_version_id else 'launchProductPdfExport'
+
+    mutation = queries.LAUNCH_REPORT_EXPORT['mutation'](asset_version_id=asset_version_id, product_id=product_id,
+                                                        report_type=report_type, report_subtype=report_subtype)
+    variables = queries.LAUNCH_REPORT_EXPORT['variables'](asset_version_id=asset_version_id, product_id=product_id,
+                                                          report_type=report_type, report_subtype=report_subtype)
+
+    return mutation, variables, export_field
+
+
+def _prepare_sbom_export(sbom_type=None, sbom_subtype=None, asset_version_id=None):
+    """
+    Validate the arguments for an SBOM export and build the launch mutation.
+
+    Returns:
+        tuple: (mutation, variables, name of the mutation field that holds the exportJobId)
+    """
+    if not sbom_type:
+        raise ValueError("SBOM Type is required")
+    if not sbom_subtype:
+        raise ValueError("SBOM Subtype is required")
+    if not asset_version_id:
+        raise ValueError("Asset Version ID is required")
+
+    if sbom_type not in ["CYCLONEDX", "SPDX"]:
+        raise Exception(f"SBOM Type {sbom_type} not supported")
+
+    if sbom_type == "CYCLONEDX":
+        if sbom_subtype not in ["SBOM_ONLY", "SBOM_WITH_VDR", "VDR_ONLY"]:
+            raise Exception(f"SBOM Subtype {sbom_subtype} not supported")
+
+        return (queries.LAUNCH_CYCLONEDX_EXPORT['mutation'],
+                queries.LAUNCH_CYCLONEDX_EXPORT['variables'](sbom_subtype, asset_version_id),
+                'launchCycloneDxExport')
+
+    if sbom_subtype not in ["SBOM_ONLY"]:
+        raise Exception(f"SBOM Subtype {sbom_subtype} not supported")
+
+    return (queries.LAUNCH_SPDX_EXPORT['mutation'],
+            queries.LAUNCH_SPDX_EXPORT['variables'](sbom_subtype, asset_version_id),
+            'launchSpdxExport')
+
+
+def _check_pagination_arguments(variables, field, limit):
+    """
+    Validate the arguments shared by the paginated query functions.
+    """
+    if not field:
+        raise Exception("Error: field is required")
+    if limit and limit > 1000:
+        raise Exception("Error: limit cannot be greater than 1000")
+    if limit and limit < 1:
+        raise Exception("Error: limit cannot be less than 1")
+    if not variables["first"]:
+        raise Exception("Error: first is required")
+    if variables["first"] < 1:
+        raise Exception("Error: first cannot be less than 1")
+    if variables["first"] > 1000:
+        raise Exception("Error: limit cannot be greater than 1000")
+
+
+def _iter_result_pages(token, organization_context, query, variables, field):
+    """
+    Generator that queries a paginated GraphQL query one page at a time, following the cursor of the last record.
+
+    Yields:
+        list: The records in each page
+    """
+    # query the API for the first page of results
+    response_data = send_graphql_query(token, organization_context, query, dict(variables))
+
+    # if there are no results, stop
+    if not response_data:
+        return
+
+    if field not in response_data['data']:
+        raise Exception(f"Error: {field} not in response JSON")
+
+    page = response_data['data'][field]
+    while page:
+        yield page
+
+        # get the cursor from the last entry in the page, when there is no cursor stop getting more pages
+        cursor = page[-1]['_cursor']
+        if not cursor:
+            return
+
+        response_data = send_graphql_query(token, organization_context, query, dict(variables, after=cursor))
+        page = response_data['data'][field]
+
+
+def _upload_part(token, organization_context, upload_id, upload_key, part_number, chunk, max_attempts):
+    """
+    Upload one part of a multipart upload. Transient failures of the upload are retried by the client's retry policy,
+    so the part is only sent again here if its pre-signed URL expired, e.g. while the part was queued or retried: a new
+    URL is generated, up to max_attempts URLs in all. The chunk is either bytes or a seekable file-like object such as
+    a FileSlice, which is rewound before each attempt.
+
+    Returns:
+        dict: The part data ({"ETag", "PartNumber"}) for completeMultipartUploadV2
+    """
+    for attempt_number in range(1, max_attempts + 1):
+        if hasattr(chunk, 'seek'):
+            chunk.seek(0)
+
+        response = send_graphql_query(token, organization_context, queries.GENERATE_UPLOAD_PART_URL['mutation'],
+                                      queries.GENERATE_UPLOAD_PART_URL['variables'](part_number, upload_id, upload_key))
+
+        chunk_upload_url = response['data']['generateUploadPartUrlV2']['uploadUrl']
+
+        # upload the chunk to the upload URL
+        try:
+            response = upload_bytes_to_url(chunk_upload_url, chunk)
+        except Exception as e:
+            if attempt_number < max_attempts and str(e).startswith(f"Error: {EXPIRED_UPLOAD_URL_STATUS} "):
+                continue
+            raise
+
+        return {
+            "ETag": response.headers['ETag'],
+            "PartNumber": part_number
+        }
+
+
+def _upload_parts(token, organization_context, upload_id, upload_key, file_path, chunk_size, max_workers,
+                  max_part_attempts, journal=None):
+    """
+    Upload every part of a file, one at a time or using a pool of max_workers threads. Each part is streamed from disk.
+    Parts already recorded in the journal are skipped, and each newly uploaded part is recorded in it.
+
+    Returns:
+        list: The part data for completeMultipartUploadV2, ordered by PartNumber
+    """
+    file_size = os.path.getsize(file_path)
+    part_count = (file_size + chunk_size - 1) // chunk_size
+    completed = dict(journal.parts) if journal else {}
+
+    def upload(part_number):
+        offset = (part_number - 1) * chunk_size
+        with FileSlice(file_path, offset, min(chunk_size, file_size - offset)) as part:
+            data = _upload_part(token, organization_context, upload_id, upload_key, part_number, part,
+                                max_part_attempts)
+        if journal:
+            journal.record_part(data["PartNumber"], data["ETag"])
+        return data
+
+    pending = [part_number for part_number in range(1, part_count + 1) if part_number not in completed]
+
+    if max_workers == 1:
+        part_data = [upload(part_number) for part_number in pending]
+    else:
+        from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(upload, part_number) for part_number in pending]
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+
+            # a part failed after all of its attempts, don't start the parts that are still queued
+            failed = [future for future in done if future.exception() is not None]
+            if failed:
+                for future in not_done:
+                    future.cancel()
+                raise failed[0].exception()
+
+            part_data = [future.result() for future in futures]
+
+    part_data.extend({"ETag": etag, "PartNumber": part_number} for part_number, etag in completed.items())
+    return sorted(part_data, key=lambda part: part["PartNumber"])
+
+
+def _get_ranged_download_size(url):
+    """
+    Check whether the server honours Range requests for url, by asking for its first byte. Presigned URLs are only
+    signed for GET, so a HEAD request cannot be used for this.
+
+    Returns:
+        int: The size of the file in bytes, or None if the server does not support Range requests
+    """
+    response = get_default_client().get(url, headers={'Range': 'bytes=0-0'}, stream=True)
+    try:
+        if response.status_code != 206:
+            return None
+        # e.g. "bytes 0-0/1234"
+        total_bytes = response.headers.get('Content-Range', '').rpartition('/')[2]
+        return int(total_bytes) if total_bytes.isdigit() else None
+    finally:
+        response.close()
+
+
+def _download_ranges(url, file_path, total_bytes, chunk_size, part_size, max_workers, progress_callback=None):
+    """
+    Download a file with max_workers concurrent Range requests of part_size bytes, writing each part at its offset in
+    file_path, which must already be total_bytes long.
+    """
+    progress_lock = Lock()
+    bytes_written = 0
+
+    def download(start):
+        nonlocal bytes_written
+        end = min(start + part_size, total_bytes) - 1
+        response = get_default_client().get(url, headers={'Range': f'bytes={start}-{end}'}, stream=True)
+        try:
+            if response.status_code != 206:
+                raise Exception(f"Failed to download bytes {start}-{end} of the file. Status code: {response.status_code}")
+
+            position = start
+            with open(file_path, 'r+b') as file:
+                file.seek(start)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    file.write(chunk)
+                    position += len(chunk)
+                    if progress_callback is not None:
+                        with progress_lock:
+                            bytes_written += len(chunk)
+                            progress_callback(bytes_written, total_bytes)
+
+            if position != end + 1:
+                raise Exception(f"Failed to download bytes {start}-{end} of the file. Received {position - start} bytes")
+        finally:
+            response.close()
+
+    from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(download, start) for start in range(0, total_bytes, part_size)]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+
+        # a part failed, don't start the parts that are still queued
+        failed = [future for future in done if future.exception() is not None]
+        if failed:
+            for future in not_done:
+                future.cancel()
+            raise failed[0].exception()
+
+
+def _download_url_to_file(url, output_filename, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True, compress=False,
+                          progress_callback=None, verbose=False, max_workers=1, part_size=DEFAULT_DOWNLOAD_PART_SIZE):
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than 0")
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than 0")
+    if part_size < 1:
+        raise ValueError("part_size must be greater than 0")
+    if compress and max_workers > 1:
+        raise ValueError("compress cannot be used with max_workers greater than 1")
+
+    if max_workers > 1:
+        total_bytes = _get_ranged_download_size(url)
+
+        # fall back to a single stream if the server does not support Range requests, or the file is only one part
+        if total_bytes is not None and total_bytes > part_size:
+            with open_output_file(output_filename, atomic=atomic) as file:
+                # preallocate the file so each part can be written at its offset
+                file.truncate(total_bytes)
+                file.flush()
+                _download_ranges(url, file.name, total_bytes, chunk_size, part_size, max_workers,
+                                 progress_callback=progress_callback)
+
+            if verbose:
+                print("File downloaded successfully.")
+                print(f'Wrote file to {output_filename}')
+            return
+
+    # Send an HTTP GET request to the URL, without reading the body into memory
+    response = get_default_client().get(url, stream=True)
+    try:
+        # Check if the request was successful (status code 200)
+        if response.status_code != 200:
+            raise Exception(f"Failed to download the file. Status code: {response.status_code}")
+
+        content_length = response.headers.get('Content-Length')
+        total_bytes = int(content_length) if content_length else None
+        bytes_written = 0
+
+        # Write the body to the local file one chunk at a time, so memory use does not depend on the file size
+        with open_output_file(output_filename, atomic=atomic, compress=compress) as file:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                file.write(chunk)
+                bytes_written += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(bytes_written, total_bytes)
+    finally:
+        response.close()
+
+    if verbose:
+        print("File downloaded successfully.")
+        print(f'Wrote file to {output_filename}')
+
+
+def _get_export_download_link(response_data):
+    """
+    Get the download link from a generateExportDownloadPresignedUrl response, or None if the export is not ready yet.
+    """
+    export_status = response_data['data']['generateExportDownloadPresignedUrl']
+    if export_status['status'] == 'COMPLETED' and export_status['downloadLink']:
+        return export_status['downloadLink']
+    return None
+
+
+def _launch_export(token, organization_context, mutation, variables, export_field, verbose=False):
+    """
+    Send an export mutation and return an ExportJob for the export it started.
+    """
+    response_data = send_graphql_query(token, organization_context, mutation, variables)
+    if verbose:
+        print(f'Response Data: {json.dumps(response_data, indent=4)}')
+
+    # get exportJobId from the result
+    export_job_id = response_data['data'][export_field]['exportJobId']
+    if verbose:
+        print(f'Export Job ID: {export_job_id}')
+
+    if not export_job_id:
+        raise Exception(
+            "Error: Export Job ID not found - this should not happen, please contact your Finite State representative")
+
+    from finite_state_sdk.exports import ExportJob
+
+    return ExportJob(token, organization_context, export_job_id)
+
+
 def create_artifact(
     token,
     organization_context,
@@ -986,7 +1508,10 @@ def create_test_as_third_party_scanner(token, organization_context, business_uni
 
 
 def download_asset_version_report(token, organization_context, asset_version_id=None, report_type=None,
-                                  report_subtype=None, output_filename=None, verbose=False):
+                                  report_subtype=None, output_filename=None, verbose=False,
+                                  chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True, compress=False,
+                                  progress_callback=None, max_workers=1, part_size=DEFAULT_DOWNLOAD_PART_SIZE,
+                                  polling=None):
     """
     Download a report for a specific asset version and save it to a local file. This is a blocking call, and can sometimes take minutes to return if the report is very large.
 
@@ -1007,6 +1532,25 @@ def download_asset_version_report(token, organization_context, asset_version_id=
             The local filename to save the report to. If not provided, the report will be saved to a file named "report.csv" or "report.pdf" in the current directory based on the report type.
         verbose (bool, optional):
             If True, will print additional information to the console. Defaults to False.
+        chunk_size (int, optional):
+            The size of the blocks the file is streamed to disk in. Defaults to DEFAULT_DOWNLOAD_CHUNK_SIZE.
+        atomic (bool, optional):
+            If True, the file is downloaded to a temporary file that is renamed to output_filename once complete, so
+            output_filename never holds a partial download. Defaults to True.
+        compress (bool, optional):
+            If True, the file is gzip compressed as it is written. Defaults to False.
+        progress_callback (callable, optional):
+            Called after each chunk is written as progress_callback(bytes_written, total_bytes). total_bytes is None if
+            the server did not send a Content-Length.
+        max_workers (int, optional):
+            If greater than 1, the file is downloaded with up to max_workers concurrent Range requests of part_size
+            bytes each, written into a preallocated file. Falls back to a single stream if the server does not support
+            Range requests. Cannot be combined with compress. Defaults to 1.
+        part_size (int, optional):
+            The size of each Range request when max_workers is greater than 1. Defaults to DEFAULT_DOWNLOAD_PART_SIZE.
+        polling (PollingStrategy, optional):
+            How to poll for the export job to complete, including an optional deadline and cancel hook. Defaults to
+            DEFAULT_POLLING_STRATEGY.
 
     Raises:
         ValueError: Raised if required parameters are not provided.
@@ -1016,26 +1560,17 @@ def download_asset_version_report(token, organization_context, asset_version_id=
         None
     """
     url = generate_report_download_url(token, organization_context, asset_version_id=asset_version_id,
-                                       report_type=report_type, report_subtype=report_subtype, verbose=verbose)
-
-    # Send an HTTP GET request to the URL
-    response = requests.get(url)
-
-    # Check if the request was successful (status code 200)
-    if response.status_code == 200:
-        # Open a local file in binary write mode and write the content to it
-        if verbose:
-            print("File downloaded successfully.")
-        with open(output_filename, 'wb') as file:
-            file.write(response.content)
-            if verbose:
-                print(f'Wrote file to {output_filename}')
-    else:
-        raise Exception(f"Failed to download the file. Status code: {response.status_code}")
+                                       report_type=report_type, report_subtype=report_subtype, verbose=verbose,
+                                       polling=polling)
+    _download_url_to_file(url, output_filename, chunk_size=chunk_size, atomic=atomic, compress=compress,
+                          progress_callback=progress_callback, verbose=verbose, max_workers=max_workers,
+                          part_size=part_size)
 
 
 def download_product_report(token, organization_context, product_id=None, report_type=None, report_subtype=None,
-                            output_filename=None, verbose=False):
+                            output_filename=None, verbose=False, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True,
+                            compress=False, progress_callback=None, max_workers=1,
+                            part_size=DEFAULT_DOWNLOAD_PART_SIZE, polling=None):
     """
     Download a report for a specific product and save it to a local file. This is a blocking call, and can sometimes take minutes to return if the report is very large.
 
@@ -1055,28 +1590,37 @@ def download_product_report(token, organization_context, product_id=None, report
             The local filename to save the report to. If not provided, the report will be saved to a file named "report.csv" or "report.pdf" in the current directory based on the report type.
         verbose (bool, optional):
             If True, will print additional information to the console. Defaults to False.
+        chunk_size (int, optional):
+            The size of the blocks the file is streamed to disk in. Defaults to DEFAULT_DOWNLOAD_CHUNK_SIZE.
+        atomic (bool, optional):
+            If True, the file is downloaded to a temporary file that is renamed to output_filename once complete, so
+            output_filename never holds a partial download. Defaults to True.
+        compress (bool, optional):
+            If True, the file is gzip compressed as it is written. Defaults to False.
+        progress_callback (callable, optional):
+            Called after each chunk is written as progress_callback(bytes_written, total_bytes). total_bytes is None if
+            the server did not send a Content-Length.
+        max_workers (int, optional):
+            If greater than 1, the file is downloaded with up to max_workers concurrent Range requests of part_size
+            bytes each, written into a preallocated file. Falls back to a single stream if the server does not support
+            Range requests. Cannot be combined with compress. Defaults to 1.
+        part_size (int, optional):
+            The size of each Range request when max_workers is greater than 1. Defaults to DEFAULT_DOWNLOAD_PART_SIZE.
+        polling (PollingStrategy, optional):
+            How to poll for the export job to complete, including an optional deadline and cancel hook. Defaults to
+            DEFAULT_POLLING_STRATEGY.
     """
     url = generate_report_download_url(token, organization_context, product_id=product_id, report_type=report_type,
-                                       report_subtype=report_subtype, verbose=verbose)
-
-    # Send an HTTP GET request to the URL
-    response = requests.get(url)
-
-    # Check if the request was successful (status code 200)
-    if response.status_code == 200:
-        # Open a local file in binary write mode and write the content to it
-        if verbose:
-            print("File downloaded successfully.")
-        with open(output_filename, 'wb') as file:
-            file.write(response.content)
-            if verbose:
-                print(f'Wrote file to {output_filename}')
-    else:
-        raise Exception(f"Failed to download the file. Status code: {response.status_code}")
+                                       report_subtype=report_subtype, verbose=verbose, polling=polling)
+    _download_url_to_file(url, output_filename, chunk_size=chunk_size, atomic=atomic, compress=compress,
+                          progress_callback=progress_callback, verbose=verbose, max_workers=max_workers,
+                          part_size=part_size)
 
 
 def download_sbom(token, organization_context, sbom_type="CYCLONEDX", sbom_subtype="SBOM_ONLY", asset_version_id=None,
-                  output_filename="sbom.json", verbose=False):
+                  output_filename="sbom.json", verbose=False, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True,
+                  compress=False, progress_callback=None, max_workers=1, part_size=DEFAULT_DOWNLOAD_PART_SIZE,
+                  polling=None):
     """
     Download an SBOM for an Asset Version and save it to a local file. This is a blocking call, and can sometimes take minutes to return if the SBOM is very large.
 
@@ -1095,6 +1639,25 @@ def download_sbom(token, organization_context, sbom_type="CYCLONEDX", sbom_subty
             The local filename to save the SBOM to. If not provided, the SBOM will be saved to a file named "sbom.json" in the current directory.
         verbose (bool, optional):
             If True, will print additional information to the console. Defaults to False.
+        chunk_size (int, optional):
+            The size of the blocks the file is streamed to disk in. Defaults to DEFAULT_DOWNLOAD_CHUNK_SIZE.
+        atomic (bool, optional):
+            If True, the file is downloaded to a temporary file that is renamed to output_filename once complete, so
+            output_filename never holds a partial download. Defaults to True.
+        compress (bool, optional):
+            If True, the file is gzip compressed as it is written. Defaults to False.
+        progress_callback (callable, optional):
+            Called after each chunk is written as progress_callback(bytes_written, total_bytes). total_bytes is None if
+            the server did not send a Content-Length.
+        max_workers (int, optional):
+            If greater than 1, the file is downloaded with up to max_workers concurrent Range requests of part_size
+            bytes each, written into a preallocated file. Falls back to a single stream if the server does not support
+            Range requests. Cannot be combined with compress. Defaults to 1.
+        part_size (int, optional):
+            The size of each Range request when max_workers is greater than 1. Defaults to DEFAULT_DOWNLOAD_PART_SIZE.
+        polling (PollingStrategy, optional):
+            How to poll for the export job to complete, including an optional deadline and cancel hook. Defaults to
+            DEFAULT_POLLING_STRATEGY.
 
     Raises:
         ValueError: Raised if required parameters are not provided.
@@ -1104,22 +1667,10 @@ def download_sbom(token, organization_context, sbom_type="CYCLONEDX", sbom_subty
         None
     """
     url = generate_sbom_download_url(token, organization_context, sbom_type=sbom_type, sbom_subtype=sbom_subtype,
-                                     asset_version_id=asset_version_id, verbose=verbose)
-
-    # Send an HTTP GET request to the URL
-    response = requests.get(url)
-
-    # Check if the request was successful (status code 200)
-    if response.status_code == 200:
-        # Open a local file in binary write mode and write the content to it
-        if verbose:
-            print("File downloaded successfully.")
-        with open(output_filename, 'wb') as file:
-            file.write(response.content)
-            if verbose:
-                print(f'Wrote file to {output_filename}')
-    else:
-        raise Exception(f"Failed to download the file. Status code: {response.status_code}")
+                                     asset_version_id=asset_version_id, verbose=verbose, polling=polling)
+    _download_url_to_file(url, output_filename, chunk_size=chunk_size, atomic=atomic, compress=compress,
+                          progress_callback=progress_callback, verbose=verbose, max_workers=max_workers,
+                          part_size=part_size)
 
 
 def file_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
@@ -1147,6 +1698,28 @@ def file_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
                 break
 
 
+def file_slices(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Helper method to split a file into parts without reading it. Each part is a FileSlice that streams its bytes from the
+    file when read, so memory use does not depend on chunk_size. Close each part when done with it.
+
+    Args:
+        file_path (str):
+            Local path to the file to split.
+        chunk_size (int, optional):
+            The size of the parts. Defaults to DEFAULT_CHUNK_SIZE.
+
+    Yields:
+        FileSlice: The next part of the file.
+
+    Raises:
+        FileIO Exceptions: Raised if the file cannot be opened or read correctly.
+    """
+    file_size = os.path.getsize(file_path)
+    for offset in range(0, file_size, chunk_size):
+        yield FileSlice(file_path, offset, min(chunk_size, file_size - offset))
+
+
 def get_all_artifacts(token, organization_context, artifact_id=None, business_unit_id=None):
     """
     Get all artifacts in the organization. Uses pagination to get all results.
@@ -1279,8 +1852,9 @@ def get_all_paginated_results(token, organization_context, query, variables=None
     Get all results from a paginated GraphQL query
 
     Args:
-        token (str):
+        token (str or TokenProvider):
             Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string, that is handled inside the method.
+            A TokenProvider can be passed instead, and if token is None the client's token_provider is used.
         organization_context (str):
             Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
         query (str):
@@ -1299,56 +1873,8 @@ def get_all_paginated_results(token, organization_context, query, variables=None
         list: List of results
     """
 
-    if not field:
-        raise Exception("Error: field is required")
-    if limit and limit > 1000:
-        raise Exception("Error: limit cannot be greater than 1000")
-    if limit and limit < 1:
-        raise Exception("Error: limit cannot be less than 1")
-    if not variables["first"]:
-        raise Exception("Error: first is required")
-    if variables["first"] < 1:
-        raise Exception("Error: first cannot be less than 1")
-    if variables["first"] > 1000:
-        raise Exception("Error: limit cannot be greater than 1000")
-
-    # query the API for the first page of results
-    response_data = send_graphql_query(token, organization_context, query, variables)
-
-    # if there are no results, return an empty list
-    if not response_data:
-        return []
-
-    # create a list to store the results
-    results = []
-
-    # add the first page of results to the list
-    if field in response_data['data']:
-        results.extend(response_data['data'][field])
-    else:
-        raise Exception(f"Error: {field} not in response JSON")
-
-    if len(response_data['data'][field]) > 0:
-        # get the cursor from the last entry in the list
-        cursor = response_data['data'][field][len(response_data['data'][field]) - 1]['_cursor']
-
-        while cursor:
-            if limit and len(results) == limit:
-                break
-
-            variables['after'] = cursor
-
-            # add the next page of results to the list
-            response_data = send_graphql_query(token, organization_context, query, variables)
-            results.extend(response_data['data'][field])
-
-            try:
-                cursor = response_data['data'][field][len(response_data['data'][field]) - 1]['_cursor']
-            except IndexError:
-                # when there is no additional cursor, stop getting more pages
-                cursor = None
-
-    return results
+    return list(iter_paginated_results(token, organization_context, query, variables=variables, field=field,
+                                       limit=limit))
 
 
 def get_all_products(token, organization_context):
@@ -1500,7 +2026,7 @@ def get_auth_token(client_id, client_secret, token_url=TOKEN_URL, audience=AUDIE
         'content-type': "application/json"
     }
 
-    response = requests.post(TOKEN_URL, data=json.dumps(payload), headers=headers)
+    response = get_default_client().post(TOKEN_URL, data=json.dumps(payload), headers=headers)
     if response.status_code == 200:
         auth_token = response.json()['access_token']
     else:
@@ -1519,6 +2045,7 @@ def get_findings(
     severity=None,
     count=False,
     limit=None,
+    fields=None,
 ):
     """
     Gets all the Findings for an Asset Version. Uses pagination to get all results.
@@ -1542,8 +2069,12 @@ def get_findings(
             If True, will return the count of findings instead of the findings themselves. Defaults to False.
         limit (int, optional):
             The maximum number of findings to return. By default, this is None. Limit must be between 1 and 1000.
+        fields (str or list, optional):
+            The fields to return for each Finding: a profile name from queries.FINDING_FIELD_PROFILES ("minimal", "triage" or "full"), or a list of field names from queries.FINDING_FIELDS.
+            Selecting fewer fields makes responses smaller and faster to resolve. By default, this is None to return all fields.
 
     Raises:
+        ValueError: Raised if fields contains an unknown profile or field name.
         Exception: Raised if the query fails, required parameters are not specified, or parameters are incompatible.
 
     Returns:
@@ -1562,13 +2093,105 @@ def get_findings(
                                                                           status=status, severity=severity,
                                                                           limit=limit))["data"]["_allFindingsMeta"]
     else:
-        return get_all_paginated_results(token, organization_context, queries.GET_FINDINGS['query'],
+        return get_all_paginated_results(token, organization_context, queries.GET_FINDINGS['fields_query'](fields),
                                          queries.GET_FINDINGS['variables'](asset_version_id=asset_version_id,
                                                                            finding_id=finding_id, category=category,
                                                                            status=status, severity=severity,
                                                                            limit=limit), 'allFindings', limit=limit)
 
 
+def get_findings_counts(token, organization_context, asset_version_ids, severities=None, categories=None, status=None,
+                        batch_size=DEFAULT_COUNTS_BATCH_SIZE):
+    """
+    Count the Findings of many Asset Versions, optionally broken down by severity and category. Instead of one request
+    per count, the counts are requested as aliased fields of a single query, batch_size counts at a time.
+
+    Args:
+        token (str):
+            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string.
+        organization_context (str):
+            Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
+        asset_version_ids (list):
+            The Asset Version IDs to count findings for.
+        severities (list, optional):
+            The severities to count separately, e.g. ["CRITICAL", "HIGH"]. If not specified, findings of every severity are counted together.
+        categories (list, optional):
+            The categories to count separately, e.g. ["CVE", "CREDENTIALS"]. If not specified, findings of every category are counted together.
+        status (str, optional):
+            Only count findings with this status.
+        batch_size (int, optional):
+            The number of counts to request in each query. Defaults to DEFAULT_COUNTS_BATCH_SIZE.
+
+    Raises:
+        ValueError: Raised if asset_version_ids is empty, or batch_size is less than 1.
+        Exception: Raised if a query fails.
+
+    Returns:
+        dict: Counts keyed by Asset Version ID, then by severity if severities were given, then by category if categories
+        were given, e.g. {"av1": {"CRITICAL": {"CVE": 3}}}, or {"av1": 12} with neither.
+    """
+    counts = {}
+    for keys, query, variables in _prepare_findings_counts(asset_version_ids, severities=severities,
+                                                           categories=categories, status=status,
+                                                           batch_size=batch_size):
+        response_data = send_graphql_query(token, organization_context, query, variables)
+        for i, key in enumerate(keys):
+            _set_findings_count(counts, key, response_data['data'][f'count{i}']['count'])
+    return counts
+
+
+def get_findings_for_asset_versions(token, organization_context, asset_version_ids, category=None, status=None,
+                                    severity=None, fields=None, group_by=True, batch_size=DEFAULT_FINDINGS_BATCH_SIZE,
+                                    prefetch=0):
+    """
+    Gets the Findings of many Asset Versions. Instead of one paginated query per asset version, the asset versions are
+    queried batch_size at a time with an assetVersionRefId_in filter, in pages of queries.DEFAULT_PAGE_SIZE findings,
+    and the findings are then grouped by asset version. A batch has the findings of many asset versions, so pass a
+    smaller field profile such as "triage" where the full selection is not needed.
+
+    Args:
+        token (str):
+            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string.
+        organization_context (str):
+            Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
+        asset_version_ids (list):
+            The Asset Version IDs to get findings for.
+        category (str, optional):
+            The category of Findings to return, as for get_findings. This can be a single string, or an array of values.
+        status (str, optional):
+            The status of Findings to return.
+        severity (str, optional):
+            The severity of Findings to return, as for get_findings.
+        fields (str or list, optional):
+            The fields to return for each Finding, as for get_findings. assetVersionRefId is always returned. By default, this is None to return all fields.
+        group_by (bool, optional):
+            If True, return the findings grouped by Asset Version ID. If False, return a single list. Defaults to True.
+        batch_size (int, optional):
+            The number of asset versions to query at a time. Defaults to DEFAULT_FINDINGS_BATCH_SIZE.
+        prefetch (int, optional):
+            The number of pages to fetch ahead on a background thread, as for iter_paginated_results. Defaults to 0.
+
+    Raises:
+        ValueError: Raised if asset_version_ids is empty, batch_size is less than 1, or fields contains an unknown profile or field name.
+        Exception: Raised if a query fails.
+
+    Returns:
+        dict: Lists of Finding Objects keyed by Asset Version ID, with an empty list for asset versions without findings, or a list of Finding Objects if group_by is False
+    """
+    asset_version_ids, query, batches = _prepare_findings_for_asset_versions(asset_version_ids, category=category,
+                                                                             status=status, severity=severity,
+                                                                             fields=fields, batch_size=batch_size)
+
+    findings = []
+    for variables in batches:
+        findings.extend(iter_paginated_results(token, organization_context, query, variables, 'allFindings',
+                                               prefetch=prefetch))
+
+    if not group_by:
+        return findings
+    return _group_findings_by_asset_version(asset_version_ids, findings)
+
+
 def get_product_asset_versions(token, organization_context, product_id=None):
     """
     Gets all the asset versions for a product.
@@ -1616,7 +2239,7 @@ def get_products(token, organization_context, product_id=None, business_unit_id=
 
 
 def generate_report_download_url(token, organization_context, asset_version_id=None, product_id=None, report_type=None,
-                                 report_subtype=None, verbose=False) -> str:
+                                 report_subtype=None, verbose=False, polling=None) -> str:
     """
     Blocking call: Initiates generation of a report, and returns a pre-signed URL for downloading the report.
     This may take several minutes to complete, depending on the size of the report.
@@ -1638,104 +2261,18 @@ def generate_report_download_url(token, organization_context, asset_version_id=N
             Valid values for PDF are "RISK_SUMMARY".
         verbose (bool, optional):
             If True, print additional information to the console. Defaults to False.
+        polling (PollingStrategy, optional):
+            How to poll for the export job to complete, including an optional deadline and cancel hook. Defaults to
+            DEFAULT_POLLING_STRATEGY.
     """
-    if not report_type:
-        raise ValueError("Report Type is required")
-    if not report_subtype:
-        raise ValueError("Report Subtype is required")
-    if not asset_version_id and not product_id:
-        raise ValueError("Asset Version ID or Product ID is required")
-
-    if asset_version_id and product_id:
-        raise ValueError("Asset Version ID and Product ID are mutually exclusive")
-
-    if report_type not in ["CSV", "PDF"]:
-        raise Exception(f"Report Type {report_type} not supported")
-
-    if report_type == "CSV":
-        if report_subtype not in ["ALL_FINDINGS", "ALL_COMPONENTS", "EXPLOIT_INTELLIGENCE"]:
-            raise Exception(f"Report Subtype {report_subtype} not supported")
-
-        mutation = queries.LAUNCH_REPORT_EXPORT['mutation'](asset_version_id=asset_version_id, product_id=product_id,
-                                                            report_type=report_type, report_subtype=report_subtype)
-        variables = queries.LAUNCH_REPORT_EXPORT['variables'](asset_version_id=asset_version_id, product_id=product_id,
-                                                              report_type=report_type, report_subtype=report_subtype)
-
-        response_data = send_graphql_query(token, organization_context, mutation, variables)
-        if verbose:
-            print(f'Response Data: {json.dumps(response_data, indent=4)}')
-
-        # get exportJobId from the result
-        if asset_version_id:
-            export_job_id = response_data['data']['launchArtifactCSVExport']['exportJobId']
-        elif product_id:
-            export_job_id = response_data['data']['launchProductCSVExport']['exportJobId']
-        else:
-            raise Exception(
-                "Error: Export Job ID not found - this should not happen, please contact your Finite State representative")
-
-        if verbose:
-            print(f'Export Job ID: {export_job_id}')
-
-    if report_type == "PDF":
-        if report_subtype not in ["RISK_SUMMARY"]:
-            raise Exception(f"Report Subtype {report_subtype} not supported")
-
-        mutation = queries.LAUNCH_REPORT_EXPORT['mutation'](asset_version_id=asset_version_id, product_id=product_id,
-                                                            report_type=report_type, report_subtype=report_subtype)
-        variables = queries.LAUNCH_REPORT_EXPORT['variables'](asset_version_id=asset_version_id, product_id=product_id,
-                                                              report_type=report_type, report_subtype=report_subtype)
-
-        response_data = send_graphql_query(token, organization_context, mutation, variables)
-        if verbose:
-            print(f'Response Data: {json.dumps(response_data, indent=4)}')
-
-        # get exportJobId from the result
-        if asset_version_id:
-            export_job_id = response_data['data']['launchArtifactPdfExport']['exportJobId']
-        elif product_id:
-            export_job_id = response_data['data']['launchProductPdfExport']['exportJobId']
-        else:
-            raise Exception(
-                "Error: Export Job ID not found - this should not happen, please contact your Finite State representative")
-
-        if verbose:
-            print(f'Export Job ID: {export_job_id}')
-
-    if not export_job_id:
-        raise Exception(
-            "Error: Export Job ID not found - this should not happen, please contact your Finite State representative")
-
-    # poll the API until the export job is complete
-    sleep_time = 10
-    total_time = 0
-    if verbose:
-        print(f'Polling every {sleep_time} seconds for export job to complete')
-
-    while True:
-        time.sleep(sleep_time)
-        total_time += sleep_time
-        if verbose:
-            print(f'Total time elapsed: {total_time} seconds')
-
-        query = queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['query']
-        variables = queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['variables'](export_job_id)
-
-        response_data = send_graphql_query(token, organization_context, query, variables)
-
-        if verbose:
-            print(f'Response Data: {json.dumps(response_data, indent=4)}')
-
-        if response_data['data']['generateExportDownloadPresignedUrl']['status'] == 'COMPLETED':
-            if response_data['data']['generateExportDownloadPresignedUrl']['downloadLink']:
-                if verbose:
-                    print(
-                        f'Export Job Complete. Download URL: {response_data["data"]["generateExportDownloadPresignedUrl"]["downloadLink"]}')
-                return response_data['data']['generateExportDownloadPresignedUrl']['downloadLink']
+    export_job = launch_report_export(token, organization_context, asset_version_id=asset_version_id,
+                                      product_id=product_id, report_type=report_type, report_subtype=report_subtype,
+                                      verbose=verbose)
+    return export_job.wait(polling=polling, verbose=verbose)
 
 
 def generate_sbom_download_url(token, organization_context, sbom_type=None, sbom_subtype=None, asset_version_id=None,
-                               verbose=False) -> str:
+                               verbose=False, polling=None) -> str:
     """
     Blocking call: Initiates generation of an SBOM for the asset_version_id, and return a pre-signed URL for downloading the SBOM.
     This may take several minutes to complete, depending on the size of SBOM.
@@ -1753,112 +2290,222 @@ def generate_sbom_download_url(token, organization_context, sbom_type=None, sbom
             Asset Version ID to download the SBOM for.
         verbose (bool, optional):
             If True, print additional information to the console. Defaults to False.
+        polling (PollingStrategy, optional):
+            How to poll for the export job to complete, including an optional deadline and cancel hook. Defaults to
+            DEFAULT_POLLING_STRATEGY.
 
     Raises:
         ValueError: Raised if sbom_type, sbom_subtype, or asset_version_id are not provided.
         Exception: Raised if the query fails.
+        PollingTimeoutError: Raised if the export does not complete within the polling timeout.
+        PollingCancelledError: Raised if the polling cancel hook returns True.
 
     Returns:
         str: URL to download the SBOM from.
     """
+    export_job = launch_sbom_export(token, organization_context, sbom_type=sbom_type, sbom_subtype=sbom_subtype,
+                                    asset_version_id=asset_version_id, verbose=verbose)
+    return export_job.wait(polling=polling, verbose=verbose)
 
-    if not sbom_type:
-        raise ValueError("SBOM Type is required")
-    if not sbom_subtype:
-        raise ValueError("SBOM Subtype is required")
+
+def get_software_components(token, organization_context, asset_version_id=None, type=None, fields=None) -> list:
+    """
+    Gets all the Software Components for an Asset Version. Uses pagination to get all results.
+    Args:
+        token (str):
+            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string.
+        organization_context (str):
+            Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
+        asset_version_id (str, optional):
+            Asset Version ID to get software components for.
+        type (str, optional):
+            The type of software component to return. Valid values are "APPLICATION", "ARCHIVE", "CONTAINER", "DEVICE", "FILE", "FIRMWARE", "FRAMEWORK", "INSTALL", "LIBRARY", "OPERATING_SYSTEM", "OTHER", "SERVICE", "SOURCE". If not specified, will return all software components. See https://docs.finitestate.io/types/software-component-type
+        fields (str or list, optional):
+            The fields to return for each Software Component: a profile name from queries.SOFTWARE_COMPONENT_FIELD_PROFILES ("minimal", "triage" or "full"), or a list of field names from queries.SOFTWARE_COMPONENT_FIELDS.
+            By default, this is None to return all fields.
+    Raises:
+        ValueError: Raised if fields contains an unknown profile or field name.
+        Exception: Raised if the query fails, required parameters are not specified, or parameters are incompatible.
+    Returns:
+        list: List of Software Component Objects
+    """
     if not asset_version_id:
-        raise ValueError("Asset Version ID is required")
+        raise Exception("Asset Version ID is required")
 
-    if sbom_type not in ["CYCLONEDX", "SPDX"]:
-        raise Exception(f"SBOM Type {sbom_type} not supported")
+    return get_all_paginated_results(token, organization_context, queries.GET_SOFTWARE_COMPONENTS['fields_query'](fields),
+                                     queries.GET_SOFTWARE_COMPONENTS['variables'](asset_version_id=asset_version_id,
+                                                                                  type=type),
+                                     'allSoftwareComponentInstances')
 
-    if sbom_type == "CYCLONEDX":
-        if sbom_subtype not in ["SBOM_ONLY", "SBOM_WITH_VDR", "VDR_ONLY"]:
-            raise Exception(f"SBOM Subtype {sbom_subtype} not supported")
 
-        mutation = queries.LAUNCH_CYCLONEDX_EXPORT['mutation']
-        variables = queries.LAUNCH_CYCLONEDX_EXPORT['variables'](sbom_subtype, asset_version_id)
+def iter_assets(token, organization_context, asset_id=None, business_unit_id=None, prefetch=0):
+    """
+    Iterate over the assets in the organization, fetching one page at a time. See get_all_assets for the arguments, and
+    iter_paginated_results for `prefetch`.
 
-        response_data = send_graphql_query(token, organization_context, mutation, variables)
-        if verbose:
-            print(f'Response Data: {json.dumps(response_data, indent=4)}')
+    Yields:
+        dict: Asset Object
+    """
+    return iter_paginated_results(token, organization_context, queries.ALL_ASSETS['query'],
+                                  queries.ALL_ASSETS['variables'](asset_id, business_unit_id), 'allAssets',
+                                  prefetch=prefetch)
 
-        # get exportJobId from the result
-        export_job_id = response_data['data']['launchCycloneDxExport']['exportJobId']
-        if verbose:
-            print(f'Export Job ID: {export_job_id}')
 
-    if sbom_type == "SPDX":
-        if sbom_subtype not in ["SBOM_ONLY"]:
-            raise Exception(f"SBOM Subtype {sbom_subtype} not supported")
+def iter_findings(token, organization_context, asset_version_id=None, finding_id=None, category=None, status=None,
+                  severity=None, limit=None, prefetch=0, fields=None):
+    """
+    Iterate over Findings, fetching one page at a time. See get_findings for the arguments, and iter_paginated_results
+    for `prefetch`.
 
-        mutation = queries.LAUNCH_SPDX_EXPORT['mutation']
-        variables = queries.LAUNCH_SPDX_EXPORT['variables'](sbom_subtype, asset_version_id)
+    Yields:
+        dict: Finding Object
+    """
+    if limit and limit > 1000:
+        raise Exception("Error: limit must be less than 1000")
+    if limit and limit < 1:
+        raise Exception("Error: limit must be greater than 0")
 
-        response_data = send_graphql_query(token, organization_context, mutation, variables)
-        if verbose:
-            print(f'Response Data: {json.dumps(response_data, indent=4)}')
+    return iter_paginated_results(token, organization_context, queries.GET_FINDINGS['fields_query'](fields),
+                                  queries.GET_FINDINGS['variables'](asset_version_id=asset_version_id,
+                                                                    finding_id=finding_id, category=category,
+                                                                    status=status, severity=severity, limit=limit),
+                                  'allFindings', limit=limit, prefetch=prefetch)
 
-        # get exportJobId from the result
-        export_job_id = response_data['data']['launchSpdxExport']['exportJobId']
-        if verbose:
-            print(f'Export Job ID: {export_job_id}')
 
-    if not export_job_id:
-        raise Exception(
-            "Error: Export Job ID not found - this should not happen, please contact your Finite State representative")
+def iter_paginated_results(token, organization_context, query, variables=None, field=None, limit=None, prefetch=0):
+    """
+    Iterate over the results of a paginated GraphQL query. Pages are requested as the iterator is consumed and only one
+    page is held in memory at a time, so records can be processed (e.g. written to a CSV or database) as they arrive.
+    With `prefetch`, the next pages are fetched on a background thread while the caller processes the current one.
 
-    # poll the API until the export job is complete
-    sleep_time = 10
-    total_time = 0
-    if verbose:
-        print(f'Polling every {sleep_time} seconds for export job to complete')
-    while True:
-        time.sleep(sleep_time)
-        total_time += sleep_time
-        if verbose:
-            print(f'Total time elapsed: {total_time} seconds')
+    Args:
+        token (str or TokenProvider):
+            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string, that is handled inside the method.
+            A TokenProvider can be passed instead, and if token is None the client's token_provider is used.
+        organization_context (str):
+            Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
+        query (str):
+            The GraphQL query string
+        variables (dict, optional):
+            Variables to be used in the GraphQL query, by default None
+        field (str, required):
+            The field in the response JSON that contains the results
+        limit (int, Optional):
+            The maximum number of results to return. By default, None to return all results. Limit cannot be greater than 1000.
+        prefetch (int, optional):
+            The number of pages to fetch ahead of the caller on a background thread. By default, 0 to fetch each page only when it is needed.
 
-        query = queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['query']
-        variables = queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['variables'](export_job_id)
+    Raises:
+        Exception: If the arguments are invalid. Query failures are raised while iterating.
 
-        response_data = send_graphql_query(token, organization_context, query, variables)
+    Yields:
+        dict: The next result
+    """
+    _check_pagination_arguments(variables, field, limit)
+    if prefetch < 0:
+        raise Exception("Error: prefetch cannot be less than 0")
+
+    def records():
+        pages = _iter_result_pages(token, organization_context, query, variables, field)
+        if prefetch:
+            pages = prefetch_iterator(pages, depth=prefetch)
 
-        if verbose:
-            print(f'Response Data: {json.dumps(response_data, indent=4)}')
+        count = 0
+        for page in pages:
+            for record in page:
+                yield record
+                count += 1
+                if limit and count >= limit:
+                    return
 
-        if response_data['data']['generateExportDownloadPresignedUrl']['status'] == "COMPLETED":
-            if response_data['data']['generateExportDownloadPresignedUrl']['downloadLink']:
-                if verbose:
-                    print(
-                        f'Export Job Complete. Download URL: {response_data["data"]["generateExportDownloadPresignedUrl"]["downloadLink"]}')
-                return response_data['data']['generateExportDownloadPresignedUrl']['downloadLink']
+    return records()
 
 
-def get_software_components(token, organization_context, asset_version_id=None, type=None) -> list:
+def iter_software_components(token, organization_context, asset_version_id=None, type=None, prefetch=0, fields=None):
     """
-    Gets all the Software Components for an Asset Version. Uses pagination to get all results.
+    Iterate over the Software Components for an Asset Version, fetching one page at a time. See get_software_components
+    for the arguments, and iter_paginated_results for `prefetch`.
+
+    Yields:
+        dict: Software Component Object
+    """
+    if not asset_version_id:
+        raise Exception("Asset Version ID is required")
+
+    return iter_paginated_results(token, organization_context, queries.GET_SOFTWARE_COMPONENTS['fields_query'](fields),
+                                  queries.GET_SOFTWARE_COMPONENTS['variables'](asset_version_id=asset_version_id,
+                                                                               type=type),
+                                  'allSoftwareComponentInstances', prefetch=prefetch)
+
+
+def launch_report_export(token, organization_context, asset_version_id=None, product_id=None, report_type=None,
+                         report_subtype=None, verbose=False):
+    """
+    Non-blocking call: Initiates generation of a report, and returns an ExportJob handle without waiting for the
+    report to be generated. Use ExportJob.wait() or wait_for_exports() to get the pre-signed URL for downloading it.
+
     Args:
         token (str):
-            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string.
+            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string, that is handled inside the method.
         organization_context (str):
             Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
         asset_version_id (str, optional):
-            Asset Version ID to get software components for.
-        type (str, optional):
-            The type of software component to return. Valid values are "APPLICATION", "ARCHIVE", "CONTAINER", "DEVICE", "FILE", "FIRMWARE", "FRAMEWORK", "INSTALL", "LIBRARY", "OPERATING_SYSTEM", "OTHER", "SERVICE", "SOURCE". If not specified, will return all software components. See https://docs.finitestate.io/types/software-component-type
+            Asset Version ID to generate the report for. Either `asset_version_id` or `product_id` are required.
+        product_id (str, optional):
+            Product ID to generate the report for. Either `asset_version_id` or `product_id` are required.
+        report_type (str, required):
+            The file type of the report. Valid values are "CSV" and "PDF".
+        report_subtype (str, required):
+            The type of report. Based on available reports for the `report_type` specified
+            Valid values for CSV are "ALL_FINDINGS", "ALL_COMPONENTS", "EXPLOIT_INTELLIGENCE".
+            Valid values for PDF are "RISK_SUMMARY".
+        verbose (bool, optional):
+            If True, print additional information to the console. Defaults to False.
+
     Raises:
-        Exception: Raised if the query fails, required parameters are not specified, or parameters are incompatible.
+        ValueError: Raised if required parameters are not provided.
+        Exception: Raised if the query fails.
+
     Returns:
-        list: List of Software Component Objects
+        ExportJob: Handle for the export job.
     """
-    if not asset_version_id:
-        raise Exception("Asset Version ID is required")
+    mutation, variables, export_field = _prepare_report_export(asset_version_id=asset_version_id,
+                                                               product_id=product_id, report_type=report_type,
+                                                               report_subtype=report_subtype)
+    return _launch_export(token, organization_context, mutation, variables, export_field, verbose=verbose)
 
-    return get_all_paginated_results(token, organization_context, queries.GET_SOFTWARE_COMPONENTS['query'],
-                                     queries.GET_SOFTWARE_COMPONENTS['variables'](asset_version_id=asset_version_id,
-                                                                                  type=type),
-                                     'allSoftwareComponentInstances')
+
+def launch_sbom_export(token, organization_context, sbom_type=None, sbom_subtype=None, asset_version_id=None,
+                       verbose=False):
+    """
+    Non-blocking call: Initiates generation of an SBOM for the asset_version_id, and returns an ExportJob handle
+    without waiting for the SBOM to be generated. To export many SBOMs, launch them all first and then wait for them
+    together with wait_for_exports(), so the total time is close to that of the slowest export.
+
+    Args:
+        token (str):
+            Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string, that is handled inside the method.
+        organization_context (str):
+            Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
+        sbom_type (str, required):
+            The type of SBOM. Valid values are "CYCLONEDX" or "SPDX".
+        sbom_subtype (str, required):
+            The subtype of SBOM. Valid values for CycloneDX are "SBOM_ONLY", "SBOM_WITH_VDR", "VDR_ONLY"; valid values for SPDX are "SBOM_ONLY".
+        asset_version_id (str, required):
+            Asset Version ID to generate the SBOM for.
+        verbose (bool, optional):
+            If True, print additional information to the console. Defaults to False.
+
+    Raises:
+        ValueError: Raised if sbom_type, sbom_subtype, or asset_version_id are not provided.
+        Exception: Raised if the query fails.
+
+    Returns:
+        ExportJob: Handle for the export job.
+    """
+    mutation, variables, export_field = _prepare_sbom_export(sbom_type=sbom_type, sbom_subtype=sbom_subtype,
+                                                             asset_version_id=asset_version_id)
+    return _launch_export(token, organization_context, mutation, variables, export_field, verbose=verbose)
 
 
 def search_sbom(token, organization_context, name=None, version=None, asset_version_id=None, search_method='EXACT',
@@ -1974,14 +2621,30 @@ query GetSoftwareComponentInstances_SDK(
     return records
 
 
-@retry(stop=stop_after_attempt(5), wait=wait_fixed(5), retry=retry_if_exception(is_not_breakout_exception))
+def _get_token_provider(token, client):
+    """
+    Get the TokenProvider to take the auth token from: token itself if it is one, or the client's token_provider if
+    token is None. Returns None if token is a plain token string.
+    """
+    if hasattr(token, 'get_token'):
+        return token
+    if token is None:
+        return client.token_provider
+    return None
+
+
 def send_graphql_query(token, organization_context, query, variables=None):
     """
-    Send a GraphQL query to the API
+    Send a GraphQL query to the API. Transient failures are retried by the client according to its retry policy:
+    queries are retried on throttling, server errors and connection errors, mutations only on throttling (429).
+    If the API rejects the token with a 401 and the token came from a TokenProvider, the token is refreshed once and
+    the request is sent again; a 401 for a token passed as a string is raised. If the client has a cache, queries are answered from it when possible, and mutations
+    invalidate the cached responses they make stale.
 
     Args:
-        token (str):
+        token (str or TokenProvider):
             Auth token. This is the token returned by get_auth_token(). Just the token, do not include "Bearer" in this string, that is handled inside the method.
+            A TokenProvider can be passed instead, and if token is None the client's token_provider is used.
         organization_context (str):
             Organization context. This is provided by the Finite State API management. It looks like "xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx".
         query (str):
@@ -1995,6 +2658,45 @@ def send_graphql_query(token, organization_context, query, variables=None):
     Returns:
         dict: Response JSON
     """
+    client = get_default_client()
+    is_mutation_operation = is_mutation(query)
+
+    if client.cache is not None:
+        if is_mutation_operation:
+            try:
+                return _send_graphql_query(client, token, organization_context, query, variables, True)
+            finally:
+                # invalidate even if the mutation failed, as it may have been applied before the error
+                client.cache.invalidate(organization_context, query)
+
+        response_json = client.cache.get(organization_context, query, variables)
+        if response_json is None:
+            response_json = _send_graphql_query(client, token, organization_context, query, variables, False)
+            client.cache.set(organization_context, query, variables, response_json)
+        return response_json
+
+    return _send_graphql_query(client, token, organization_context, query, variables, is_mutation_operation)
+
+
+def _send_graphql_query(client, token, organization_context, query, variables, is_mutation_operation):
+    if client.batcher is not None and not is_mutation_operation:
+        return client.batcher.execute(token, organization_context, query, variables, client=client)
+
+    response = _post_graphql_query(client, token, organization_context, query, variables, is_mutation_operation)
+    return _get_graphql_response_json(response, is_mutation_operation)
+
+
+def _post_graphql_query(client, token, organization_context, query, variables, is_mutation_operation):
+    """
+    Send a GraphQL request through client, refreshing the token and replaying the request once on a 401.
+
+    Returns:
+        requests.Response: Response object
+    """
+    token_provider = _get_token_provider(token, client)
+    if token_provider is not None:
+        token = token_provider.get_token()
+
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {token}",
@@ -2002,7 +2704,26 @@ def send_graphql_query(token, organization_context, query, variables=None):
     }
     data = {"query": query, "variables": variables}
 
-    response = requests.post(API_URL, headers=headers, json=data)
+    response = client.post(API_URL, headers=headers, json=data, idempotent=not is_mutation_operation)
+
+    # the token expired: refresh it once and replay the same request, so a paginated query resumes at its cursor. A 401
+    # is returned before the request is processed, so this is safe for mutations too. A token passed as a string is
+    # never replaced, so a 401 cannot silently switch the request to another credential
+    if response.status_code == 401 and token_provider is not None:
+        response.close()
+        headers = dict(headers, Authorization=f"Bearer {token_provider.refresh(stale_token=token)}")
+        response = client.post(API_URL, headers=headers, json=data, idempotent=not is_mutation_operation)
+
+    return response
+
+
+def _get_graphql_response_json(response, is_mutation_operation):
+    """
+    Get the JSON of a GraphQL response, raising an exception for a failed request or GraphQL errors.
+
+    Returns:
+        dict: Response JSON
+    """
     if response.status_code == 200:
         thejson = response.json()
 
@@ -2012,7 +2733,6 @@ def send_graphql_query(token, organization_context, query, variables=None):
 
         return thejson
     else:
-        is_mutation_operation = is_mutation(query)
         if is_mutation_operation:
             raise BreakoutException(f"Error: {response.status_code} - {response.text}")
         else:
@@ -2065,10 +2785,14 @@ def update_finding_statuses(token, organization_context, user_id=None, finding_i
 
 
 def upload_file_for_binary_analysis(
-    token, organization_context, test_id=None, file_path=None, chunk_size=DEFAULT_CHUNK_SIZE, quick_scan=False, enable_bandit_scan: bool = False
+    token, organization_context, test_id=None, file_path=None, chunk_size=DEFAULT_CHUNK_SIZE, quick_scan=False, enable_bandit_scan: bool = False,
+    max_workers=1, max_part_attempts=DEFAULT_MAX_PART_ATTEMPTS, resume=False, journal_dir=DEFAULT_JOURNAL_DIR
 ):
     """
     Upload a file for Binary Analysis. Will automatically chunk the file into chunks and upload each chunk.
+    With max_workers greater than 1, parts are uploaded concurrently. Each part is retried on its own, so a failed part
+    does not restart the whole upload. With resume=True, progress is journaled to disk and a later call for the same
+    test and file only uploads the parts that are missing.
     NOTE: This is NOT for uploading third party scanner results. Use upload_test_results_file for that.
 
     Args:
@@ -2081,11 +2805,24 @@ def upload_file_for_binary_analysis(
         file_path (str, required):
             Local path to the file to upload.
         chunk_size (int, optional):
-            The size of the chunks to read. 1000 MiB by default. Min 5MiB and max 2GiB.
+            The size of each uploaded part. 1000 MiB by default. Min 5MiB and max 2GiB.
         quick_scan (bool, optional):
             If True, will perform a quick scan of the Binary. Defaults to False (Full Scan). For details, please see the API documentation.
         enable_bandit_scan (bool, optional):
             If True, will create an additional bandit scan in addition to the default binary analysis scan.
+        max_workers (int, optional):
+            The number of parts to upload concurrently. Defaults to 1 (one part at a time). Parts are streamed from the
+            file, so memory use does not grow with chunk_size or max_workers. The client's pool_maxsize should be at least
+            max_workers so every worker gets a pooled connection.
+        max_part_attempts (int, optional):
+            The number of pre-signed URLs to generate for each part, a new one each time the previous one is rejected
+            as expired. Other failures are retried by the client's retry policy. Defaults to DEFAULT_MAX_PART_ATTEMPTS.
+        resume (bool, optional):
+            If True, record the upload ID, key and completed parts in a journal file keyed by test_id and the SHA-256 of
+            the file, and resume from it if one exists. The journal is deleted once the upload is complete. Pass the
+            same chunk_size when resuming. Defaults to False.
+        journal_dir (str, optional):
+            Directory to write the upload journal to when resume is True. Defaults to DEFAULT_JOURNAL_DIR.
 
     Raises:
         ValueError: Raised if test_id or file_path are not provided.
@@ -2103,112 +2840,52 @@ def upload_file_for_binary_analysis(
         raise ValueError(f"Chunk size must be greater than {MIN_CHUNK_SIZE} bytes")
     if chunk_size >= MAX_CHUNK_SIZE:
         raise ValueError(f"Chunk size must be less than {MAX_CHUNK_SIZE} bytes")
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than 0")
+    if max_part_attempts < 1:
+        raise ValueError("max_part_attempts must be greater than 0")
 
-    # Start Multi-part Upload
-    graphql_query = """
-    mutation Start_SDK($testId: ID!) {
-        startMultipartUploadV2(testId: $testId) {
-            uploadId
-            key
-        }
-    }
-    """
+    journal = None
+    if resume:
+        from finite_state_sdk.upload_journal import UploadJournal
 
-    variables = {
-        "testId": test_id
-    }
+        journal = UploadJournal(test_id, file_path, chunk_size, journal_dir=journal_dir)
 
-    response = send_graphql_query(token, organization_context, graphql_query, variables)
+    if journal and journal.started:
+        upload_id = journal.upload_id
+        upload_key = journal.upload_key
+    else:
+        # Start Multi-part Upload
+        response = send_graphql_query(token, organization_context, queries.START_MULTIPART_UPLOAD['mutation'],
+                                      queries.START_MULTIPART_UPLOAD['variables'](test_id))
+
+        upload_id = response['data']['startMultipartUploadV2']['uploadId']
+        upload_key = response['data']['startMultipartUploadV2']['key']
 
-    upload_id = response['data']['startMultipartUploadV2']['uploadId']
-    upload_key = response['data']['startMultipartUploadV2']['key']
+        if journal:
+            journal.start(upload_id, upload_key)
 
     # if the file is greater than max chunk size (or 5 GB), split the file in chunks,
     # call generateUploadPartUrlV2 for each chunk of the file (even if it is a single part)
     # and upload the file to the returned upload URL
-    i = 0
-    part_data = []
-    for chunk in file_chunks(file_path, chunk_size):
-        i = i + 1
-        graphql_query = """
-        mutation GenerateUploadPartUrl_SDK($partNumber: Int!, $uploadId: ID!, $uploadKey: String!) {
-            generateUploadPartUrlV2(partNumber: $partNumber, uploadId: $uploadId, uploadKey: $uploadKey) {
-                key
-                uploadUrl
-            }
-        }
-        """
-
-        variables = {
-            "partNumber": i,
-            "uploadId": upload_id,
-            "uploadKey": upload_key
-        }
-
-        response = send_graphql_query(token, organization_context, graphql_query, variables)
-
-        chunk_upload_url = response['data']['generateUploadPartUrlV2']['uploadUrl']
-
-        # upload the chunk to the upload URL
-        response = upload_bytes_to_url(chunk_upload_url, chunk)
-
-        part_data.append({
-            "ETag": response.headers['ETag'],
-            "PartNumber": i
-        })
+    part_data = _upload_parts(token, organization_context, upload_id, upload_key, file_path, chunk_size, max_workers,
+                              max_part_attempts, journal=journal)
 
     # call completeMultipartUploadV2
-    graphql_query = """
-    mutation CompleteMultipartUpload_SDK($partData: [PartInput!]!, $uploadId: ID!, $uploadKey: String!) {
-        completeMultipartUploadV2(partData: $partData, uploadId: $uploadId, uploadKey: $uploadKey) {
-            key
-        }
-    }
-    """
-
-    variables = {
-        "partData": part_data,
-        "uploadId": upload_id,
-        "uploadKey": upload_key
-    }
-
-    response = send_graphql_query(token, organization_context, graphql_query, variables)
+    response = send_graphql_query(token, organization_context, queries.COMPLETE_MULTIPART_UPLOAD['mutation'],
+                                  queries.COMPLETE_MULTIPART_UPLOAD['variables'](part_data, upload_id, upload_key))
 
     # get key from the result
     key = response['data']['completeMultipartUploadV2']['key']
 
-    variables = {
-        "key": key,
-        "testId": test_id
-    }
+    if journal:
+        journal.delete()
 
     # call launchBinaryUploadProcessing
-    if quick_scan or enable_bandit_scan:
-        graphql_query = """
-        mutation LaunchBinaryUploadProcessing_SDK($key: String!, $testId: ID!, $configurationOptions: [BinaryAnalysisConfigurationOption]) {
-            launchBinaryUploadProcessing(key: $key, testId: $testId, configurationOptions: $configurationOptions) {
-                key
-                newBanditScanId
-            }
-        }
-        """
-    else:
-        graphql_query = """
-        mutation LaunchBinaryUploadProcessing_SDK($key: String!, $testId: ID!) {
-            launchBinaryUploadProcessing(key: $key, testId: $testId) {
-                key
-                newBanditScanId
-            }
-        }
-        """
-
-    if quick_scan:
-        variables["configurationOptions"] = ["QUICK_SCAN"]
-
-    if enable_bandit_scan:
-        config_options = variables.get("configurationOptions", [])
-        config_options.append("ENABLE_BANDIT_SCAN")
-        variables["configurationOptions"] = config_options
+    graphql_query = queries.LAUNCH_BINARY_UPLOAD_PROCESSING['mutation'](quick_scan=quick_scan,
+                                                                        enable_bandit_scan=enable_bandit_scan)
+    variables = queries.LAUNCH_BINARY_UPLOAD_PROCESSING['variables'](key, test_id, quick_scan=quick_scan,
+                                                                     enable_bandit_scan=enable_bandit_scan)
 
     response = send_graphql_query(token, organization_context, graphql_query, variables)
 
@@ -2289,8 +2966,8 @@ def upload_bytes_to_url(url, bytes):
     Args:
         url (str):
             (Pre-signed S3) URL
-        bytes (bytes):
-            Bytes to upload
+        bytes (bytes or FileSlice):
+            Bytes to upload, or a FileSlice to stream from disk
 
     Raises:
         Exception: If the response status code is not 200
@@ -2298,7 +2975,7 @@ def upload_bytes_to_url(url, bytes):
     Returns:
         requests.Response: Response object
     """
-    response = requests.put(url, data=bytes)
+    response = get_default_client().put(url, data=bytes)
 
     if response.status_code == 200:
         return response
@@ -2323,7 +3000,7 @@ def upload_file_to_url(url, file_path):
         requests.Response: Response object
     """
     with open(file_path, 'rb') as file:
-        response = requests.put(url, data=file)
+        response = get_default_client().put(url, data=file)
 
     if response.status_code == 200:
         return response
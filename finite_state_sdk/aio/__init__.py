@@ -0,0 +1,562 @@
+"""
+Asyncio equivalents of the finite_state_sdk query, pagination, upload and download functions.
+
+Every function here takes the same arguments and returns the same data as its synchronous counterpart in
+finite_state_sdk, but is a coroutine. Requests are sent through a shared AsyncFiniteStateClient, so a single event loop
+can drive many requests concurrently while the client's semaphore bounds how many are in flight.
+
+Requires the optional aiohttp dependency: pip install finite-state-sdk[aio]
+
+Example Usage
+---
+async def main():
+    token = await finite_state_sdk.aio.get_auth_token(CLIENT_ID, CLIENT_SECRET)
+    results = await asyncio.gather(*[
+        finite_state_sdk.aio.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=asset_version_id)
+        for asset_version_id in asset_version_ids
+    ])
+"""
+import asyncio
+import json
+
+import finite_state_sdk.queries as queries
+from finite_state_sdk import (
+    API_URL,
+    AUDIENCE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_COUNTS_BATCH_SIZE,
+    DEFAULT_DOWNLOAD_CHUNK_SIZE,
+    DEFAULT_FINDINGS_BATCH_SIZE,
+    MAX_CHUNK_SIZE,
+    MIN_CHUNK_SIZE,
+    TOKEN_URL,
+    _check_pagination_arguments,
+    _get_export_download_link,
+    _get_token_provider,
+    _group_findings_by_asset_version,
+    _prepare_findings_counts,
+    _prepare_findings_for_asset_versions,
+    _prepare_report_export,
+    _prepare_sbom_export,
+    _set_findings_count,
+    file_slices,
+)
+from finite_state_sdk.aio.client import (  # noqa: F401
+    AsyncFiniteStateClient,
+    _run_blocking,
+    get_default_client,
+    set_default_client,
+    use_client,
+)
+from finite_state_sdk.polling import DEFAULT_POLLING_STRATEGY
+from finite_state_sdk.utils import (
+    BreakoutException,
+    is_mutation,
+    open_output_file,
+)
+
+
+async def download_asset_version_report(token, organization_context, asset_version_id=None, report_type=None,
+                                        report_subtype=None, output_filename=None, verbose=False,
+                                        chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True, compress=False,
+                                        progress_callback=None, polling=None):
+    """
+    Async version of finite_state_sdk.download_asset_version_report.
+    Download a report for a specific asset version and save it to a local file.
+
+    Raises:
+        ValueError: Raised if required parameters are not provided.
+        Exception: Raised if the query fails.
+
+    Returns:
+        None
+    """
+    url = await generate_report_download_url(token, organization_context, asset_version_id=asset_version_id,
+                                             report_type=report_type, report_subtype=report_subtype, verbose=verbose,
+                                             polling=polling)
+    await _download_url_to_file(url, output_filename, chunk_size=chunk_size, atomic=atomic, compress=compress,
+                                progress_callback=progress_callback, verbose=verbose)
+
+
+async def download_product_report(token, organization_context, product_id=None, report_type=None, report_subtype=None,
+                                  output_filename=None, verbose=False, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE,
+                                  atomic=True, compress=False, progress_callback=None, polling=None):
+    """
+    Async version of finite_state_sdk.download_product_report.
+    Download a report for a specific product and save it to a local file.
+
+    Raises:
+        ValueError: Raised if required parameters are not provided.
+        Exception: Raised if the query fails.
+
+    Returns:
+        None
+    """
+    url = await generate_report_download_url(token, organization_context, product_id=product_id,
+                                             report_type=report_type, report_subtype=report_subtype, verbose=verbose,
+                                             polling=polling)
+    await _download_url_to_file(url, output_filename, chunk_size=chunk_size, atomic=atomic, compress=compress,
+                                progress_callback=progress_callback, verbose=verbose)
+
+
+async def download_sbom(token, organization_context, sbom_type="CYCLONEDX", sbom_subtype="SBOM_ONLY",
+                        asset_version_id=None, output_filename="sbom.json", verbose=False,
+                        chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True, compress=False, progress_callback=None,
+                        polling=None):
+    """
+    Async version of finite_state_sdk.download_sbom.
+    Download an SBOM for an Asset Version and save it to a local file.
+
+    Raises:
+        ValueError: Raised if required parameters are not provided.
+        Exception: Raised if the query fails.
+
+    Returns:
+        None
+    """
+    url = await generate_sbom_download_url(token, organization_context, sbom_type=sbom_type, sbom_subtype=sbom_subtype,
+                                           asset_version_id=asset_version_id, verbose=verbose, polling=polling)
+    await _download_url_to_file(url, output_filename, chunk_size=chunk_size, atomic=atomic, compress=compress,
+                                progress_callback=progress_callback, verbose=verbose)
+
+
+async def _download_url_to_file(url, output_filename, chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE, atomic=True,
+                                compress=False, progress_callback=None, verbose=False):
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be greater than 0")
+
+    async with get_default_client().stream("GET", url) as response:
+        if response.status != 200:
+            raise Exception(f"Failed to download the file. Status code: {response.status}")
+
+        total_bytes = response.content_length
+        bytes_written = 0
+
+        with open_output_file(output_filename, atomic=atomic, compress=compress) as file:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                file.write(chunk)
+                bytes_written += len(chunk)
+                if progress_callback is not None:
+                    progress_callback(bytes_written, total_bytes)
+
+    if verbose:
+        print("File downloaded successfully.")
+        print(f'Wrote file to {output_filename}')
+
+
+async def generate_report_download_url(token, organization_context, asset_version_id=None, product_id=None,
+                                       report_type=None, report_subtype=None, verbose=False, polling=None) -> str:
+    """
+    Async version of finite_state_sdk.generate_report_download_url.
+    Initiates generation of a report, and returns a pre-signed URL for downloading the report. Polling for the export
+    job uses asyncio.sleep, so other tasks keep running while the report is generated.
+
+    Raises:
+        ValueError: Raised if required parameters are not provided.
+        Exception: Raised if the query fails or the export job fails.
+
+    Returns:
+        str: URL to download the report from.
+    """
+    mutation, variables, export_field = _prepare_report_export(asset_version_id=asset_version_id,
+                                                               product_id=product_id, report_type=report_type,
+                                                               report_subtype=report_subtype)
+    return await _launch_export_and_wait(token, organization_context, mutation, variables, export_field,
+                                         verbose=verbose, polling=polling)
+
+
+async def generate_sbom_download_url(token, organization_context, sbom_type=None, sbom_subtype=None,
+                                     asset_version_id=None, verbose=False, polling=None) -> str:
+    """
+    Async version of finite_state_sdk.generate_sbom_download_url.
+    Initiates generation of an SBOM for the asset_version_id, and returns a pre-signed URL for downloading the SBOM.
+
+    Raises:
+        ValueError: Raised if sbom_type, sbom_subtype, or asset_version_id are not provided.
+        Exception: Raised if the query fails or the export job fails.
+
+    Returns:
+        str: URL to download the SBOM from.
+    """
+    mutation, variables, export_field = _prepare_sbom_export(sbom_type=sbom_type, sbom_subtype=sbom_subtype,
+                                                             asset_version_id=asset_version_id)
+    return await _launch_export_and_wait(token, organization_context, mutation, variables, export_field,
+                                         verbose=verbose, polling=polling)
+
+
+async def _launch_export_and_wait(token, organization_context, mutation, variables, export_field, verbose=False,
+                                  polling=None):
+    response_data = await send_graphql_query(token, organization_context, mutation, variables)
+    if verbose:
+        print(f'Response Data: {json.dumps(response_data, indent=4)}')
+
+    export_job_id = response_data['data'][export_field]['exportJobId']
+    if not export_job_id:
+        raise Exception(
+            "Error: Export Job ID not found - this should not happen, please contact your Finite State representative")
+
+    if verbose:
+        print(f'Export Job ID: {export_job_id}')
+
+    # poll the API until the export job is complete
+    polling = polling or DEFAULT_POLLING_STRATEGY
+    total_time = 0
+    for sleep_time in polling.intervals():
+        await asyncio.sleep(sleep_time)
+        total_time += sleep_time
+        if verbose:
+            print(f'Total time elapsed: {total_time:.1f} seconds')
+
+        response_data = await send_graphql_query(
+            token, organization_context, queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['query'],
+            queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['variables'](export_job_id))
+
+        if response_data['data']['generateExportDownloadPresignedUrl']['status'] == 'FAILED':
+            raise Exception(f"Error: Export job {export_job_id} failed")
+
+        download_link = _get_export_download_link(response_data)
+        if download_link:
+            if verbose:
+                print(f'Export Job Complete. Download URL: {download_link}')
+            return download_link
+
+
+async def get_all_paginated_results(token, organization_context, query, variables=None, field=None, limit=None):
+    """
+    Async version of finite_state_sdk.get_all_paginated_results.
+    Get all results from a paginated GraphQL query.
+
+    Raises:
+        Exception: If the response status code is not 200, or if the field is not in the response JSON
+
+    Returns:
+        list: List of results
+    """
+    _check_pagination_arguments(variables, field, limit)
+
+    response_data = await send_graphql_query(token, organization_context, query, dict(variables))
+    if not response_data:
+        return []
+
+    if field not in response_data['data']:
+        raise Exception(f"Error: {field} not in response JSON")
+
+    results = list(response_data['data'][field])
+    page = response_data['data'][field]
+
+    while page:
+        if limit and len(results) == limit:
+            break
+
+        cursor = page[-1]['_cursor']
+        if not cursor:
+            break
+
+        response_data = await send_graphql_query(token, organization_context, query, dict(variables, after=cursor))
+        page = response_data['data'][field]
+        results.extend(page)
+
+    return results
+
+
+async def get_auth_token(client_id, client_secret, token_url=TOKEN_URL, audience=AUDIENCE):
+    """
+    Async version of finite_state_sdk.get_auth_token.
+    Get an auth token for use with the API using CLIENT_ID and CLIENT_SECRET.
+
+    Raises:
+        Exception: If the response status code is not 200
+
+    Returns:
+        str: Auth token. Use this token as the Authorization header in subsequent API calls.
+    """
+    payload = {
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "audience": AUDIENCE,
+        "grant_type": "client_credentials"
+    }
+
+    headers = {
+        'content-type': "application/json"
+    }
+
+    response = await get_default_client().post(TOKEN_URL, data=json.dumps(payload), headers=headers)
+    if response.status == 200:
+        return (await response.json())['access_token']
+    else:
+        raise Exception(f"Error: {response.status} - {await response.text()}")
+
+
+async def get_findings(token, organization_context, asset_version_id=None, finding_id=None, category=None, status=None,
+                       severity=None, count=False, limit=None, fields=None):
+    """
+    Async version of finite_state_sdk.get_findings.
+    Gets all the Findings for an Asset Version. Uses pagination to get all results.
+
+    Raises:
+        Exception: Raised if the query fails, required parameters are not specified, or parameters are incompatible.
+
+    Returns:
+        list: List of Finding Objects
+    """
+    if limit and limit > 1000:
+        raise Exception("Error: limit must be less than 1000")
+    if limit and limit < 1:
+        raise Exception("Error: limit must be greater than 0")
+
+    if count:
+        response = await send_graphql_query(token, organization_context, queries.GET_FINDINGS_COUNT['query'],
+                                            queries.GET_FINDINGS_COUNT['variables'](asset_version_id=asset_version_id,
+                                                                                    finding_id=finding_id,
+                                                                                    category=category, status=status,
+                                                                                    severity=severity, limit=limit))
+        return response["data"]["_allFindingsMeta"]
+
+    return await get_all_paginated_results(token, organization_context, queries.GET_FINDINGS['fields_query'](fields),
+                                           queries.GET_FINDINGS['variables'](asset_version_id=asset_version_id,
+                                                                             finding_id=finding_id, category=category,
+                                                                             status=status, severity=severity,
+                                                                             limit=limit), 'allFindings', limit=limit)
+
+
+async def get_findings_counts(token, organization_context, asset_version_ids, severities=None, categories=None,
+                              status=None, batch_size=DEFAULT_COUNTS_BATCH_SIZE):
+    """
+    Async version of finite_state_sdk.get_findings_counts.
+    Count the Findings of many Asset Versions with aliased count queries. The batches are sent concurrently.
+
+    Raises:
+        ValueError: Raised if asset_version_ids is empty, or batch_size is less than 1.
+        Exception: Raised if a query fails.
+
+    Returns:
+        dict: Counts keyed by Asset Version ID, then by severity and category if they were given
+    """
+    batches = _prepare_findings_counts(asset_version_ids, severities=severities, categories=categories, status=status,
+                                       batch_size=batch_size)
+    responses = await asyncio.gather(*[send_graphql_query(token, organization_context, query, variables)
+                                       for _, query, variables in batches])
+
+    counts = {}
+    for (keys, _, _), response_data in zip(batches, responses):
+        for i, key in enumerate(keys):
+            _set_findings_count(counts, key, response_data['data'][f'count{i}']['count'])
+    return counts
+
+
+async def get_findings_for_asset_versions(token, organization_context, asset_version_ids, category=None, status=None,
+                                          severity=None, fields=None, group_by=True,
+                                          batch_size=DEFAULT_FINDINGS_BATCH_SIZE):
+    """
+    Async version of finite_state_sdk.get_findings_for_asset_versions.
+    Gets the Findings of many Asset Versions with assetVersionRefId_in filters. The batches are fetched concurrently.
+
+    Raises:
+        ValueError: Raised if asset_version_ids is empty, batch_size is less than 1, or fields is not valid.
+        Exception: Raised if a query fails.
+
+    Returns:
+        dict: Lists of Finding Objects keyed by Asset Version ID, or a list of Finding Objects if group_by is False
+    """
+    asset_version_ids, query, batches = _prepare_findings_for_asset_versions(asset_version_ids, category=category,
+                                                                             status=status, severity=severity,
+                                                                             fields=fields, batch_size=batch_size)
+    pages = await asyncio.gather(*[get_all_paginated_results(token, organization_context, query, variables,
+                                                             'allFindings')
+                                   for variables in batches])
+
+    findings = [finding for page in pages for finding in page]
+    if not group_by:
+        return findings
+    return _group_findings_by_asset_version(asset_version_ids, findings)
+
+
+async def get_software_components(token, organization_context, asset_version_id=None, type=None, fields=None) -> list:
+    """
+    Async version of finite_state_sdk.get_software_components.
+    Gets all the Software Components for an Asset Version. Uses pagination to get all results.
+
+    Raises:
+        Exception: Raised if the query fails, required parameters are not specified, or parameters are incompatible.
+
+    Returns:
+        list: List of Software Component Objects
+    """
+    if not asset_version_id:
+        raise Exception("Asset Version ID is required")
+
+    return await get_all_paginated_results(token, organization_context,
+                                           queries.GET_SOFTWARE_COMPONENTS['fields_query'](fields),
+                                           queries.GET_SOFTWARE_COMPONENTS['variables'](
+                                               asset_version_id=asset_version_id, type=type),
+                                           'allSoftwareComponentInstances')
+
+
+async def send_graphql_query(token, organization_context, query, variables=None):
+    """
+    Async version of finite_state_sdk.send_graphql_query.
+    Send a GraphQL query to the API. Transient failures are retried by the client according to its retry policy, and
+    a 401 is retried once with a refreshed token if the token came from a TokenProvider. If the client has a cache, queries
+    are answered from it when possible, and mutations invalidate the cached responses they make stale.
+
+    Raises:
+        Exception: If the response status code is not 200
+
+    Returns:
+        dict: Response JSON
+    """
+    client = get_default_client()
+    is_mutation_operation = is_mutation(query)
+
+    if client.cache is not None:
+        if is_mutation_operation:
+            try:
+                return await _send_graphql_query(client, token, organization_context, query, variables, True)
+            finally:
+                # invalidate even if the mutation failed, as it may have been applied before the error
+                await _run_blocking(client.cache, client.cache.invalidate, organization_context, query)
+
+        response_json = await _run_blocking(client.cache, client.cache.get, organization_context, query, variables)
+        if response_json is None:
+            response_json = await _send_graphql_query(client, token, organization_context, query, variables, False)
+            await _run_blocking(client.cache, client.cache.set, organization_context, query, variables, response_json)
+        return response_json
+
+    return await _send_graphql_query(client, token, organization_context, query, variables, is_mutation_operation)
+
+
+async def _send_graphql_query(client, token, organization_context, query, variables, is_mutation_operation):
+    token_provider = _get_token_provider(token, client)
+    if token_provider is not None:
+        # only wait on a refresh in an executor, so fetching a new token never blocks the event loop
+        token = token_provider.get_token(block=False) or \
+            await asyncio.get_running_loop().run_in_executor(None, token_provider.get_token)
+
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {token}",
+        "Organization-Context": organization_context,
+    }
+    data = {"query": query, "variables": variables}
+
+    response = await client.post(API_URL, headers=headers, json=data, idempotent=not is_mutation_operation)
+
+    if response.status == 401 and token_provider is not None:
+        token = await asyncio.get_running_loop().run_in_executor(None, token_provider.refresh, token)
+        headers = dict(headers, Authorization=f"Bearer {token}")
+        response = await client.post(API_URL, headers=headers, json=data, idempotent=not is_mutation_operation)
+
+    if response.status == 200:
+        thejson = await response.json()
+
+        if "errors" in thejson:
+            # Raise a BreakoutException for GraphQL errors
+            raise BreakoutException(f"Error: {thejson['errors']}")
+
+        return thejson
+    else:
+        if is_mutation_operation:
+            raise BreakoutException(f"Error: {response.status} - {await response.text()}")
+        else:
+            raise Exception(f"Error: {response.status} - {await response.text()}")
+
+
+async def upload_bytes_to_url(url, bytes):
+    """
+    Async version of finite_state_sdk.upload_bytes_to_url.
+    Used for uploading a file to a pre-signed S3 URL. Accepts bytes or a FileSlice to stream from disk.
+
+    Raises:
+        Exception: If the response status code is not 200
+
+    Returns:
+        aiohttp.ClientResponse: Response object
+    """
+    # pre-signed URLs do not accept chunked transfer encoding, so always send the length up front
+    response = await get_default_client().put(url, data=bytes, headers={"Content-Length": str(len(bytes))})
+
+    if response.status == 200:
+        return response
+    else:
+        raise Exception(f"Error: {response.status} - {await response.text()}")
+
+
+async def upload_file_for_binary_analysis(token, organization_context, test_id=None, file_path=None,
+                                          chunk_size=DEFAULT_CHUNK_SIZE, quick_scan=False,
+                                          enable_bandit_scan: bool = False):
+    """
+    Async version of finite_state_sdk.upload_file_for_binary_analysis.
+    Upload a file for Binary Analysis. Will automatically split the file into parts and upload each part. Parts are
+    streamed from disk in a worker thread so neither memory nor the event loop is held up by large parts.
+
+    Raises:
+        ValueError: Raised if test_id or file_path are not provided.
+        Exception: Raised if the query fails.
+
+    Returns:
+        dict: The response from the GraphQL query, a completeMultipartUpload Object.
+    """
+    if not test_id:
+        raise ValueError("Test Id is required")
+    if not file_path:
+        raise ValueError("File Path is required")
+    if chunk_size < MIN_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be greater than {MIN_CHUNK_SIZE} bytes")
+    if chunk_size >= MAX_CHUNK_SIZE:
+        raise ValueError(f"Chunk size must be less than {MAX_CHUNK_SIZE} bytes")
+
+    response = await send_graphql_query(token, organization_context, queries.START_MULTIPART_UPLOAD['mutation'],
+                                        queries.START_MULTIPART_UPLOAD['variables'](test_id))
+
+    upload_id = response['data']['startMultipartUploadV2']['uploadId']
+    upload_key = response['data']['startMultipartUploadV2']['key']
+
+    part_data = []
+    for part_number, part in enumerate(file_slices(file_path, chunk_size), start=1):
+        with part:
+            response = await send_graphql_query(token, organization_context,
+                                                queries.GENERATE_UPLOAD_PART_URL['mutation'],
+                                                queries.GENERATE_UPLOAD_PART_URL['variables'](part_number, upload_id,
+                                                                                              upload_key))
+            chunk_upload_url = response['data']['generateUploadPartUrlV2']['uploadUrl']
+
+            response = await upload_bytes_to_url(chunk_upload_url, part)
+            part_data.append({
+                "ETag": response.headers['ETag'],
+                "PartNumber": part_number
+            })
+
+    response = await send_graphql_query(token, organization_context, queries.COMPLETE_MULTIPART_UPLOAD['mutation'],
+                                        queries.COMPLETE_MULTIPART_UPLOAD['variables'](part_data, upload_id,
+                                                                                       upload_key))
+    key = response['data']['completeMultipartUploadV2']['key']
+
+    response = await send_graphql_query(
+        token, organization_context,
+        queries.LAUNCH_BINARY_UPLOAD_PROCESSING['mutation'](quick_scan=quick_scan,
+                                                            enable_bandit_scan=enable_bandit_scan),
+        queries.LAUNCH_BINARY_UPLOAD_PROCESSING['variables'](key, test_id, quick_scan=quick_scan,
+                                                             enable_bandit_scan=enable_bandit_scan))
+
+    return response['data']
+
+
+async def upload_file_to_url(url, file_path):
+    """
+    Async version of finite_state_sdk.upload_file_to_url.
+    Used for uploading a file to a pre-signed S3 URL.
+
+    Raises:
+        Exception: If the response status code is not 200
+
+    Returns:
+        aiohttp.ClientResponse: Response object
+    """
+    with open(file_path, 'rb') as file:
+        response = await get_default_client().put(url, data=file)
+
+    if response.status == 200:
+        return response
+    else:
+        raise Exception(f"Error: {response.status} - {await response.text()}")
@@ -0,0 +1,332 @@
+"""
+An asyncio HTTP client for the Finite State API, backed by a shared aiohttp connection pool.
+
+Requires the optional aiohttp dependency: pip install finite-state-sdk[aio]
+
+Example Usage
+---
+client = AsyncFiniteStateClient(limit=200, max_concurrency=100)
+with finite_state_sdk.aio.use_client(client):
+    findings = await finite_state_sdk.aio.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=ASSET_VERSION_ID)
+await client.close()
+"""
+import asyncio
+import functools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+try:
+    import aiohttp
+except ImportError as e:  # pragma: no cover - exercised only when the extra is not installed
+    raise ImportError("finite_state_sdk.aio requires aiohttp. Install it with: pip install finite-state-sdk[aio]") from e
+
+from finite_state_sdk.client import DEFAULT_TIMEOUT, _is_rate_limited
+from finite_state_sdk.retry import DEFAULT_RETRY_POLICY, IDEMPOTENT_METHODS, RetryBudget, parse_retry_after
+
+"""
+DEFAULT CONNECTION LIMIT: maximum number of open connections across all hosts
+"""
+DEFAULT_CONNECTION_LIMIT = 100
+"""
+DEFAULT MAX CONCURRENCY: maximum number of requests in flight at once
+"""
+DEFAULT_MAX_CONCURRENCY = 100
+
+
+async def _run_blocking(owner, func, *args, **kwargs):
+    """
+    Call func, on the event loop's default executor if owner does blocking I/O, e.g. a ResponseCache with a
+    SQLiteCacheBackend or an AdaptiveRateLimiter with a FileRateLimitBackend, so it never stalls the event loop. Objects
+    without a blocking attribute are assumed to block.
+
+    Returns:
+        The return value of func
+    """
+    if not getattr(owner, 'blocking', True):
+        return func(*args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+class AsyncFiniteStateClient():
+    """
+    An asyncio HTTP client that owns a pooled aiohttp.ClientSession and a semaphore bounding the number of in-flight
+    requests. The session is created lazily on first use, inside the running event loop. A client is used by one event
+    loop at a time: once that loop has been closed, e.g. at the end of asyncio.run, the next request closes its session
+    and starts a new one in the running loop. Close the client in its own loop to close its connections gracefully.
+
+    Args:
+        limit (int, optional):
+            Maximum number of open connections across all hosts. Defaults to DEFAULT_CONNECTION_LIMIT.
+        limit_per_host (int, optional):
+            Maximum number of open connections per host. 0 means no per-host limit. Defaults to 0.
+        max_concurrency (int, optional):
+            Maximum number of requests in flight at once. Defaults to DEFAULT_MAX_CONCURRENCY.
+        timeout (float or tuple, optional):
+            Either a single number or a (connect, read) tuple in seconds. None disables timeouts. Defaults to DEFAULT_TIMEOUT.
+        retry_policy (RetryPolicy, optional):
+            Which failed requests to retry and how long to wait between attempts. Defaults to DEFAULT_RETRY_POLICY.
+        retry_budget (RetryBudget, optional):
+            Limits the retries this client sends as a fraction of its requests. Defaults to a new RetryBudget().
+        rate_limiter (AdaptiveRateLimiter, optional):
+            Paces the GraphQL requests this client sends to API_URL, adapting to 429s from the server. Uploads and
+            downloads are not paced. A FileRateLimitBackend is called from the default executor, so its file lock does
+            not block the event loop. Defaults to None, no limit.
+        token_provider (TokenProvider, optional):
+            Supplies the auth token for GraphQL queries sent through this client with token=None. Defaults to None.
+        cache (ResponseCache, optional):
+            Caches the responses of GraphQL queries sent through this client, and invalidates them on mutations. A
+            SQLiteCacheBackend is called from the default executor, so its I/O does not block the event loop. Defaults
+            to None, no caching.
+    """
+
+    def __init__(self, limit=DEFAULT_CONNECTION_LIMIT, limit_per_host=0, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, retry_policy=None, retry_budget=None, rate_limiter=None,
+                 token_provider=None, cache=None):
+        if limit < 0:
+            raise ValueError("limit cannot be less than 0")
+        if limit_per_host < 0:
+            raise ValueError("limit_per_host cannot be less than 0")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0")
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.retry_budget = retry_budget or RetryBudget()
+        self.rate_limiter = rate_limiter
+        self.token_provider = token_provider
+        self.cache = cache
+
+        self._session = None
+        self._semaphore = None
+        self._loop = None
+
+    def _client_timeout(self):
+        if self.timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(self.timeout, tuple):
+            connect, read = self.timeout
+        else:
+            connect = read = self.timeout
+        return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+
+    async def _get_session(self):
+        # sessions and semaphores are bound to the event loop they were created in
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._loop is not loop:
+            if not self._loop.is_closed():
+                raise RuntimeError("Error: the client is in use by another event loop. Use a separate "
+                                   "AsyncFiniteStateClient for each event loop, or await client.close() first")
+            # the loop was closed, e.g. at the end of an earlier asyncio.run, so its connections are gone: close the
+            # session and connector so they are not leaked, then start a new session in this loop
+            await self._session.close()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._client_timeout())
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._session
+
+    async def _send(self, method, url, idempotent=None, **kwargs):
+        """
+        Send a request, retrying it according to the retry policy and budget, and return the last response without
+        reading its body. The returned response holds a slot of the concurrency semaphore; the caller must release it
+        with _release once done with the response.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        session = await self._get_session()
+        policy = self.retry_policy
+        rate_limited = _is_rate_limited(self.rate_limiter, url)
+        self.retry_budget.deposit()
+        attempt_number = 1
+
+        while True:
+            if rate_limited:
+                await self._acquire_rate_limit()
+            await self._semaphore.acquire()
+            start = time.monotonic()
+
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self._semaphore.release()
+                retry = policy.should_retry_connection_error(
+                    idempotent, request_sent=not isinstance(e, aiohttp.ClientConnectorError))
+                if not self._can_retry(attempt_number, retry):
+                    raise
+                delay = policy.backoff(attempt_number)
+            except BaseException:
+                self._semaphore.release()
+                raise
+            else:
+                if rate_limited:
+                    await _run_blocking(self.rate_limiter, self.rate_limiter.record, throttled=response.status == 429,
+                                        latency=time.monotonic() - start)
+
+                retry = policy.should_retry_status(response.status, idempotent)
+                if not self._can_retry(attempt_number, retry):
+                    return response
+                delay = policy.backoff(attempt_number, status_code=response.status,
+                                       retry_after=parse_retry_after(response.headers.get('Retry-After')))
+                self._release(response)
+
+            # wait outside the semaphore, so other requests can use the slot
+            await asyncio.sleep(delay)
+            attempt_number += 1
+
+            # rewind a file-like body, so the retry sends it from the start
+            data = kwargs.get('data')
+            if hasattr(data, 'seek'):
+                data.seek(0)
+
+    async def _acquire_rate_limit(self):
+        while True:
+            delay = await _run_blocking(self.rate_limiter, self.rate_limiter.try_acquire)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _can_retry(self, attempt_number, retry):
+        return retry and attempt_number < self.retry_policy.max_attempts and self.retry_budget.withdraw()
+
+    def _release(self, response):
+        response.release()
+        self._semaphore.release()
+
+    async def request(self, method, url, idempotent=None, **kwargs):
+        """
+        Send an HTTP request and read the full response body before releasing the connection. Transient failures are
+        retried according to the retry policy.
+
+        Args:
+            method (str):
+                HTTP method, e.g. "GET"
+            url (str):
+                URL to send the request to
+            idempotent (bool, optional):
+                Whether the request is safe to send more than once. Defaults to True for GET, HEAD, OPTIONS, PUT and
+                DELETE, and False otherwise.
+            **kwargs:
+                Passed through to aiohttp.ClientSession.request
+
+        Returns:
+            aiohttp.ClientResponse: Response object. The body has already been read, so json() and text() can be awaited.
+        """
+        response = await self._send(method, url, idempotent=idempotent, **kwargs)
+        try:
+            await response.read()
+        finally:
+            self._release(response)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method, url, idempotent=None, **kwargs):
+        """
+        Send an HTTP request and yield the response without reading the body, for streaming large downloads. Transient
+        failures are retried according to the retry policy before the response is yielded.
+
+        Args:
+            method (str):
+                HTTP method, e.g. "GET"
+            url (str):
+                URL to send the request to
+            idempotent (bool, optional):
+                Whether the request is safe to send more than once. Defaults as for request().
+            **kwargs:
+                Passed through to aiohttp.ClientSession.request
+
+        Yields:
+            aiohttp.ClientResponse: Response object. Read the body from response.content.
+        """
+        response = await self._send(method, url, idempotent=idempotent, **kwargs)
+        try:
+            yield response
+        finally:
+            self._release(response)
+
+    async def get(self, url, **kwargs):
+        """Send a GET request."""
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, idempotent=False, **kwargs):
+        """Send a POST request. Pass idempotent=True if it is safe to retry."""
+        return await self.request("POST", url, idempotent=idempotent, **kwargs)
+
+    async def put(self, url, **kwargs):
+        """Send a PUT request."""
+        return await self.request("PUT", url, **kwargs)
+
+    async def close(self):
+        """Close the session and every pooled connection."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Get the client used by the finite_state_sdk.aio functions, creating it on first use.
+
+    Returns:
+        AsyncFiniteStateClient: The default client
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = AsyncFiniteStateClient()
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replace the client used by the finite_state_sdk.aio functions.
+
+    Args:
+        client (AsyncFiniteStateClient):
+            The client to use. If None, a new default client will be created on next use.
+
+    Returns:
+        AsyncFiniteStateClient: The previous default client, or None if one had not been created yet
+    """
+    global _default_client
+    with _default_client_lock:
+        previous = _default_client
+        _default_client = client
+    return previous
+
+
+@contextmanager
+def use_client(client):
+    """
+    Context manager that routes the finite_state_sdk.aio functions through client for the duration of the block, then
+    restores the previous default client.
+
+    Args:
+        client (AsyncFiniteStateClient):
+            The client to use inside the block.
+
+    Yields:
+        AsyncFiniteStateClient: The client
+    """
+    previous = set_default_client(client)
+    try:
+        yield client
+    finally:
+        set_default_client(previous)
@@ -0,0 +1,336 @@
+"""
+Coalesces independent GraphQL queries, sent at the same time from different threads, into single requests.
+
+With a GraphQLBatcher on the client, the queries sent within a short window of each other are combined into one
+document: the root fields of each query are aliased with a prefix unique to the query, and its variables and fragments
+are renamed with the same prefix, so queries cannot collide. The response is split back into the result each query
+would have had on its own. Mutations, and documents with more than one operation, are always sent on their own.
+
+Example Usage
+---
+batcher = GraphQLBatcher(window=0.005, max_batch_size=25)
+finite_state_sdk.set_default_client(FiniteStateClient(batcher=batcher))
+with ThreadPoolExecutor(max_workers=16) as executor:
+    assets = list(executor.map(lambda asset_id: finite_state_sdk.get_all_assets(token, ORGANIZATION_CONTEXT,
+                                                                                asset_id=asset_id), asset_ids))
+print(batcher.metrics.snapshot())
+"""
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+
+import finite_state_sdk
+from finite_state_sdk.utils import BreakoutException
+
+"""
+DEFAULT BATCH WINDOW: seconds the first query of a batch waits for other queries to join it
+"""
+DEFAULT_BATCH_WINDOW = 0.005
+"""
+DEFAULT MAX BATCH SIZE: the most queries combined into one request
+"""
+DEFAULT_MAX_BATCH_SIZE = 25
+
+
+def _prefix_query(query, prefix):
+    """
+    Parse a query, alias its root fields and rename its variables and fragments with prefix.
+
+    Returns:
+        tuple: (operation, fragments, dict of aliased root field to original response key), or None if the document
+        cannot be batched
+    """
+    from graphql import parse
+    from graphql.language import (
+        FieldNode,
+        FragmentDefinitionNode,
+        FragmentSpreadNode,
+        NameNode,
+        Node,
+        OperationDefinitionNode,
+        OperationType,
+        VariableNode,
+    )
+
+    document = parse(query)
+    operations = [definition for definition in document.definitions
+                  if isinstance(definition, OperationDefinitionNode)]
+    fragments = [definition for definition in document.definitions
+                 if isinstance(definition, FragmentDefinitionNode)]
+
+    if len(operations) != 1 or len(operations) + len(fragments) != len(document.definitions):
+        return None
+    operation = operations[0]
+    if operation.operation != OperationType.QUERY or operation.directives:
+        return None
+    # the response keys of root level fragments are not known without the schema
+    if not all(isinstance(selection, FieldNode) for selection in operation.selection_set.selections):
+        return None
+
+    def rename(node):
+        if isinstance(node, (VariableNode, FragmentSpreadNode, FragmentDefinitionNode)):
+            node.name = NameNode(value=prefix + node.name.value)
+        for key in node.keys:
+            value = getattr(node, key)
+            for child in value if isinstance(value, (list, tuple)) else (value,):
+                if isinstance(child, Node):
+                    rename(child)
+
+    response_keys = {}
+    for selection in operation.selection_set.selections:
+        response_key = (selection.alias or selection.name).value
+        selection.alias = NameNode(value=prefix + response_key)
+        response_keys[prefix + response_key] = response_key
+
+    rename(operation)
+    for fragment in fragments:
+        rename(fragment)
+
+    return operation, fragments, response_keys
+
+
+@lru_cache(maxsize=256)
+def _is_batchable(query):
+    try:
+        return _prefix_query(query, '') is not None
+    except Exception:
+        # let the API report the syntax error for this query alone
+        return False
+
+
+def _merge_queries(requests):
+    """
+    Combine the queries of requests into one document, setting the response keys of each request.
+
+    Returns:
+        tuple: (query, variables)
+    """
+    from graphql import print_ast
+    from graphql.language import DocumentNode, NameNode, OperationDefinitionNode, OperationType, SelectionSetNode
+
+    variable_definitions = []
+    selections = []
+    fragments = []
+    variables = {}
+
+    for i, request in enumerate(requests):
+        prefix = f'b{i}_'
+        operation, request_fragments, request.response_keys = _prefix_query(request.query, prefix)
+
+        variable_definitions.extend(operation.variable_definitions or ())
+        selections.extend(operation.selection_set.selections)
+        fragments.extend(request_fragments)
+        variables.update({prefix + name: value for name, value in (request.variables or {}).items()})
+
+    operation = OperationDefinitionNode(operation=OperationType.QUERY, name=NameNode(value='Batch_SDK'),
+                                        variable_definitions=tuple(variable_definitions), directives=(),
+                                        selection_set=SelectionSetNode(selections=tuple(selections)))
+    return print_ast(DocumentNode(definitions=(operation, *fragments))), variables
+
+
+class _BatchedRequest():
+
+    def __init__(self, query, variables):
+        self.query = query
+        self.variables = variables
+        self.response_keys = None
+        self.future = Future()
+
+
+class _Batch():
+
+    def __init__(self):
+        self.requests = []
+        self.full = threading.Event()
+        self.opened_at = time.monotonic()
+
+
+class BatchMetrics():
+    """
+    Counters for the queries sent through a GraphQLBatcher. Read them with snapshot().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.requests = 0
+        self.max_batch_size = 0
+        self.fallbacks = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record_batch(self, batch_size, latency):
+        """Record a batch of batch_size queries that took latency seconds, from the first query to its results."""
+        with self._lock:
+            self.queries += batch_size
+            self.requests += 1
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def record_fallback(self):
+        """Record a batch whose queries, or some of them, were sent again one at a time because it failed as a whole."""
+        with self._lock:
+            self.fallbacks += 1
+
+    def snapshot(self):
+        """
+        Get the current metrics.
+
+        Returns:
+            dict: queries, requests, average_batch_size, max_batch_size, average_latency, max_latency and fallbacks
+        """
+        with self._lock:
+            return {
+                "queries": self.queries,
+                "requests": self.requests,
+                "average_batch_size": self.queries / self.requests if self.requests else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "average_latency": self.total_latency / self.requests if self.requests else 0.0,
+                "max_latency": self.max_latency,
+                "fallbacks": self.fallbacks,
+            }
+
+
+class GraphQLBatcher():
+    """
+    Combines GraphQL queries sent at the same time into batched requests. The first query of a batch waits up to
+    `window` seconds for others to join it, then sends the batch from its own thread, so batches are sent concurrently
+    and no background thread is needed. Only queries with the same client, token and organization context are batched
+    together.
+
+    Args:
+        window (float, optional):
+            Seconds to wait for more queries before sending a batch. Defaults to DEFAULT_BATCH_WINDOW.
+        max_batch_size (int, optional):
+            The most queries in one batch. A full batch is sent without waiting for the window. Defaults to
+            DEFAULT_MAX_BATCH_SIZE.
+    """
+
+    def __init__(self, window=DEFAULT_BATCH_WINDOW, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        if window < 0:
+            raise ValueError("window cannot be less than 0")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be greater than 0")
+
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.metrics = BatchMetrics()
+
+        self._open_batches = {}
+        self._lock = threading.Lock()
+
+    def execute(self, token, organization_context, query, variables=None, client=None):
+        """
+        Blocking call: Send a query as part of the next batch, and wait for its result.
+
+        Args:
+            token (str or TokenProvider):
+                Auth token. This is the token returned by get_auth_token().
+            organization_context (str):
+                Organization context. This is provided by the Finite State API management.
+            query (str):
+                The GraphQL query string.
+            variables (dict, optional):
+                Variables to be used in the GraphQL query, by default None.
+            client (FiniteStateClient, optional):
+                The client to send the batch with. Defaults to the default client.
+
+        Raises:
+            BreakoutException: Raised if the API returned GraphQL errors for this query.
+            Exception: Raised if the request failed.
+
+        Returns:
+            dict: Response JSON, as send_graphql_query would have returned for the query on its own
+        """
+        client = client or finite_state_sdk.get_default_client()
+        request = _BatchedRequest(query, variables)
+
+        if not _is_batchable(query):
+            self._send_one(client, token, organization_context, request)
+            self.metrics.record_batch(1, 0.0)
+            return request.future.result()
+
+        key = (client, token, organization_context)
+        with self._lock:
+            batch = self._open_batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._open_batches[key] = _Batch()
+            batch.requests.append(request)
+            if len(batch.requests) >= self.max_batch_size:
+                del self._open_batches[key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._open_batches.get(key) is batch:
+                    del self._open_batches[key]
+            self._send_batch(client, token, organization_context, batch)
+
+        return request.future.result()
+
+    def _send_one(self, client, token, organization_context, request):
+        try:
+            response = finite_state_sdk._post_graphql_query(client, token, organization_context, request.query,
+                                                            request.variables, False)
+            request.future.set_result(finite_state_sdk._get_graphql_response_json(response, False))
+        except Exception as e:
+            request.future.set_exception(e)
+
+    def _send_batch(self, client, token, organization_context, batch):
+        requests = batch.requests
+        try:
+            if len(requests) == 1:
+                self._send_one(client, token, organization_context, requests[0])
+            else:
+                self._send_merged(client, token, organization_context, requests)
+        except Exception as e:
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self.metrics.record_batch(len(requests), time.monotonic() - batch.opened_at)
+
+    def _send_merged(self, client, token, organization_context, requests):
+        query, variables = _merge_queries(requests)
+        response = finite_state_sdk._post_graphql_query(client, token, organization_context, query, variables, False)
+
+        if response.status_code != 200:
+            error = Exception(f"Error: {response.status_code} - {response.text}")
+            for request in requests:
+                request.future.set_exception(error)
+            return
+
+        response_json = response.json()
+        errors = response_json.get('errors') or []
+
+        # an error without a path, e.g. a validation error in one query, fails the whole document: send each query on
+        # its own so that only the query at fault fails
+        if any(not error.get('path') for error in errors):
+            self.metrics.record_fallback()
+            for request in requests:
+                self._send_one(client, token, organization_context, request)
+            return
+
+        data = response_json.get('data')
+        unanswered = []
+        for request in requests:
+            request_errors = [dict(error, path=[request.response_keys[error['path'][0]], *error['path'][1:]])
+                              for error in errors if error['path'][0] in request.response_keys]
+            if request_errors:
+                request.future.set_exception(BreakoutException(f"Error: {request_errors}"))
+            elif data is None or any(alias not in data for alias in request.response_keys):
+                unanswered.append(request)
+            else:
+                request.future.set_result({"data": {response_key: data[alias]
+                                                    for alias, response_key in request.response_keys.items()}})
+
+        # an error in another query nulled the whole data, so these queries have no results of their own: send them
+        # again on their own rather than returning nulls as if they had succeeded
+        if unanswered:
+            self.metrics.record_fallback()
+            for request in unanswered:
+                self._send_one(client, token, organization_context, request)
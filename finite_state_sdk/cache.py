@@ -0,0 +1,322 @@
+"""
+An opt-in cache for the responses of read-only GraphQL queries.
+
+Responses are keyed by the organization context, the query with its whitespace normalized, and the variables, so each
+page of a paginated query is cached on its own and walking the pages again is served from the cache. Every entry is
+tagged with the root fields of its query (e.g. allUsers), which set its TTL and are used to invalidate it: when the SDK
+sends a mutation, the entries for the root fields it changes are dropped, following MUTATION_INVALIDATIONS. A mutation
+that is not in the table drops every entry for the organization. Mutations are never cached.
+
+Example Usage
+---
+cache = ResponseCache(ttl=600, ttls={"allFindings": 60}, backend=SQLiteCacheBackend('.finite-state-cache.db'))
+finite_state_sdk.set_default_client(FiniteStateClient(cache=cache))
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from finite_state_sdk.utils import get_root_fields
+
+"""
+DEFAULT CACHE TTL: seconds a response is cached for, unless ttls sets a TTL for one of its root fields
+"""
+DEFAULT_CACHE_TTL = 300
+"""
+DEFAULT CACHE TTLS: root fields with their own TTL by default. Export URLs change until the export completes, so they
+are never cached
+"""
+DEFAULT_CACHE_TTLS = {
+    "generateExportDownloadPresignedUrl": 0,
+}
+"""
+DEFAULT CACHE MAX ENTRIES / MAX BYTES: bounds of a cache backend, beyond which the least recently used entries are evicted
+"""
+DEFAULT_CACHE_MAX_ENTRIES = 10000
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024**2
+"""
+MUTATION INVALIDATIONS: the query root fields whose cached responses each mutation root field makes stale
+"""
+MUTATION_INVALIDATIONS = {
+    "createArtifact": ("allAssets", "allAssetVersions"),
+    "createAsset": ("allAssets", "allAssetVersions", "allProducts", "allGroups"),
+    "createAssetVersion": ("allAssetVersions", "allAssets", "allProducts"),
+    "createNewAssetVersionOnAsset": ("allAssetVersions", "allAssets", "allProducts"),
+    "createProduct": ("allProducts", "allGroups"),
+    "createTest": ("allAssetVersions", "allAssets"),
+    "updateFindingsStatuses": ("allFindings", "_allFindingsMeta"),
+    "launchBinaryUploadProcessing": ("allFindings", "_allFindingsMeta", "allSoftwareComponentInstances",
+                                     "allAssetVersions"),
+    "launchTestResultProcessing": ("allFindings", "_allFindingsMeta", "allSoftwareComponentInstances",
+                                   "allAssetVersions"),
+    # uploads and exports do not change any data that is queried
+    "startMultipartUploadV2": (),
+    "generateUploadPartUrlV2": (),
+    "completeMultipartUploadV2": (),
+    "generateSinglePartUploadUrl": (),
+    "generateTestResultUploadUrl": (),
+    "launchCycloneDxExport": (),
+    "launchSpdxExport": (),
+    "launchArtifactCSVExport": (),
+    "launchArtifactPdfExport": (),
+    "launchProductCSVExport": (),
+}
+
+
+class InMemoryCacheBackend():
+    """
+    Keeps cached responses in a dict in this process, evicting the least recently used entries beyond max_entries or
+    max_bytes. Safe to share between threads.
+
+    Args:
+        max_entries (int, optional):
+            The most responses to keep. Defaults to DEFAULT_CACHE_MAX_ENTRIES.
+        max_bytes (int, optional):
+            The most bytes of response JSON to keep. Defaults to DEFAULT_CACHE_MAX_BYTES.
+    """
+
+    # does no I/O, so the async client calls it directly from the event loop
+    blocking = False
+
+    def __init__(self, max_entries=DEFAULT_CACHE_MAX_ENTRIES, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be greater than 0")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get the value stored under key, or None if there is none or it has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[3] <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, organization_context, tags, value, expires_at):
+        """Store value under key until expires_at, tagged with the organization context and root fields."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (organization_context, frozenset(tags), value, expires_at)
+            self._size += len(value)
+            while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, organization_context, tags=None):
+        """Remove the entries of organization_context that have any of tags, or all of its entries if tags is None."""
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry[0] == organization_context and (tags is None or not entry[1].isdisjoint(tags)):
+                    self._remove(key)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remove(self, key):
+        self._size -= len(self._entries.pop(key)[2])
+
+
+class SQLiteCacheBackend():
+    """
+    Keeps cached responses in a SQLite database, so they survive restarts and can be shared by processes on the same
+    machine. The least recently used entries beyond max_entries or max_bytes are evicted.
+
+    Args:
+        path (str):
+            Path of the database file. It is created if it does not exist.
+        max_entries (int, optional):
+            The most responses to keep. Defaults to DEFAULT_CACHE_MAX_ENTRIES.
+        max_bytes (int, optional):
+            The most bytes of response JSON to keep. Defaults to DEFAULT_CACHE_MAX_BYTES.
+    """
+
+    # reads and writes the database file, so the async client calls it from an executor
+    blocking = True
+
+    def __init__(self, path, max_entries=DEFAULT_CACHE_MAX_ENTRIES, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("max_entries and max_bytes must be greater than 0")
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                organization_context TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key):
+        """Get the value stored under key, or None if there is none or it has expired."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key, organization_context, tags, value, expires_at):
+        """Store value under key until expires_at, tagged with the organization context and root fields."""
+        # tags are stored as ",tag1,tag2," so a tag can be matched with LIKE
+        stored_tags = "," + ",".join(sorted(tags)) + ","
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, organization_context, stored_tags, value, len(value), expires_at, time.time()))
+                self._evict()
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self):
+        self._connection.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        count, size = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        while count > self.max_entries or size > self.max_bytes:
+            key, entry_size = self._connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            count -= 1
+            size -= entry_size
+
+    def invalidate(self, organization_context, tags=None):
+        """Remove the entries of organization_context that have any of tags, or all of its entries if tags is None."""
+        with self._lock:
+            if tags is None:
+                self._connection.execute("DELETE FROM responses WHERE organization_context = ?",
+                                         (organization_context,))
+                return
+            for tag in tags:
+                self._connection.execute("DELETE FROM responses WHERE organization_context = ? AND tags LIKE ?",
+                                         (organization_context, f"%,{tag},%"))
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class ResponseCache():
+    """
+    Caches the responses of read-only GraphQL queries sent by send_graphql_query. Set it as the cache of a client.
+
+    Args:
+        ttl (float, optional):
+            Seconds to cache a response for. Defaults to DEFAULT_CACHE_TTL.
+        ttls (dict, optional):
+            TTLs in seconds for the responses of particular root fields, e.g. {"allFindings": 60}. A query with several
+            root fields uses the lowest of their TTLs, and a TTL of 0 disables caching for that root field. Merged over
+            DEFAULT_CACHE_TTLS.
+        backend (optional):
+            Where responses are stored: InMemoryCacheBackend (the default) or SQLiteCacheBackend.
+    """
+
+    def __init__(self, ttl=DEFAULT_CACHE_TTL, ttls=None, backend=None):
+        if ttl < 0:
+            raise ValueError("ttl cannot be less than 0")
+
+        self.ttl = ttl
+        self.ttls = dict(DEFAULT_CACHE_TTLS, **(ttls or {}))
+        self.backend = backend if backend is not None else InMemoryCacheBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def blocking(self):
+        """Whether the backend does blocking I/O. Backends without a blocking attribute are assumed to."""
+        return getattr(self.backend, 'blocking', True)
+
+    def _key(self, organization_context, query, variables):
+        normalized = json.dumps([organization_context, " ".join(query.split()), variables], sort_keys=True,
+                                default=str)
+        return hashlib.sha256(normalized.encode()).hexdigest()
+
+    def _ttl(self, root_fields):
+        return min((self.ttls.get(root_field, self.ttl) for root_field in root_fields), default=self.ttl)
+
+    def get(self, organization_context, query, variables=None):
+        """
+        Get the cached response of a query.
+
+        Returns:
+            dict: The response JSON, or None if it is not cached
+        """
+        value = self.backend.get(self._key(organization_context, query, variables))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, organization_context, query, variables, response_json):
+        """
+        Cache the response of a query, unless its TTL is 0 or its root fields cannot be determined.
+        """
+        root_fields = get_root_fields(query)
+        if not root_fields:
+            return
+        ttl = self._ttl(root_fields)
+        if ttl <= 0:
+            return
+        self.backend.set(self._key(organization_context, query, variables), organization_context, root_fields,
+                         json.dumps(response_json), time.time() + ttl)
+
+    def invalidate(self, organization_context, mutation):
+        """
+        Remove the cached responses made stale by a mutation, following MUTATION_INVALIDATIONS. If any root field of
+        the mutation is not in the table, every cached response for the organization is removed.
+        """
+        root_fields = get_root_fields(mutation)
+        if not root_fields or any(root_field not in MUTATION_INVALIDATIONS for root_field in root_fields):
+            self.backend.invalidate(organization_context)
+            return
+
+        tags = {tag for root_field in root_fields for tag in MUTATION_INVALIDATIONS[root_field]}
+        if tags:
+            self.backend.invalidate(organization_context, tags)
+
+    def clear(self):
+        """Remove every cached response."""
+        self.backend.clear()
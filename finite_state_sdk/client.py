@@ -0,0 +1,291 @@
+"""
+A pooled, keep-alive HTTP client for the Finite State API.
+
+Every module-level function in finite_state_sdk sends its HTTP traffic through a FiniteStateClient. By default a shared
+client is created on first use, so existing code keeps working unchanged and reuses TCP/TLS connections between calls.
+
+Example Usage
+---
+client = FiniteStateClient(pool_maxsize=32, timeout=(5, 120))
+
+# route every SDK call made inside the block through this client
+with finite_state_sdk.use_client(client):
+    findings = finite_state_sdk.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=ASSET_VERSION_ID)
+
+# or make it the default for the rest of the process
+finite_state_sdk.set_default_client(client)
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from finite_state_sdk.retry import DEFAULT_RETRY_POLICY, IDEMPOTENT_METHODS, RetryBudget, parse_retry_after
+
+"""
+DEFAULT POOL CONNECTIONS: number of per-host connection pools to keep
+"""
+DEFAULT_POOL_CONNECTIONS = 10
+"""
+DEFAULT POOL MAXSIZE: maximum number of keep-alive connections to keep per host
+"""
+DEFAULT_POOL_MAXSIZE = 10
+"""
+DEFAULT TIMEOUT: (connect timeout, read timeout) in seconds
+"""
+DEFAULT_TIMEOUT = (10, 300)
+
+
+_timeout_http_adapter_class = None
+
+
+def _is_rate_limited(rate_limiter, url):
+    """
+    Whether a request to url is paced by rate_limiter. Only GraphQL requests to API_URL are, so S3 part uploads, report
+    downloads and token requests neither wait for the limiter nor skew the rate it adapts to the API.
+    """
+    if rate_limiter is None:
+        return False
+    from finite_state_sdk import API_URL
+    return url == API_URL
+
+
+def _timeout_http_adapter(timeout=None, **kwargs):
+    """
+    Create an HTTPAdapter that applies a default timeout to every request that does not specify its own. The class is
+    defined on first use, so requests is only imported once a client is created.
+    """
+    global _timeout_http_adapter_class
+    if _timeout_http_adapter_class is None:
+        from requests.adapters import HTTPAdapter
+
+        class _TimeoutHTTPAdapter(HTTPAdapter):
+
+            def __init__(self, timeout=None, **kwargs):
+                self.timeout = timeout
+                super().__init__(**kwargs)
+
+            def send(self, request, **kwargs):
+                if kwargs.get("timeout") is None:
+                    kwargs["timeout"] = self.timeout
+                return super().send(request, **kwargs)
+
+        _timeout_http_adapter_class = _TimeoutHTTPAdapter
+    return _timeout_http_adapter_class(timeout=timeout, **kwargs)
+
+
+class FiniteStateClient():
+    """
+    An HTTP client that owns a pooled, keep-alive requests.Session used for GraphQL queries, uploads to pre-signed URLs,
+    and downloads of exported reports and SBOMs.
+
+    Args:
+        pool_connections (int, optional):
+            Number of per-host connection pools to cache. Defaults to DEFAULT_POOL_CONNECTIONS.
+        pool_maxsize (int, optional):
+            Maximum number of connections to keep open per host. Defaults to DEFAULT_POOL_MAXSIZE. Set this to at least
+            the number of threads that will share the client.
+        pool_block (bool, optional):
+            If True, callers wait for a free connection when a host's pool is exhausted instead of opening a new,
+            non-pooled connection. This caps the number of concurrent connections per host at pool_maxsize. Defaults to False.
+        timeout (float or tuple, optional):
+            Default timeout in seconds applied to requests that do not specify one. Either a single number or a
+            (connect, read) tuple. None disables timeouts. Defaults to DEFAULT_TIMEOUT.
+        session (requests.Session, optional):
+            An existing session to use. If provided, the pooling and timeout arguments are applied to it.
+        retry_policy (RetryPolicy, optional):
+            Which failed requests to retry and how long to wait between attempts. Defaults to DEFAULT_RETRY_POLICY.
+        retry_budget (RetryBudget, optional):
+            Limits the retries this client sends as a fraction of its requests. Defaults to a new RetryBudget().
+        rate_limiter (AdaptiveRateLimiter, optional):
+            Paces the GraphQL requests this client sends to API_URL, adapting to 429s from the server. Uploads,
+            downloads and token requests are not paced. Defaults to None, no limit.
+        token_provider (TokenProvider, optional):
+            Supplies the auth token for GraphQL queries sent through this client with token=None. Defaults to None.
+        batcher (GraphQLBatcher, optional):
+            Coalesces GraphQL queries sent at the same time from different threads into single requests. Defaults to
+            None, every query is sent on its own.
+        cache (ResponseCache, optional):
+            Caches the responses of GraphQL queries sent through this client, and invalidates them on mutations.
+            Defaults to None, no caching.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 timeout=DEFAULT_TIMEOUT, session=None, retry_policy=None, retry_budget=None,
+                 rate_limiter=None, token_provider=None, batcher=None, cache=None):
+        if pool_connections < 1:
+            raise ValueError("pool_connections must be greater than 0")
+        if pool_maxsize < 1:
+            raise ValueError("pool_maxsize must be greater than 0")
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.timeout = timeout
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.retry_budget = retry_budget or RetryBudget()
+        self.rate_limiter = rate_limiter
+        self.token_provider = token_provider
+        self.batcher = batcher
+        self.cache = cache
+
+        import requests
+
+        self.session = session if session is not None else requests.Session()
+        adapter = _timeout_http_adapter(timeout=timeout, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                        pool_block=pool_block)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _send(self, send, method, url, idempotent=None, **kwargs):
+        """
+        Send a request with send, retrying it according to the retry policy and budget. Returns the last response, even
+        if its status is an error, so callers handle failed responses exactly as they would without retries.
+        """
+        import requests
+
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        policy = self.retry_policy
+        rate_limited = _is_rate_limited(self.rate_limiter, url)
+        self.retry_budget.deposit()
+        attempt_number = 1
+
+        while True:
+            if rate_limited:
+                self.rate_limiter.acquire()
+            start = time.monotonic()
+
+            try:
+                response = send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                retry = policy.should_retry_connection_error(idempotent,
+                                                             request_sent=not isinstance(e, requests.ConnectTimeout))
+                if not self._can_retry(attempt_number, retry):
+                    raise
+                delay = policy.backoff(attempt_number)
+            else:
+                if rate_limited:
+                    self.rate_limiter.record(throttled=response.status_code == 429, latency=time.monotonic() - start)
+
+                retry = policy.should_retry_status(response.status_code, idempotent)
+                if not self._can_retry(attempt_number, retry):
+                    return response
+                delay = policy.backoff(attempt_number, status_code=response.status_code,
+                                       retry_after=parse_retry_after(response.headers.get('Retry-After')))
+                response.close()
+
+            time.sleep(delay)
+            attempt_number += 1
+
+            # rewind a file-like body, so the retry sends it from the start
+            data = kwargs.get('data')
+            if hasattr(data, 'seek'):
+                data.seek(0)
+
+    def _can_retry(self, attempt_number, retry):
+        return retry and attempt_number < self.retry_policy.max_attempts and self.retry_budget.withdraw()
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """
+        Send an HTTP request using the pooled session, retrying transient failures according to the retry policy.
+
+        Args:
+            method (str):
+                HTTP method, e.g. "GET"
+            url (str):
+                URL to send the request to
+            idempotent (bool, optional):
+                Whether the request is safe to send more than once. Defaults to True for GET, HEAD, OPTIONS, PUT and
+                DELETE, and False otherwise.
+            **kwargs:
+                Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: Response object
+        """
+        return self._send(lambda url, **kwargs: self.session.request(method, url, **kwargs), method, url,
+                          idempotent=idempotent, **kwargs)
+
+    def get(self, url, **kwargs):
+        """Send a GET request using the pooled session."""
+        return self._send(self.session.get, "GET", url, **kwargs)
+
+    def post(self, url, idempotent=False, **kwargs):
+        """Send a POST request using the pooled session. Pass idempotent=True if it is safe to retry."""
+        return self._send(self.session.post, "POST", url, idempotent=idempotent, **kwargs)
+
+    def put(self, url, **kwargs):
+        """Send a PUT request using the pooled session."""
+        return self._send(self.session.put, "PUT", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        """Send a HEAD request using the pooled session."""
+        return self._send(self.session.head, "HEAD", url, **kwargs)
+
+    def close(self):
+        """Close the session and every pooled connection."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client():
+    """
+    Get the client used by the module-level functions, creating it on first use.
+
+    Returns:
+        FiniteStateClient: The default client
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = FiniteStateClient()
+    return _default_client
+
+
+def set_default_client(client):
+    """
+    Replace the client used by the module-level functions.
+
+    Args:
+        client (FiniteStateClient):
+            The client to use. If None, a new default client will be created on next use.
+
+    Returns:
+        FiniteStateClient: The previous default client, or None if one had not been created yet
+    """
+    global _default_client
+    with _default_client_lock:
+        previous = _default_client
+        _default_client = client
+    return previous
+
+
+@contextmanager
+def use_client(client):
+    """
+    Context manager that routes the module-level functions through client for the duration of the block, then restores
+    the previous default client. The default client is process-wide, so this affects calls made from other threads too.
+
+    Args:
+        client (FiniteStateClient):
+            The client to use inside the block.
+
+    Yields:
+        FiniteStateClient: The client
+    """
+    previous = set_default_client(client)
+    try:
+        yield client
+    finally:
+        set_default_client(previous)
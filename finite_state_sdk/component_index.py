@@ -0,0 +1,323 @@
+"""
+A local index of the software components of asset versions, to answer SBOM searches without querying the API.
+
+Components are fetched once per asset version with iter_software_components and stored in SQLite, with an index on the
+lowercased name for exact and prefix matches, and a trigram index for substring (CONTAINS) matches. search() takes the
+same arguments as search_sbom and applies the same matching rules, so checking a component across the whole
+organization, e.g. "log4j", takes milliseconds instead of hundreds of requests. refresh() only fetches the asset
+versions that are not indexed yet, or whose components are older than max_age.
+
+Example Usage
+---
+with ComponentIndex('components.db') as index:
+    index.refresh(token, ORGANIZATION_CONTEXT, asset_version_ids, max_age=24 * 3600)
+    matches = index.search(ORGANIZATION_CONTEXT, name="log4j", search_method="CONTAINS")
+"""
+import json
+import sqlite3
+import threading
+import time
+
+import finite_state_sdk
+
+"""
+INDEXED COMPONENT FIELDS: the software component fields fetched and stored for each component
+"""
+INDEXED_COMPONENT_FIELDS = ("id", "name", "version", "type", "hashes", "softwareIdentifiers")
+"""
+SEARCH METHODS: EXACT and CONTAINS as in search_sbom, and PREFIX for names that start with the search string
+"""
+SEARCH_METHODS = ("EXACT", "CONTAINS", "PREFIX")
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ComponentIndex():
+    """
+    A SQLite index of software components, see refresh and search. Safe to share between threads.
+
+    Args:
+        path (str, optional):
+            Path of the database file. It is created if it does not exist. Defaults to ":memory:", an index that only
+            lasts as long as this object.
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS components (
+                    key INTEGER PRIMARY KEY,
+                    organization_context TEXT NOT NULL,
+                    asset_version_id TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    name TEXT,
+                    name_lower TEXT,
+                    version TEXT,
+                    purl TEXT,
+                    data TEXT NOT NULL,
+                    UNIQUE (organization_context, asset_version_id, id)
+                )
+            """)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS components_name ON components "
+                                     "(organization_context, name_lower)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS components_purl ON components "
+                                     "(organization_context, purl)")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS trigrams (
+                    trigram TEXT NOT NULL,
+                    component INTEGER NOT NULL,
+                    PRIMARY KEY (trigram, component)
+                ) WITHOUT ROWID
+            """)
+            # the components of an asset version are removed by component, which the primary key cannot look up
+            self._connection.execute("CREATE INDEX IF NOT EXISTS trigrams_component ON trigrams (component)")
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS asset_versions (
+                    organization_context TEXT NOT NULL,
+                    asset_version_id TEXT NOT NULL,
+                    asset_version TEXT,
+                    refreshed_at REAL NOT NULL,
+                    PRIMARY KEY (organization_context, asset_version_id)
+                )
+            """)
+
+    def __repr__(self):
+        return f'ComponentIndex({self.path!r})'
+
+    def refreshed_at(self, organization_context, asset_version_id):
+        """
+        Get when the components of an asset version were last indexed.
+
+        Returns:
+            float: Seconds since the epoch, or None if the asset version is not indexed
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT refreshed_at FROM asset_versions WHERE organization_context = ? AND asset_version_id = ?",
+                (organization_context, asset_version_id)).fetchone()
+        return row[0] if row else None
+
+    def index_asset_version(self, token, organization_context, asset_version_id, asset_version=None):
+        """
+        Blocking call: Fetch the software components of an asset version and replace its components in the index.
+
+        Args:
+            token (str or TokenProvider):
+                Auth token. This is the token returned by get_auth_token().
+            organization_context (str):
+                Organization context. This is provided by the Finite State API management.
+            asset_version_id (str):
+                Asset Version ID to index the software components of.
+            asset_version (dict, optional):
+                The asset version, e.g. {"id": ..., "name": ..., "asset": {"id": ..., "name": ...}}, returned as the
+                assetVersion of its components by search. Defaults to None, {"id": asset_version_id}.
+
+        Raises:
+            Exception: Raised if the query fails. The index is left as it was.
+
+        Returns:
+            int: The number of components indexed
+        """
+        # the components are fetched before the transaction, so the lock and the database are only held while
+        # replacing them
+        components = list(finite_state_sdk.iter_software_components(token, organization_context,
+                                                                    asset_version_id=asset_version_id,
+                                                                    fields=INDEXED_COMPONENT_FIELDS))
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM trigrams WHERE component IN (SELECT key FROM components "
+                "WHERE organization_context = ? AND asset_version_id = ?)", (organization_context, asset_version_id))
+            self._connection.execute("DELETE FROM components WHERE organization_context = ? AND asset_version_id = ?",
+                                     (organization_context, asset_version_id))
+
+            count = 0
+            for component in components:
+                name = component.get('name')
+                name_lower = name.lower() if name is not None else None
+                purl = (component.get('softwareIdentifiers') or {}).get('purl')
+                key = self._connection.execute(
+                    "INSERT INTO components (organization_context, asset_version_id, id, name, name_lower, version, "
+                    "purl, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (organization_context, asset_version_id, str(component['id']), name, name_lower,
+                     component.get('version'), purl, json.dumps(component))).lastrowid
+                self._connection.executemany("INSERT INTO trigrams VALUES (?, ?)",
+                                             ((trigram, key) for trigram in _trigrams(name_lower or '')))
+                count += 1
+
+            self._connection.execute(
+                "INSERT OR REPLACE INTO asset_versions VALUES (?, ?, ?, ?)",
+                (organization_context, asset_version_id, json.dumps(asset_version or {"id": asset_version_id}),
+                 time.time()))
+
+        return count
+
+    def refresh(self, token, organization_context, asset_version_ids, max_age=None):
+        """
+        Blocking call: Index the asset versions that are not indexed yet, or were indexed more than max_age seconds
+        ago, and remove the asset versions of the organization that are no longer in asset_version_ids.
+
+        Args:
+            token (str or TokenProvider):
+                Auth token. This is the token returned by get_auth_token().
+            organization_context (str):
+                Organization context. This is provided by the Finite State API management.
+            asset_version_ids (list):
+                The IDs of the asset versions to index, or asset version objects with an "id", which are returned as the
+                assetVersion of their components by search.
+            max_age (float, optional):
+                Seconds after which an indexed asset version is fetched again. Defaults to None, never.
+
+        Raises:
+            Exception: Raised if a query fails. The asset versions indexed before the failure are kept.
+
+        Returns:
+            list: The IDs of the asset versions that were fetched
+        """
+        asset_versions = {}
+        for asset_version in asset_version_ids:
+            if isinstance(asset_version, dict):
+                asset_versions[asset_version['id']] = asset_version
+            else:
+                asset_versions[asset_version] = None
+
+        with self._lock:
+            refreshed_at = dict(self._connection.execute(
+                "SELECT asset_version_id, refreshed_at FROM asset_versions WHERE organization_context = ?",
+                (organization_context,)).fetchall())
+
+        removed = [asset_version_id for asset_version_id in refreshed_at if asset_version_id not in asset_versions]
+        if removed:
+            self.remove(organization_context, removed)
+
+        now = time.time()
+        fetched = []
+        for asset_version_id, asset_version in asset_versions.items():
+            last = refreshed_at.get(asset_version_id)
+            if last is not None and (max_age is None or now - last < max_age):
+                continue
+            self.index_asset_version(token, organization_context, asset_version_id, asset_version=asset_version)
+            fetched.append(asset_version_id)
+
+        return fetched
+
+    def remove(self, organization_context, asset_version_ids):
+        """Remove the components of asset versions from the index."""
+        with self._lock, self._connection:
+            for asset_version_id in asset_version_ids:
+                self._connection.execute(
+                    "DELETE FROM trigrams WHERE component IN (SELECT key FROM components "
+                    "WHERE organization_context = ? AND asset_version_id = ?)",
+                    (organization_context, asset_version_id))
+                self._connection.execute(
+                    "DELETE FROM components WHERE organization_context = ? AND asset_version_id = ?",
+                    (organization_context, asset_version_id))
+                self._connection.execute(
+                    "DELETE FROM asset_versions WHERE organization_context = ? AND asset_version_id = ?",
+                    (organization_context, asset_version_id))
+
+    def search(self, organization_context, name=None, version=None, asset_version_id=None, search_method='EXACT',
+               case_sensitive=False, purl=None):
+        """
+        Search the indexed software components, without sending any queries. Matches as search_sbom does:
+        EXACT matches the whole name, ignoring case unless case_sensitive is True, and the whole version. CONTAINS
+        matches names and versions that contain the search strings, ignoring case unless case_sensitive is True. PREFIX
+        matches names that start with the search string, and versions as CONTAINS does.
+
+        Args:
+            organization_context (str):
+                Organization context. This is provided by the Finite State API management.
+            name (str, optional):
+                Name of the software component to search for. Required unless purl is given.
+            version (str, optional):
+                Version of the software component to search for. If not specified, will match all versions.
+            asset_version_id (str, optional):
+                Asset Version ID to search for software components in. If not specified, will search every indexed
+                asset version of the organization.
+            search_method (str, optional):
+                Search method to use. Valid values are "EXACT", "CONTAINS" and "PREFIX". Defaults to "EXACT".
+            case_sensitive (bool, optional):
+                Whether or not to perform a case sensitive search. Defaults to False.
+            purl (str, optional):
+                Package URL the software component must have, e.g. "pkg:maven/org.apache.logging.log4j/log4j-core@2.14.1".
+
+        Raises:
+            ValueError: Raised if neither name nor purl is provided, or search_method is not valid.
+
+        Returns:
+            list: List of SoftwareComponentInstance Objects, each with the assetVersion it belongs to
+        """
+        if not name and not purl:
+            raise ValueError("Name or purl is required")
+        if search_method not in SEARCH_METHODS:
+            raise ValueError(f"Invalid search_method: {search_method}. Valid values are: {', '.join(SEARCH_METHODS)}")
+
+        conditions = ["c.organization_context = ?"]
+        parameters = [organization_context]
+
+        if asset_version_id:
+            conditions.append("c.asset_version_id = ?")
+            parameters.append(asset_version_id)
+        if purl:
+            conditions.append("c.purl = ?")
+            parameters.append(purl)
+
+        if name:
+            name_lower = name.lower()
+            if search_method == 'EXACT':
+                conditions.append("c.name_lower = ?")
+                parameters.append(name_lower)
+                if case_sensitive:
+                    conditions.append("c.name = ?")
+                    parameters.append(name)
+            elif search_method == 'PREFIX':
+                # a range on the name index, rather than LIKE, which SQLite only runs on an index without wildcards
+                conditions.append("c.name_lower >= ? AND c.name_lower < ?")
+                parameters.extend([name_lower, name_lower + '\U0010ffff'])
+                if case_sensitive:
+                    conditions.append("substr(c.name, 1, ?) = ?")
+                    parameters.extend([len(name), name])
+            else:
+                trigrams = _trigrams(name_lower)
+                if trigrams:
+                    # only the components that have every trigram of the search string can contain it
+                    conditions.append(
+                        f"c.key IN (SELECT component FROM trigrams WHERE trigram IN ({', '.join('?' * len(trigrams))})"
+                        " GROUP BY component HAVING COUNT(*) = ?)")
+                    parameters.extend([*trigrams, len(trigrams)])
+                conditions.append("instr(c.name_lower, ?) > 0")
+                parameters.append(name_lower)
+                if case_sensitive:
+                    conditions.append("instr(c.name, ?) > 0")
+                    parameters.append(name)
+
+        if version:
+            if search_method == 'EXACT':
+                conditions.append("c.version = ?")
+            else:
+                conditions.append("instr(c.version, ?) > 0")
+            parameters.append(version)
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT c.data, a.asset_version FROM components c JOIN asset_versions a "
+                "ON a.organization_context = c.organization_context AND a.asset_version_id = c.asset_version_id "
+                f"WHERE {' AND '.join(conditions)} ORDER BY c.name, c.version, c.key", parameters).fetchall()
+
+        return [dict(json.loads(data), assetVersion=json.loads(asset_version)) for data, asset_version in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
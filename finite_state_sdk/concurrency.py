@@ -0,0 +1,113 @@
+"""
+Runs a per-asset-version function for many asset versions at once, e.g. to scan a whole organization.
+
+The calls share the default client, so they reuse its connection pool, retry budget and rate limiter, and the time a
+scan takes is bounded by max_workers rather than the sum of the latencies. Results are yielded as each call completes,
+and a call that fails does not stop the others: its exception is returned in its result.
+
+Example Usage
+---
+def critical_findings(asset_version_id):
+    return finite_state_sdk.get_findings(token, ORGANIZATION_CONTEXT, asset_version_id=asset_version_id,
+                                         severity="CRITICAL", fields="triage")
+
+for result in fan_out(critical_findings, asset_version_ids, max_workers=8,
+                      progress_callback=lambda completed, total: print(f'{completed}/{total}')):
+    if result.error is not None:
+        print(f'{result.asset_version_id} failed: {result.error}')
+    else:
+        print(f'{result.asset_version_id}: {len(result.value)} critical findings')
+"""
+from collections import deque, namedtuple
+
+from finite_state_sdk.client import DEFAULT_POOL_MAXSIZE
+
+"""
+DEFAULT FAN OUT WORKERS: the calls run at once by fan_out, the connection pool size of the default client, so no call
+waits on a connection
+"""
+DEFAULT_FAN_OUT_WORKERS = DEFAULT_POOL_MAXSIZE
+
+FanOutResult = namedtuple('FanOutResult', ['asset_version_id', 'value', 'error'])
+FanOutResult.__doc__ = """
+The outcome of one call made by fan_out: the value func returned for asset_version_id, or the exception it raised as
+error (value is then None).
+"""
+
+
+def fan_out(func, asset_version_ids, max_workers=DEFAULT_FAN_OUT_WORKERS, ordered=False, progress_callback=None):
+    """
+    Call func(asset_version_id) for every asset version ID on a pool of max_workers threads, yielding the results as
+    the calls complete. At most 2 * max_workers calls are queued at a time, so ordered results and large scans do not
+    hold every result in memory. If the caller stops iterating, the calls that have not started are cancelled.
+
+    Args:
+        func (callable):
+            Called with each asset version ID, e.g. a function that calls get_findings or get_software_components.
+        asset_version_ids (iterable):
+            The asset version IDs to call func with.
+        max_workers (int, optional):
+            The most calls to run at once. Defaults to DEFAULT_FAN_OUT_WORKERS.
+        ordered (bool, optional):
+            If True, yield the results in the order of asset_version_ids. Otherwise, yield each result as soon as its
+            call completes. Defaults to False.
+        progress_callback (callable, optional):
+            Called after each call completes as progress_callback(completed, total).
+
+    Raises:
+        ValueError: Raised if max_workers is less than 1.
+
+    Yields:
+        FanOutResult: (asset_version_id, value, error) for each asset version ID. error is the exception func raised,
+        or None if it succeeded.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be greater than 0")
+
+    asset_version_ids = list(asset_version_ids)
+
+    def call(asset_version_id):
+        try:
+            return FanOutResult(asset_version_id, func(asset_version_id), None)
+        except Exception as e:
+            return FanOutResult(asset_version_id, None, e)
+
+    def results():
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        total = len(asset_version_ids)
+        completed = 0
+        pending = iter(asset_version_ids)
+        in_flight = deque()
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='finite-state-fan-out') as executor:
+            def submit():
+                for asset_version_id in pending:
+                    in_flight.append(executor.submit(call, asset_version_id))
+                    if len(in_flight) >= 2 * max_workers:
+                        return
+
+            try:
+                submit()
+                while in_flight:
+                    if ordered:
+                        done = [in_flight.popleft()]
+                        done[0].result()
+                    else:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        # yield the completed calls in the order they were submitted
+                        done = [future for future in in_flight if future in done]
+                        for future in done:
+                            in_flight.remove(future)
+
+                    for future in done:
+                        completed += 1
+                        if progress_callback is not None:
+                            progress_callback(completed, total)
+                        yield future.result()
+                    submit()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    return results()
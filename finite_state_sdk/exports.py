@@ -0,0 +1,202 @@
+"""
+Handles for report and SBOM export jobs, so exports can be started without blocking and waited on later, one at a
+time or many together in a single polling loop.
+
+Example Usage
+---
+jobs = [
+    finite_state_sdk.launch_sbom_export(token, ORGANIZATION_CONTEXT, sbom_type="CYCLONEDX", sbom_subtype="SBOM_ONLY",
+                                        asset_version_id=asset_version_id)
+    for asset_version_id in asset_version_ids
+]
+urls = finite_state_sdk.wait_for_exports(jobs)
+"""
+import time
+
+import finite_state_sdk
+import finite_state_sdk.queries as queries
+from finite_state_sdk.polling import DEFAULT_POLLING_STRATEGY
+
+
+class ExportJobsFailedError(Exception):
+    """
+    Exception raised by wait_for_exports when one or more of the export jobs failed. The other jobs are still polled
+    to completion first, so the URLs of the exports that succeeded are not lost.
+
+    Args:
+        failures (dict):
+            Maps the export_job_id of each job that failed to the exception it raised.
+        results (list):
+            The URL to download each export from, in the same order as the export jobs, or None for a job that failed.
+    """
+
+    def __init__(self, failures, results):
+        details = '; '.join(f'{export_job_id}: {error}' for export_job_id, error in failures.items())
+        super().__init__(f"Error: {len(failures)} of {len(results)} export jobs failed. {details}")
+        self.failures = failures
+        self.results = results
+
+
+class ExportJob():
+    """
+    A handle for an export job started by launch_report_export or launch_sbom_export. Checking the status of the job
+    sends one generateExportDownloadPresignedUrl query; once the job is complete the pre-signed URL is kept, and no
+    further queries are sent.
+
+    Args:
+        token (str):
+            Auth token. This is the token returned by get_auth_token().
+        organization_context (str):
+            Organization context. This is provided by the Finite State API management.
+        export_job_id (str):
+            The exportJobId returned by the export mutation.
+    """
+
+    def __init__(self, token, organization_context, export_job_id):
+        self.token = token
+        self.organization_context = organization_context
+        self.export_job_id = export_job_id
+
+        self._status = None
+        self._download_link = None
+
+    def __repr__(self):
+        return f'ExportJob({self.export_job_id!r}, status={self._status!r})'
+
+    def status(self):
+        """
+        Query the current status of the export job.
+
+        Raises:
+            Exception: Raised if the query fails, or the export job failed.
+
+        Returns:
+            str: The status of the export job, e.g. "PENDING" or "COMPLETED"
+        """
+        if self._download_link:
+            return self._status
+
+        query = queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['query']
+        variables = queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['variables'](self.export_job_id)
+        response_data = finite_state_sdk.send_graphql_query(self.token, self.organization_context, query, variables)
+
+        self._status = response_data['data']['generateExportDownloadPresignedUrl']['status']
+        self._download_link = finite_state_sdk._get_export_download_link(response_data)
+
+        if self._status == 'FAILED':
+            raise Exception(f"Error: Export job {self.export_job_id} failed")
+
+        return self._status
+
+    def done(self):
+        """
+        Check whether the export job is known to be complete, without sending a query.
+
+        Returns:
+            bool: True if the pre-signed URL is available
+        """
+        return self._download_link is not None
+
+    def result_url(self):
+        """
+        Get the pre-signed URL for downloading the export. Does not wait: the status is checked once if the job is not
+        already known to be complete.
+
+        Raises:
+            Exception: Raised if the export job is not complete yet, or it failed.
+
+        Returns:
+            str: URL to download the export from.
+        """
+        if not self.done():
+            self.status()
+        if not self.done():
+            raise Exception(f"Error: Export job {self.export_job_id} is not complete")
+        return self._download_link
+
+    def wait(self, polling=None, verbose=False):
+        """
+        Blocking call: Poll until the export job is complete, and return the pre-signed URL for downloading the export.
+
+        Args:
+            polling (PollingStrategy, optional):
+                How to poll for the export job to complete. Defaults to DEFAULT_POLLING_STRATEGY.
+            verbose (bool, optional):
+                If True, print additional information to the console. Defaults to False.
+
+        Raises:
+            PollingTimeoutError: Raised if the export does not complete within the polling timeout.
+            PollingCancelledError: Raised if the polling cancel hook returns True.
+            Exception: Raised if a query fails, or the export job failed.
+
+        Returns:
+            str: URL to download the export from.
+        """
+        try:
+            return wait_for_exports([self], polling=polling, verbose=verbose)[0]
+        except ExportJobsFailedError as e:
+            raise e.failures[self.export_job_id]
+
+
+def wait_for_exports(export_jobs, polling=None, verbose=False):
+    """
+    Blocking call: Poll many export jobs together in a single loop until all of them are complete. Each round checks
+    every job that is still pending, so the total time is close to that of the slowest job rather than the sum. A job
+    that fails, or whose query fails, is not polled again, and the other jobs are polled until they complete; the
+    failures are then raised together in one ExportJobsFailedError, which also carries the URLs of the other exports.
+
+    Args:
+        export_jobs (list):
+            The ExportJob handles to wait for.
+        polling (PollingStrategy, optional):
+            How to poll for the export jobs to complete. The timeout applies to the whole batch. Defaults to
+            DEFAULT_POLLING_STRATEGY.
+        verbose (bool, optional):
+            If True, print additional information to the console. Defaults to False.
+
+    Raises:
+        PollingTimeoutError: Raised if the exports do not all complete within the polling timeout.
+        PollingCancelledError: Raised if the polling cancel hook returns True.
+        ExportJobsFailedError: Raised if any of the export jobs failed, or a query for one of them failed, once the
+            other export jobs are complete.
+
+    Returns:
+        list: The URLs to download the exports from, in the same order as export_jobs.
+    """
+    polling = polling or DEFAULT_POLLING_STRATEGY
+    pending = [export_job for export_job in export_jobs if not export_job.done()]
+    failures = {}
+    total_time = 0
+
+    if pending:
+        if verbose:
+            print(f'Polling for {len(pending)} export jobs to complete, starting after {polling.initial_interval} seconds')
+
+        for sleep_time in polling.intervals():
+            time.sleep(sleep_time)
+            total_time += sleep_time
+
+            for export_job in pending:
+                try:
+                    export_job.status()
+                except Exception as e:
+                    failures[export_job.export_job_id] = e
+                    if verbose:
+                        print(f'Export Job {export_job.export_job_id} Failed: {e}')
+                    continue
+                if verbose and export_job.done():
+                    print(f'Export Job {export_job.export_job_id} Complete. Download URL: {export_job.result_url()}')
+
+            pending = [export_job for export_job in pending
+                       if not export_job.done() and export_job.export_job_id not in failures]
+            if verbose:
+                print(f'Total time elapsed: {total_time:.1f} seconds, {len(pending)} export jobs pending')
+            if not pending:
+                break
+
+    if failures:
+        results = [None if export_job.export_job_id in failures else export_job.result_url()
+                   for export_job in export_jobs]
+        raise ExportJobsFailedError(failures, results)
+
+    return [export_job.result_url() for export_job in export_jobs]
@@ -0,0 +1,271 @@
+"""
+A local SQLite mirror of findings that is kept up to date incrementally.
+
+The first sync of an asset version downloads all of its findings. Each later sync only requests the findings created
+or updated since the high-water mark, the latest createdAt/updatedAt seen so far, and sweeps out the findings deleted
+or merged since then, so a nightly refresh transfers only what changed. The pages of a sync are staged in batches in a
+temporary table as they are fetched, so memory stays bounded however many findings are downloaded, then applied in a
+single short transaction: an interrupted sync leaves the mirror and its high-water mark as they were.
+
+Example Usage
+---
+with FindingsMirror('findings.db') as mirror:
+    for asset_version_id in asset_version_ids:
+        mirror.sync(token, ORGANIZATION_CONTEXT, asset_version_id=asset_version_id)
+    findings = mirror.get_findings(ORGANIZATION_CONTEXT, asset_version_id=asset_version_ids[0])
+"""
+import itertools
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import finite_state_sdk
+import finite_state_sdk.queries as queries
+
+"""
+DEFAULT SYNC OVERLAP: seconds before the high-water mark that an incremental sync starts from, so findings committed
+with a slightly earlier timestamp while the previous sync was running are not missed. Re-reading them is harmless
+"""
+DEFAULT_SYNC_OVERLAP = 300
+"""
+REQUIRED FINDING FIELDS: fields the mirror always selects, whatever fields it was created with
+"""
+REQUIRED_FINDING_FIELDS = ("id", "createdAt", "updatedAt")
+"""
+SYNC BATCH SIZE: findings held in memory by a sync before they are written to the staging table
+"""
+SYNC_BATCH_SIZE = 1000
+
+
+def _parse_timestamp(timestamp):
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _latest_timestamp(*timestamps):
+    # compare parsed times, as the API may format timestamps with different precision
+    parsed = [(_parse_timestamp(timestamp), timestamp) for timestamp in timestamps]
+    parsed = [(value, timestamp) for value, timestamp in parsed if value is not None]
+    return max(parsed)[1] if parsed else None
+
+
+class FindingsMirror():
+    """
+    Mirrors the findings of asset versions (or of a whole organization) into a SQLite database, see sync.
+
+    Args:
+        path (str):
+            Path of the database file. It is created if it does not exist.
+        fields (str or list, optional):
+            The fields to store for each finding, as for get_findings: a profile name from
+            queries.FINDING_FIELD_PROFILES or a list of field names. id, createdAt and updatedAt are always stored.
+            Defaults to None, all fields.
+        overlap (float, optional):
+            Seconds before the high-water mark that an incremental sync starts from. Defaults to DEFAULT_SYNC_OVERLAP.
+
+    Raises:
+        ValueError: Raised if fields contains an unknown profile or field name.
+    """
+
+    def __init__(self, path, fields=None, overlap=DEFAULT_SYNC_OVERLAP):
+        if overlap < 0:
+            raise ValueError("overlap cannot be less than 0")
+
+        if isinstance(fields, str):
+            if fields not in queries.FINDING_FIELD_PROFILES:
+                raise ValueError(f"Unknown finding field profile: {fields}")
+            fields = queries.FINDING_FIELD_PROFILES[fields]
+        if fields is not None:
+            fields = tuple(dict.fromkeys((*REQUIRED_FINDING_FIELDS, *fields)))
+        # fail on unknown fields now rather than at the first sync
+        queries.GET_CHANGED_FINDINGS['query'](fields)
+
+        self.path = path
+        self.fields = fields
+        self.overlap = overlap
+        self._lock = threading.Lock()
+        self._sync_ids = itertools.count()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS findings (
+                    organization_context TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    updated_at TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (organization_context, scope, id)
+                )
+            """)
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    organization_context TEXT NOT NULL,
+                    scope TEXT NOT NULL,
+                    high_water_mark TEXT,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (organization_context, scope)
+                )
+            """)
+            # the pages of a sync in progress. Temporary tables belong to this connection and are dropped when it
+            # closes, and writing them does not lock the database file
+            self._connection.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS staged_findings (
+                    sync_id INTEGER NOT NULL,
+                    id TEXT NOT NULL,
+                    updated_at TEXT,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (sync_id, id)
+                )
+            """)
+            self._connection.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS staged_removals (
+                    sync_id INTEGER NOT NULL,
+                    id TEXT NOT NULL,
+                    PRIMARY KEY (sync_id, id)
+                )
+            """)
+
+    def __repr__(self):
+        return f'FindingsMirror({self.path!r})'
+
+    def high_water_mark(self, organization_context, asset_version_id=None):
+        """
+        Get the latest createdAt/updatedAt of the mirrored findings of an asset version, or of the organization if
+        asset_version_id is None.
+
+        Returns:
+            str: The high-water mark, or None if the findings have not been synced yet
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT high_water_mark FROM sync_state WHERE organization_context = ? AND scope = ?",
+                (organization_context, asset_version_id or '')).fetchone()
+        return row[0] if row else None
+
+    def sync(self, token, organization_context, asset_version_id=None, full=False):
+        """
+        Blocking call: Bring the mirrored findings of an asset version, or of the organization if asset_version_id is
+        None, up to date. The first sync, or a sync with full=True, downloads every finding; later syncs download only
+        the findings created or updated since the high-water mark and remove the findings deleted or merged since then.
+
+        Args:
+            token (str or TokenProvider):
+                Auth token. This is the token returned by get_auth_token().
+            organization_context (str):
+                Organization context. This is provided by the Finite State API management.
+            asset_version_id (str, optional):
+                Asset Version ID to sync the findings of. Defaults to None, all findings in the organization.
+            full (bool, optional):
+                If True, download every finding again, e.g. after changing the fields of the mirror. Defaults to False.
+
+        Raises:
+            Exception: Raised if a query fails. The mirror is left as it was before the sync.
+
+        Returns:
+            dict: "full" (bool), "upserted" and "removed" counts, and the new "high_water_mark"
+        """
+        scope = asset_version_id or ''
+        high_water_mark = None if full else self.high_water_mark(organization_context, asset_version_id)
+        since = None
+        if high_water_mark is not None:
+            parsed = _parse_timestamp(high_water_mark)
+            since = (parsed - timedelta(seconds=self.overlap)).isoformat() if parsed else high_water_mark
+
+        sync_id = next(self._sync_ids)
+        try:
+            # pages are staged as they are fetched, so the lock and the database are only held for a batch at a time
+            batch = []
+            for finding in finite_state_sdk.iter_paginated_results(
+                    token, organization_context, queries.GET_CHANGED_FINDINGS['query'](self.fields),
+                    queries.GET_CHANGED_FINDINGS['variables'](asset_version_id=asset_version_id, since=since),
+                    'allFindings'):
+                updated_at = _latest_timestamp(finding.get('updatedAt'), finding.get('createdAt'))
+                high_water_mark = _latest_timestamp(high_water_mark, updated_at)
+                batch.append((sync_id, str(finding['id']), updated_at, json.dumps(finding)))
+                if len(batch) >= SYNC_BATCH_SIZE:
+                    self._stage("INSERT OR REPLACE INTO staged_findings VALUES (?, ?, ?, ?)", batch)
+                    batch = []
+            self._stage("INSERT OR REPLACE INTO staged_findings VALUES (?, ?, ?, ?)", batch)
+
+            if since is not None:
+                batch = []
+                for finding in finite_state_sdk.iter_paginated_results(
+                        token, organization_context, queries.GET_REMOVED_FINDINGS['query'],
+                        queries.GET_REMOVED_FINDINGS['variables'](asset_version_id=asset_version_id, since=since),
+                        'allFindings'):
+                    high_water_mark = _latest_timestamp(high_water_mark, finding.get('deletedAt'),
+                                                        finding.get('updatedAt'))
+                    batch.append((sync_id, str(finding['id'])))
+                    if len(batch) >= SYNC_BATCH_SIZE:
+                        self._stage("INSERT OR IGNORE INTO staged_removals VALUES (?, ?)", batch)
+                        batch = []
+                self._stage("INSERT OR IGNORE INTO staged_removals VALUES (?, ?)", batch)
+
+            with self._lock, self._connection:
+                if since is None:
+                    self._connection.execute("DELETE FROM findings WHERE organization_context = ? AND scope = ?",
+                                             (organization_context, scope))
+
+                upserted = self._connection.execute(
+                    "INSERT OR REPLACE INTO findings SELECT ?, ?, id, updated_at, data FROM staged_findings "
+                    "WHERE sync_id = ?", (organization_context, scope, sync_id)).rowcount
+                removed = self._connection.execute(
+                    "DELETE FROM findings WHERE organization_context = ? AND scope = ? "
+                    "AND id IN (SELECT id FROM staged_removals WHERE sync_id = ?)",
+                    (organization_context, scope, sync_id)).rowcount
+
+                self._connection.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                                         (organization_context, scope, high_water_mark, time.time()))
+        finally:
+            with self._lock, self._connection:
+                self._connection.execute("DELETE FROM staged_findings WHERE sync_id = ?", (sync_id,))
+                self._connection.execute("DELETE FROM staged_removals WHERE sync_id = ?", (sync_id,))
+
+        return {"full": since is None, "upserted": upserted, "removed": removed, "high_water_mark": high_water_mark}
+
+    def _stage(self, statement, rows):
+        if rows:
+            with self._lock, self._connection:
+                self._connection.executemany(statement, rows)
+
+    def get_findings(self, organization_context, asset_version_id=None):
+        """
+        Get the mirrored findings of an asset version, or of the organization if asset_version_id is None, without
+        sending any queries.
+
+        Returns:
+            list: List of Finding Objects, ordered by updatedAt
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM findings WHERE organization_context = ? AND scope = ? ORDER BY updated_at, id",
+                (organization_context, asset_version_id or '')).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def reset(self, organization_context, asset_version_id=None):
+        """
+        Remove the mirrored findings and high-water mark of an asset version, or of the organization if
+        asset_version_id is None, so the next sync downloads every finding.
+        """
+        scope = asset_version_id or ''
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM findings WHERE organization_context = ? AND scope = ?",
+                                     (organization_context, scope))
+            self._connection.execute("DELETE FROM sync_state WHERE organization_context = ? AND scope = ?",
+                                     (organization_context, scope))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,111 @@
+"""
+Polling strategies for waiting on long running jobs, such as report and SBOM exports.
+
+The first poll happens quickly, so small exports are picked up as soon as they are ready, and the interval then grows
+exponentially (with jitter, so many waiting clients do not poll in lockstep) up to a maximum. An optional deadline
+bounds the total wait, and an optional cancel hook lets the caller stop waiting early.
+
+Example Usage
+---
+polling = PollingStrategy(initial_interval=0.5, max_interval=20, timeout=1800)
+url = finite_state_sdk.generate_sbom_download_url(token, ORGANIZATION_CONTEXT, sbom_type="CYCLONEDX",
+                                                  sbom_subtype="SBOM_ONLY", asset_version_id=ASSET_VERSION_ID,
+                                                  polling=polling)
+"""
+import random
+import time
+
+
+class PollingTimeoutError(Exception):
+    """Exception raised when a job is not complete by the polling deadline."""
+
+    pass
+
+
+class PollingCancelledError(Exception):
+    """Exception raised when polling is stopped by the cancel hook."""
+
+    pass
+
+
+class PollingStrategy():
+    """
+    Exponential backoff with jitter for polling a job until it completes. A PollingStrategy holds no state between
+    waits, so one instance can be shared by any number of concurrent polls.
+
+    Args:
+        initial_interval (float, optional):
+            Seconds to wait before the first poll. Defaults to 1.
+        multiplier (float, optional):
+            Factor the interval grows by after each poll. Defaults to 1.5.
+        max_interval (float, optional):
+            Upper bound on the interval between polls, in seconds. Defaults to 15.
+        jitter (float, optional):
+            Fraction of each interval to randomize by, e.g. 0.1 waits between 90% and 110% of the interval.
+            Defaults to 0.1.
+        timeout (float, optional):
+            Seconds after which to stop polling and raise PollingTimeoutError. None polls until the job completes.
+            Defaults to None.
+        cancel (callable, optional):
+            Called with no arguments before each wait. If it returns True, polling stops and PollingCancelledError is
+            raised. A threading.Event's is_set method works well here. Defaults to None.
+
+    Raises:
+        ValueError: Raised if any of the intervals, the multiplier, the jitter or the timeout are out of range.
+    """
+
+    def __init__(self, initial_interval=1, multiplier=1.5, max_interval=15, jitter=0.1, timeout=None, cancel=None):
+        if initial_interval < 0:
+            raise ValueError("initial_interval cannot be less than 0")
+        if multiplier < 1:
+            raise ValueError("multiplier cannot be less than 1")
+        if max_interval < initial_interval:
+            raise ValueError("max_interval cannot be less than initial_interval")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be greater than 0")
+
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.cancel = cancel
+
+    def intervals(self):
+        """
+        Generate the number of seconds to wait before each poll. The caller waits, polls, and asks for the next
+        interval until the job completes.
+
+        Raises:
+            PollingTimeoutError: Raised when the next interval is requested after the timeout has passed.
+            PollingCancelledError: Raised when the next interval is requested and the cancel hook returns True.
+
+        Yields:
+            float: Seconds to wait before the next poll.
+        """
+        deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+        interval = self.initial_interval
+
+        while True:
+            if self.cancel is not None and self.cancel():
+                raise PollingCancelledError("Error: polling was cancelled")
+
+            delay = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PollingTimeoutError(f"Error: job did not complete within {self.timeout} seconds")
+                # always poll once more right at the deadline
+                delay = min(delay, remaining)
+
+            yield delay
+            interval = min(interval * self.multiplier, self.max_interval)
+
+
+"""
+DEFAULT POLLING STRATEGY: used by the export functions when no polling strategy is given
+"""
+DEFAULT_POLLING_STRATEGY = PollingStrategy()
@@ -1,6 +1,8 @@
 """
 GraphQL queries for the Finite State Platform
 """
+from functools import lru_cache
+
 DEFAULT_PAGE_SIZE = 100
 
 ALL_BUSINESS_UNITS = {
@@ -434,119 +436,193 @@ query GetFindingsCount_SDK($filter: FindingFilter)
     "variables": lambda asset_version_id=None, category=None, cve_id=None, finding_id=None, status=None, severity=None, limit=None: _create_GET_FINDINGS_VARIABLES(asset_version_id=asset_version_id, category=category, cve_id=cve_id, finding_id=finding_id, status=status, severity=severity, limit=limit, count=True)
 }
 
-GET_FINDINGS = {
-    "query": """
+
+@lru_cache(maxsize=16)
+def _create_GET_FINDINGS_COUNTS_QUERY(count):
+    # one aliased _allFindingsMeta per filter, so many counts are resolved in a single request
+    variables = ",\n    ".join(f"$filter{i}: FindingFilter" for i in range(count))
+    fields = "\n".join(f"    count{i}: _allFindingsMeta(filter: $filter{i}) {{\n        count\n    }}" for i in range(count))
+    return f"""
+query GetFindingsCounts_SDK(
+    {variables}
+) {{
+{fields}
+}}
+"""
+
+
+GET_FINDINGS_COUNTS = {
+    "query": lambda count: _create_GET_FINDINGS_COUNTS_QUERY(count),
+    "variables": lambda filters: {f"filter{i}": filter for i, filter in enumerate(filters)},
+}
+
+"""
+FINDING FIELDS: every field GET_FINDINGS can select, in query order, mapped to its sub-selection (None for scalars)
+"""
+FINDING_FIELDS = {
+    "_cursor": None,
+    "id": None,
+    "assetVersionRefId": None,
+    "title": None,
+    "date": None,
+    "createdAt": None,
+    "updatedAt": None,
+    "deletedAt": None,
+    "cvssScore": None,
+    "cvssSeverity": None,
+    "vulnIdFromTool": None,
+    "description": None,
+    "severity": None,
+    "riskScore": None,
+    "affects": "{ id name version __typename }",
+    "sourceTypes": None,
+    "category": None,
+    "subcategory": None,
+    "regression": None,
+    "currentStatus": "{ comment createdAt createdBy { id email __typename } id justification responses status updatedAt "
+                     "__typename }",
+    "cwes": "{ id cweId name __typename }",
+    "cves": "{ id cveId epss { epssPercentile epssScore } cvssScore cvssBaseMetricV3 { cvssv3 { baseScore vectorString } } "
+            "exploitsInfo { exploitProofOfConcept reportedInTheWild weaponized exploitedByNamedThreatActors "
+            "exploitedByBotnets exploitedByRansomware exploits { id __typename } __typename } __typename }",
+    "origin": None,
+    "originalFindings": "{ id vulnIdFromTool origin cvssScore cvssSeverity __typename }",
+    "originalFindingsSources": "{ id name __typename }",
+    "test": "{ id tools { id name __typename } __typename }",
+    "__typename": None,
+}
+
+"""
+FINDING FIELD PROFILES: named field sets for get_findings. "_cursor" is always selected, for pagination. "full" is the
+selection of the default GET_FINDINGS query, so it leaves out assetVersionRefId, which get_findings_for_asset_versions
+adds to the fields it selects
+"""
+FINDING_FIELD_PROFILES = {
+    "minimal": ("id", "severity", "currentStatus"),
+    "triage": ("id", "title", "date", "cvssScore", "cvssSeverity", "vulnIdFromTool", "severity", "riskScore", "affects",
+               "category", "subcategory", "currentStatus"),
+    "full": tuple(field for field in FINDING_FIELDS if field != "assetVersionRefId"),
+}
+
+
+def _field_set_key(fields):
+    # a hashable, order independent key for the query caches: a profile name, or a sorted tuple of field names
+    if fields is None or isinstance(fields, str):
+        return fields or "full"
+    return tuple(sorted(set(fields)))
+
+
+def _create_selection(fields, field_definitions, field_profiles, kind):
+    """
+    Resolve a field profile name or a list of field names to the selection set of a query. Fields are always selected in
+    the order of field_definitions, so the same fields in any order produce the same query.
+    """
+    if fields is None:
+        fields = "full"
+
+    if isinstance(fields, str):
+        if fields not in field_profiles:
+            raise ValueError(f"Unknown {kind} field profile: {fields}. Valid profiles are: {', '.join(field_profiles)}")
+        fields = field_profiles[fields]
+    else:
+        unknown = [field for field in fields if field not in field_definitions]
+        if unknown:
+            raise ValueError(f"Unknown {kind} fields: {', '.join(unknown)}")
+        if not fields:
+            raise ValueError(f"At least one {kind} field is required")
+
+    selected = set(fields) | {"_cursor"}
+    lines = []
+    for field, sub_selection in field_definitions.items():
+        if field in selected:
+            lines.append(f"{field} {sub_selection}" if sub_selection else field)
+    return "\n        ".join(lines)
+
+
+@lru_cache(maxsize=64)
+def _create_GET_FINDINGS_QUERY(fields):
+    return f"""
 query GetFindingsForAnAssetVersion_SDK (
     $filter: FindingFilter,
     $after: String,
     $first: Int,
     $orderBy: [FindingOrderBy!]
-) {
+) {{
     allFindings(filter: $filter,
                 after: $after,
                 first: $first,
                 orderBy: $orderBy
+    ) {{
+        {_create_selection(fields, FINDING_FIELDS, FINDING_FIELD_PROFILES, "finding")}
+    }}
+}}"""
+
+
+GET_FINDINGS = {
+    "query": _create_GET_FINDINGS_QUERY("full"),
+    "fields_query": lambda fields=None: _create_GET_FINDINGS_QUERY(_field_set_key(fields)),
+    "variables": lambda asset_version_id=None, category=None, cve_id=None, finding_id=None, status=None, severity=None, limit=None: _create_GET_FINDINGS_VARIABLES(asset_version_id=asset_version_id, category=category, cve_id=cve_id, finding_id=finding_id, severity=severity, status=status, limit=limit)
+}
+
+
+def _create_GET_CHANGED_FINDINGS_VARIABLES(asset_version_id=None, since=None):
+    variables = _create_GET_FINDINGS_VARIABLES(asset_version_id=asset_version_id)
+
+    # ordered by updatedAt, so a finding updated while the pages are being read moves to a later page instead of being
+    # skipped
+    variables["orderBy"] = ["updatedAt_ASC"]
+
+    if since is not None:
+        variables["filter"]["OR"] = [
+            {"updatedAt_gte": since},
+            {"createdAt_gte": since},
+        ]
+
+    return variables
+
+
+GET_CHANGED_FINDINGS = {
+    "query": lambda fields=None: GET_FINDINGS["fields_query"](fields),
+    "variables": lambda asset_version_id=None, since=None: _create_GET_CHANGED_FINDINGS_VARIABLES(asset_version_id=asset_version_id, since=since)
+}
+
+
+def _create_GET_REMOVED_FINDINGS_VARIABLES(asset_version_id=None, since=None):
+    variables = {
+        "filter": {
+            "OR": [
+                {"deletedAt_gte": since},
+                {"mergedFindingRefId_not": None, "updatedAt_gte": since},
+            ]
+        },
+        "after": None,
+        "first": DEFAULT_PAGE_SIZE,
+    }
+
+    if asset_version_id is not None:
+        variables["filter"]["assetVersionRefId"] = str(asset_version_id)
+
+    return variables
+
+
+GET_REMOVED_FINDINGS = {
+    "query": """
+query GetRemovedFindings_SDK(
+    $filter: FindingFilter,
+    $after: String,
+    $first: Int
+) {
+    allFindings(filter: $filter,
+                after: $after,
+                first: $first
     ) {
         _cursor
         id
-        title
-        date
-        createdAt
         updatedAt
         deletedAt
-        cvssScore
-        cvssSeverity
-        vulnIdFromTool
-        description
-        severity
-        riskScore
-        affects {
-            id
-            name
-            version
-            __typename
-        }
-        sourceTypes
-        category
-        subcategory
-        regression
-        currentStatus {
-            comment
-            createdAt
-            createdBy {
-                id
-                email
-                __typename
-            }
-            id
-            justification
-            responses
-            status
-            updatedAt
-            __typename
-        }
-        cwes {
-            id
-            cweId
-            name
-            __typename
-        }
-        cves {
-            id
-            cveId
-            epss {
-                epssPercentile
-                epssScore
-            }
-            cvssScore
-            cvssBaseMetricV3 {
-                cvssv3 {
-                    baseScore
-                    vectorString
-                }
-            }
-            exploitsInfo {
-                exploitProofOfConcept
-                reportedInTheWild
-                weaponized
-                exploitedByNamedThreatActors
-                exploitedByBotnets
-                exploitedByRansomware
-                exploits {
-                    id
-                    __typename
-                }
-                __typename
-            }
-            __typename
-        }
-        origin
-        originalFindings {
-            id
-            vulnIdFromTool
-            origin
-            cvssScore
-            cvssSeverity
-            __typename
-        }
-        originalFindingsSources {
-            id
-            name
-            __typename
-        }
-        test {
-            id
-            tools {
-                id
-                name
-                __typename
-            }
-            __typename
-        }
-        __typename
     }
 }""",
-    "variables": lambda asset_version_id=None, category=None, cve_id=None, finding_id=None, status=None, severity=None, limit=None: _create_GET_FINDINGS_VARIABLES(asset_version_id=asset_version_id, category=category, cve_id=cve_id, finding_id=finding_id, severity=severity, status=status, limit=limit)
+    "variables": lambda asset_version_id=None, since=None: _create_GET_REMOVED_FINDINGS_VARIABLES(asset_version_id=asset_version_id, since=since)
 }
 
 
@@ -570,94 +646,64 @@ def _create_GET_SOFTWARE_COMPONENTS_VARIABLES(asset_version_id=None, type=None):
     return variables
 
 
-GET_SOFTWARE_COMPONENTS = {
-    "query": """
+"""
+SOFTWARE COMPONENT FIELDS: every field GET_SOFTWARE_COMPONENTS can select, in query order, mapped to its sub-selection
+"""
+SOFTWARE_COMPONENT_FIELDS = {
+    "_cursor": None,
+    "id": None,
+    "name": None,
+    "type": None,
+    "version": None,
+    "hashes": "{ alg content }",
+    "author": None,
+    "licenses": "{ id name copyLeft isFsfLibre isOsiApproved url __typename }",
+    "copyrights": "{ name text url }",
+    "softwareIdentifiers": "{ cpes purl __typename }",
+    "absoluteRiskScore": None,
+    "softwareComponent": "{ id name version type url licenses { id name copyLeft isFsfLibre isOsiApproved url __typename } "
+                         "softwareIdentifiers { cpes purl __typename } __typename }",
+    "supplier": "{ name }",
+    "currentStatus": "{ id status comment createdBy { email } __typename }",
+    "test": "{ name tools { name } }",
+    "origin": None,
+    "__typename": None,
+}
+
+"""
+SOFTWARE COMPONENT FIELD PROFILES: named field sets for get_software_components
+"""
+SOFTWARE_COMPONENT_FIELD_PROFILES = {
+    "minimal": ("id", "name", "version", "type"),
+    "triage": ("id", "name", "version", "type", "licenses", "softwareIdentifiers", "absoluteRiskScore", "supplier",
+               "currentStatus"),
+    "full": tuple(SOFTWARE_COMPONENT_FIELDS),
+}
+
+
+@lru_cache(maxsize=64)
+def _create_GET_SOFTWARE_COMPONENTS_QUERY(fields):
+    return f"""
 query GetSoftwareComponentsForAnAssetVersion_SDK (
     $filter: SoftwareComponentInstanceFilter,
     $after: String,
     $first: Int,
     $orderBy: [SoftwareComponentInstanceOrderBy!]
-) {
+) {{
     allSoftwareComponentInstances(filter: $filter,
                                   after: $after,
                                   first: $first,
                                   orderBy: $orderBy
-    ) {
-        _cursor
-        id
-        name
-        type
-        version
-        hashes {
-            alg
-            content
-        }
-        author
-        licenses {
-            id
-            name
-            copyLeft
-            isFsfLibre
-            isOsiApproved
-            url
-            __typename
-        }
-        copyrights {
-            name
-            text
-            url
-        }
-        softwareIdentifiers {
-            cpes
-            purl
-            __typename
-        }
-        absoluteRiskScore
-        softwareComponent {
-            id
-            name
-            version
-            type
-            url
-            licenses {
-                id
-                name
-                copyLeft
-                isFsfLibre
-                isOsiApproved
-                url
-                __typename
-            }
-            softwareIdentifiers {
-                cpes
-                purl
-                __typename
-            }
-            __typename
-        }
-        supplier {
-            name
-        }
-        currentStatus {
-            id
-            status
-            comment
-            createdBy {
-                email
-            }
-            __typename
-        }
-        test {
-            name
-            tools {
-                name
-            }
-        }
-        origin
-        __typename
-    }
-}
-""",
+    ) {{
+        {_create_selection(fields, SOFTWARE_COMPONENT_FIELDS, SOFTWARE_COMPONENT_FIELD_PROFILES, "software component")}
+    }}
+}}
+"""
+
+
+GET_SOFTWARE_COMPONENTS = {
+    "query": _create_GET_SOFTWARE_COMPONENTS_QUERY("full"),
+    "fields_query": lambda fields=None: _create_GET_SOFTWARE_COMPONENTS_QUERY(_field_set_key(fields)),
     "variables": lambda asset_version_id=None, type=None: _create_GET_SOFTWARE_COMPONENTS_VARIABLES(asset_version_id=asset_version_id, type=type)
 }
 
@@ -930,6 +976,88 @@ mutation UpdateFindingsStatuses_SDK($ids: [ID!]!, $updateStatusInput: UpdateFind
 }
 
 
+START_MULTIPART_UPLOAD = {
+    "mutation": """
+mutation Start_SDK($testId: ID!) {
+    startMultipartUploadV2(testId: $testId) {
+        uploadId
+        key
+    }
+}
+""",
+    "variables": lambda test_id: {"testId": test_id}
+}
+
+
+GENERATE_UPLOAD_PART_URL = {
+    "mutation": """
+mutation GenerateUploadPartUrl_SDK($partNumber: Int!, $uploadId: ID!, $uploadKey: String!) {
+    generateUploadPartUrlV2(partNumber: $partNumber, uploadId: $uploadId, uploadKey: $uploadKey) {
+        key
+        uploadUrl
+    }
+}
+""",
+    "variables": lambda part_number, upload_id, upload_key: {"partNumber": part_number, "uploadId": upload_id, "uploadKey": upload_key}
+}
+
+
+COMPLETE_MULTIPART_UPLOAD = {
+    "mutation": """
+mutation CompleteMultipartUpload_SDK($partData: [PartInput!]!, $uploadId: ID!, $uploadKey: String!) {
+    completeMultipartUploadV2(partData: $partData, uploadId: $uploadId, uploadKey: $uploadKey) {
+        key
+    }
+}
+""",
+    "variables": lambda part_data, upload_id, upload_key: {"partData": part_data, "uploadId": upload_id, "uploadKey": upload_key}
+}
+
+
+def _create_LAUNCH_BINARY_UPLOAD_PROCESSING_MUTATION(quick_scan=False, enable_bandit_scan=False):
+    if quick_scan or enable_bandit_scan:
+        return """
+mutation LaunchBinaryUploadProcessing_SDK($key: String!, $testId: ID!, $configurationOptions: [BinaryAnalysisConfigurationOption]) {
+    launchBinaryUploadProcessing(key: $key, testId: $testId, configurationOptions: $configurationOptions) {
+        key
+        newBanditScanId
+    }
+}
+"""
+
+    return """
+mutation LaunchBinaryUploadProcessing_SDK($key: String!, $testId: ID!) {
+    launchBinaryUploadProcessing(key: $key, testId: $testId) {
+        key
+        newBanditScanId
+    }
+}
+"""
+
+
+def _create_LAUNCH_BINARY_UPLOAD_PROCESSING_VARIABLES(key, test_id, quick_scan=False, enable_bandit_scan=False):
+    variables = {
+        "key": key,
+        "testId": test_id
+    }
+
+    if quick_scan:
+        variables["configurationOptions"] = ["QUICK_SCAN"]
+
+    if enable_bandit_scan:
+        config_options = variables.get("configurationOptions", [])
+        config_options.append("ENABLE_BANDIT_SCAN")
+        variables["configurationOptions"] = config_options
+
+    return variables
+
+
+LAUNCH_BINARY_UPLOAD_PROCESSING = {
+    "mutation": lambda quick_scan=False, enable_bandit_scan=False: _create_LAUNCH_BINARY_UPLOAD_PROCESSING_MUTATION(quick_scan=quick_scan, enable_bandit_scan=enable_bandit_scan),
+    "variables": lambda key, test_id, quick_scan=False, enable_bandit_scan=False: _create_LAUNCH_BINARY_UPLOAD_PROCESSING_VARIABLES(key, test_id, quick_scan=quick_scan, enable_bandit_scan=enable_bandit_scan)
+}
+
+
 __all__ = [
     "ALL_BUSINESS_UNITS",
     "ALL_USERS",
@@ -0,0 +1,224 @@
+"""
+A client-side adaptive rate limiter for the GraphQL requests sent by FiniteStateClient and AsyncFiniteStateClient.
+
+Requests are paced by a token bucket whose rate adapts to the server with AIMD (additive increase, multiplicative
+decrease): every successful request nudges the rate up, and a 429 (or, optionally, a response slower than a latency
+target) cuts it by a factor. The limiter is thread-safe, so one limiter on the default client paces every thread in the
+process. With a FileRateLimitBackend, several processes on the same machine share one bucket and one rate.
+
+Example Usage
+---
+# share one adaptive limit between every worker process on this machine
+limiter = AdaptiveRateLimiter(rate=20, max_rate=200, backend=FileRateLimitBackend('/tmp/finite-state-rate-limit'))
+finite_state_sdk.set_default_client(FiniteStateClient(rate_limiter=limiter))
+"""
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class InProcessRateLimitBackend():
+    """
+    Keeps the rate limiter state in memory, shared by every thread in the process.
+    """
+
+    # does no I/O, so the async client calls it directly from the event loop
+    blocking = False
+
+    def __init__(self):
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def update(self, func):
+        """
+        Atomically apply func to the state.
+
+        Args:
+            func (callable):
+                Called with the state dict, which it may modify in place. Its return value is returned.
+        """
+        with self._lock:
+            return func(self._state)
+
+
+class FileRateLimitBackend():
+    """
+    Keeps the rate limiter state in a small JSON file, locked with flock while it is updated, so every process using
+    the same path shares one token bucket. Only available on POSIX systems.
+
+    Args:
+        path (str):
+            Path of the state file. It is created if it does not exist.
+    """
+
+    # waits on a file lock, so the async client calls it from an executor
+    blocking = True
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise Exception("Error: FileRateLimitBackend requires fcntl, which is not available on this platform")
+
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def update(self, func):
+        """
+        Atomically apply func to the state, holding an exclusive lock on the state file.
+
+        Args:
+            func (callable):
+                Called with the state dict, which it may modify in place. Its return value is returned.
+        """
+        # flock is per open file, so threads in this process also need to be serialized
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), 'r+') as file:
+                    content = file.read()
+                    state = json.loads(content) if content else {}
+                    result = func(state)
+                    file.seek(0)
+                    file.truncate()
+                    json.dump(state, file)
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+class AdaptiveRateLimiter():
+    """
+    A token bucket rate limiter whose rate adapts with AIMD. Each successful request adds increase/rate to the rate,
+    which grows it by about `increase` requests per second for every second of successful traffic. A throttled
+    request multiplies the rate by `decrease`, at most once per `cooldown` seconds, so a burst of 429s from requests
+    that were already in flight only counts once.
+
+    Args:
+        rate (float, optional):
+            Initial rate, in requests per second. Defaults to 10.
+        min_rate (float, optional):
+            The rate never drops below this. Defaults to 0.5.
+        max_rate (float, optional):
+            The rate never grows above this. Defaults to 100.
+        burst (float, optional):
+            Size of the bucket, i.e. how many requests can be sent at once after a quiet period. Defaults to the
+            current rate, so about one second of requests.
+        increase (float, optional):
+            Additive increase, in requests per second per second of successful requests. Defaults to 1.
+        decrease (float, optional):
+            Factor the rate is multiplied by when a request is throttled. Defaults to 0.5.
+        cooldown (float, optional):
+            Minimum seconds between two decreases. Defaults to 1.
+        latency_target (float, optional):
+            If set, a response slower than this many seconds is treated like a throttled request. Defaults to None.
+        backend (optional):
+            Where the limiter state is kept: InProcessRateLimitBackend (the default) or FileRateLimitBackend.
+    """
+
+    def __init__(self, rate=10, min_rate=0.5, max_rate=100, burst=None, increase=1, decrease=0.5, cooldown=1,
+                 latency_target=None, backend=None):
+        if min_rate <= 0:
+            raise ValueError("min_rate must be greater than 0")
+        if not min_rate <= rate <= max_rate:
+            raise ValueError("rate must be between min_rate and max_rate")
+        if burst is not None and burst < 1:
+            raise ValueError("burst cannot be less than 1")
+        if increase < 0:
+            raise ValueError("increase cannot be less than 0")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.latency_target = latency_target
+        self.backend = backend or InProcessRateLimitBackend()
+
+    @property
+    def blocking(self):
+        """Whether the backend does blocking I/O. Backends without a blocking attribute are assumed to."""
+        return getattr(self.backend, 'blocking', True)
+
+    def _refill(self, state, now):
+        # the state is created on first use, so processes sharing a file backend pick up each other's state
+        if 'rate' not in state:
+            state.update(rate=self.initial_rate, tokens=self._burst(self.initial_rate), updated=now, last_decrease=0)
+
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(self._burst(state['rate']), state['tokens'] + elapsed * state['rate'])
+        state['updated'] = now
+
+    def _burst(self, rate):
+        return self.burst if self.burst is not None else max(1.0, rate)
+
+    @property
+    def rate(self):
+        """The current rate, in requests per second."""
+        return self.backend.update(lambda state: state.get('rate', self.initial_rate))
+
+    def try_acquire(self):
+        """
+        Take a token if one is available, without waiting.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds to wait before trying again
+        """
+        def take(state):
+            self._refill(state, time.time())
+            if state['tokens'] >= 1:
+                state['tokens'] -= 1
+                return 0.0
+            return (1 - state['tokens']) / state['rate']
+
+        return self.backend.update(take)
+
+    def acquire(self):
+        """
+        Wait until a token is available and take it. Call this before sending each request.
+        """
+        while True:
+            delay = self.try_acquire()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def record(self, throttled=False, latency=None):
+        """
+        Adapt the rate to the outcome of a request.
+
+        Args:
+            throttled (bool, optional):
+                True if the server throttled the request, e.g. with a 429. Defaults to False.
+            latency (float, optional):
+                Seconds the request took, compared against latency_target. Defaults to None.
+        """
+        congested = throttled or (self.latency_target is not None and latency is not None
+                                  and latency > self.latency_target)
+
+        def adapt(state):
+            now = time.time()
+            self._refill(state, now)
+            if congested:
+                if now - state['last_decrease'] >= self.cooldown:
+                    state['rate'] = max(self.min_rate, state['rate'] * self.decrease)
+                    state['tokens'] = min(state['tokens'], self._burst(state['rate']))
+                    state['last_decrease'] = now
+            else:
+                state['rate'] = min(self.max_rate, state['rate'] + self.increase / state['rate'])
+            return state['rate']
+
+        return self.backend.update(adapt)
@@ -0,0 +1,215 @@
+"""
+Retry policy for the HTTP requests sent by FiniteStateClient and AsyncFiniteStateClient.
+
+Transient failures are retried with exponential backoff and full jitter, so parallel workers that are throttled at the
+same moment do not all retry in lockstep. A Retry-After header sent by the server takes precedence over the computed
+backoff. Each client also holds a RetryBudget, which caps retries at a fraction of its requests so that retries cannot
+multiply the load on a struggling server.
+
+Which failures are retried:
+    429 Too Many Requests: always, the server did not process the request. Backoff starts at throttle_backoff.
+    408 and 5xx in retry_statuses: only for idempotent requests (queries, GET and PUT), never for mutations.
+    Connection errors and timeouts: only for idempotent requests, unless the connection was never established.
+
+Example Usage
+---
+client = FiniteStateClient(retry_policy=RetryPolicy(max_attempts=8, max_backoff=60),
+                           retry_budget=RetryBudget(ratio=0.1, reserve=20))
+finite_state_sdk.set_default_client(client)
+"""
+import random
+import threading
+import time
+
+"""
+RETRY STATUS CODES: HTTP status codes that are retried for idempotent requests
+"""
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+"""
+IDEMPOTENT METHODS: HTTP methods that are safe to send more than once
+"""
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+
+def parse_retry_after(value):
+    """
+    Parse the value of a Retry-After header, which is either a number of seconds or an HTTP date.
+
+    Args:
+        value (str):
+            The header value.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or cannot be parsed
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    from email.utils import parsedate_to_datetime
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryBudget():
+    """
+    A thread-safe budget that limits retries to a fraction of requests. Each request deposits `ratio` retries into the
+    budget, up to `reserve`, and each retry withdraws one. The budget starts full, so short bursts of failures can be
+    retried, while sustained failures are retried for at most `ratio` of requests.
+
+    Args:
+        ratio (float, optional):
+            Retries earned per request. Defaults to 0.2.
+        reserve (int, optional):
+            The most retries that can be saved up and spent in a burst. Defaults to 10.
+    """
+
+    def __init__(self, ratio=0.2, reserve=10):
+        if ratio < 0:
+            raise ValueError("ratio cannot be less than 0")
+        if reserve < 1:
+            raise ValueError("reserve must be greater than 0")
+
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self):
+        """The number of retries currently available."""
+        return self._balance
+
+    def deposit(self):
+        """Record a request, earning `ratio` retries."""
+        with self._lock:
+            self._balance = min(self._balance + self.ratio, self.reserve)
+
+    def withdraw(self):
+        """
+        Spend one retry, if the budget allows it.
+
+        Returns:
+            bool: True if the retry may go ahead
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy():
+    """
+    Decides which failed requests are retried, and how long to wait before each retry. A RetryPolicy holds no state,
+    so one instance can be shared between clients; the RetryBudget is per client.
+
+    Args:
+        max_attempts (int, optional):
+            The most times a request is sent, including the first. 1 disables retries. Defaults to 5.
+        initial_backoff (float, optional):
+            Upper bound in seconds of the wait before the first retry. Defaults to 0.5.
+        multiplier (float, optional):
+            Factor the upper bound grows by after each retry. Defaults to 2.
+        max_backoff (float, optional):
+            The most seconds to wait before any retry. Defaults to 30.
+        throttle_backoff (float, optional):
+            Upper bound in seconds of the wait before the first retry of a 429 response without a Retry-After header.
+            Defaults to 2.
+        max_retry_after (float, optional):
+            The most seconds to wait when honouring a Retry-After header. Defaults to 120.
+        retry_statuses (tuple, optional):
+            Status codes retried for idempotent requests. Defaults to RETRY_STATUS_CODES.
+    """
+
+    def __init__(self, max_attempts=5, initial_backoff=0.5, multiplier=2, max_backoff=30, throttle_backoff=2,
+                 max_retry_after=120, retry_statuses=RETRY_STATUS_CODES):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be greater than 0")
+        if initial_backoff < 0 or throttle_backoff < 0:
+            raise ValueError("backoff cannot be less than 0")
+        if multiplier < 1:
+            raise ValueError("multiplier cannot be less than 1")
+        if max_backoff < 0 or max_retry_after < 0:
+            raise ValueError("max_backoff and max_retry_after cannot be less than 0")
+
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.multiplier = multiplier
+        self.max_backoff = max_backoff
+        self.throttle_backoff = throttle_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = tuple(retry_statuses)
+
+    def should_retry_status(self, status_code, idempotent=True):
+        """
+        Check whether a response with status_code should be retried.
+
+        Args:
+            status_code (int):
+                The HTTP status code of the response.
+            idempotent (bool, optional):
+                Whether the request is safe to send more than once. Defaults to True.
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        if status_code == 429:
+            return True
+        return idempotent and status_code in self.retry_statuses
+
+    def should_retry_connection_error(self, idempotent=True, request_sent=True):
+        """
+        Check whether a request that failed with a connection error or timeout should be retried.
+
+        Args:
+            idempotent (bool, optional):
+                Whether the request is safe to send more than once. Defaults to True.
+            request_sent (bool, optional):
+                False if the connection was never established, so the server cannot have seen the request.
+                Defaults to True.
+
+        Returns:
+            bool: True if the request should be retried
+        """
+        return idempotent or not request_sent
+
+    def backoff(self, attempt_number, status_code=None, retry_after=None):
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt_number (int):
+                The number of the attempt that just failed, starting at 1.
+            status_code (int, optional):
+                The status code of the failed attempt, or None for a connection error.
+            retry_after (float, optional):
+                Seconds the server asked to wait, from the Retry-After header.
+
+        Returns:
+            float: Seconds to wait
+        """
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+
+        base = self.throttle_backoff if status_code == 429 else self.initial_backoff
+        cap = min(self.max_backoff, base * self.multiplier ** (attempt_number - 1))
+        # full jitter spreads out the retries of clients that failed at the same time
+        return random.uniform(0, cap)
+
+
+"""
+DEFAULT RETRY POLICY: used by clients that are not given a retry policy
+"""
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -0,0 +1,263 @@
+"""
+A thread-safe, in-memory provider of Finite State API tokens.
+
+The expiry of each token is read from the `exp` claim of the JWT, and a background thread fetches a new token shortly
+before the current one expires, so requests never wait on a refresh. If many threads need a new token at the same time,
+only one request is sent to the token endpoint and the others wait for its result.
+
+A TokenProvider can be passed anywhere a token is accepted, or set on a client so that calls made with token=None use
+it.
+
+Example Usage
+---
+token_provider = TokenProvider(CLIENT_ID, CLIENT_SECRET)
+finite_state_sdk.set_default_client(FiniteStateClient(token_provider=token_provider))
+findings = finite_state_sdk.get_findings(None, ORGANIZATION_CONTEXT, asset_version_id=ASSET_VERSION_ID)
+token_provider.close()
+"""
+import base64
+import json
+import threading
+import time
+
+import finite_state_sdk
+
+"""
+DEFAULT REFRESH MARGIN: seconds before a token expires that the background thread fetches a new one
+"""
+DEFAULT_REFRESH_MARGIN = 300
+"""
+DEFAULT TOKEN LIFETIME: seconds a token is assumed to be valid for if it has no exp claim
+"""
+DEFAULT_TOKEN_LIFETIME = 3600
+"""
+EXPIRY SKEW: seconds before the exp claim that a token is treated as expired, to allow for clock skew and latency
+"""
+EXPIRY_SKEW = 30
+"""
+REFRESH RETRY INTERVAL: seconds the background thread waits before trying again after a failed refresh
+"""
+REFRESH_RETRY_INTERVAL = 30
+
+
+def decode_token_expiry(token):
+    """
+    Read the expiry time from the `exp` claim of a JWT. The signature is not verified.
+
+    Args:
+        token (str):
+            The JWT.
+
+    Returns:
+        float: The expiry time in seconds since the epoch, or None if the token is not a JWT or has no exp claim
+    """
+    try:
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return float(claims['exp'])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class _Refresh():
+    """A token request in flight, which every thread that needs a new token waits on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.token = None
+        self.error = None
+
+
+class TokenProvider():
+    """
+    Fetches auth tokens with get_auth_token, keeps the current token in memory, and refreshes it before it expires.
+    Safe to share between any number of threads.
+
+    Args:
+        client_id (str, optional):
+            CLIENT_ID as specified in the API documentation.
+        client_secret (str, optional):
+            CLIENT_SECRET as specified in the API documentation.
+        fetch_token (callable, optional):
+            Called with no arguments to get a new token, instead of get_auth_token with client_id and client_secret.
+        refresh_margin (float, optional):
+            Seconds before expiry to fetch a new token in the background. Tokens with a shorter lifetime are refreshed
+            halfway through it. Defaults to DEFAULT_REFRESH_MARGIN.
+        background_refresh (bool, optional):
+            If True, a daemon thread refreshes the token before it expires. If False, the token is refreshed by the
+            first get_token call within refresh_margin of expiry. Defaults to True.
+        default_lifetime (float, optional):
+            Seconds a token without an exp claim is used for. Defaults to DEFAULT_TOKEN_LIFETIME.
+
+    Raises:
+        ValueError: Raised if neither client_id and client_secret nor fetch_token are given.
+    """
+
+    def __init__(self, client_id=None, client_secret=None, fetch_token=None, refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 background_refresh=True, default_lifetime=DEFAULT_TOKEN_LIFETIME):
+        if fetch_token is None and not (client_id and client_secret):
+            raise ValueError("client_id and client_secret, or fetch_token, are required")
+        if refresh_margin < 0:
+            raise ValueError("refresh_margin cannot be less than 0")
+        if default_lifetime <= 0:
+            raise ValueError("default_lifetime must be greater than 0")
+
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.fetch_token = fetch_token
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.default_lifetime = default_lifetime
+
+        self._token = None
+        self._fetched_at = None
+        self._expires_at = None
+        self._refresh = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        return f'TokenProvider(client_id={self.client_id!r}, expires_at={self._expires_at!r})'
+
+    @property
+    def expires_at(self):
+        """The expiry time of the current token in seconds since the epoch, or None if no token has been fetched."""
+        return self._expires_at
+
+    def _refresh_at(self):
+        lifetime = self._expires_at - self._fetched_at
+        return self._expires_at - min(self.refresh_margin, lifetime / 2)
+
+    def _is_valid(self, now):
+        if self._token is None:
+            return False
+        if not self.background_refresh and now >= self._refresh_at():
+            return False
+        return now < self._expires_at - EXPIRY_SKEW
+
+    def get_token(self, block=True):
+        """
+        Get a valid token, fetching a new one if there is none yet or the current one has expired.
+
+        Args:
+            block (bool, optional):
+                If False, return None instead of waiting for a new token. Defaults to True.
+
+        Raises:
+            Exception: Raised if a new token is needed and it cannot be fetched.
+
+        Returns:
+            str: Auth token
+        """
+        with self._lock:
+            if self._is_valid(time.time()):
+                return self._token
+        if not block:
+            return None
+        return self._fetch()
+
+    def refresh(self, stale_token=None):
+        """
+        Fetch a new token now, e.g. after the API rejected the current one. Concurrent calls share one request.
+
+        Args:
+            stale_token (str, optional):
+                The token that was rejected. If the current token is already a different, valid one, because another
+                thread refreshed it in the meantime, it is returned without fetching another. Defaults to None.
+
+        Raises:
+            Exception: Raised if the new token cannot be fetched.
+
+        Returns:
+            str: Auth token
+        """
+        if stale_token is not None:
+            with self._lock:
+                if self._token != stale_token and self._is_valid(time.time()):
+                    return self._token
+        return self._fetch()
+
+    def _fetch(self):
+        # single flight: the first thread fetches the token, every other thread waits for its result
+        with self._lock:
+            refresh = self._refresh
+            leader = refresh is None
+            if leader:
+                refresh = self._refresh = _Refresh()
+
+        if leader:
+            try:
+                refresh.token = self._fetch_token()
+            except Exception as e:
+                refresh.error = e
+            finally:
+                with self._lock:
+                    self._refresh = None
+                refresh.done.set()
+
+            if refresh.error is None and self.background_refresh:
+                self._start_background_refresh()
+        else:
+            refresh.done.wait()
+
+        if refresh.error is not None:
+            raise refresh.error
+        return refresh.token
+
+    def _fetch_token(self):
+        if self.fetch_token is not None:
+            token = self.fetch_token()
+        else:
+            token = finite_state_sdk.get_auth_token(self.client_id, self.client_secret)
+
+        now = time.time()
+        expires_at = decode_token_expiry(token)
+        if expires_at is None:
+            expires_at = now + self.default_lifetime
+
+        with self._lock:
+            self._token = token
+            self._fetched_at = now
+            self._expires_at = expires_at
+        return token
+
+    def _start_background_refresh(self):
+        with self._lock:
+            if self._thread is not None or self._closed.is_set():
+                return
+            self._thread = threading.Thread(target=self._run_background_refresh, name='finite-state-token-refresh',
+                                            daemon=True)
+        self._thread.start()
+
+    def _run_background_refresh(self):
+        delay = None
+        while True:
+            if delay is None:
+                with self._lock:
+                    # at least a second, in case the token was already expired when it was fetched
+                    delay = max(1.0, self._refresh_at() - time.time())
+            if self._closed.wait(delay):
+                return
+
+            try:
+                self._fetch()
+                delay = None
+            except Exception:
+                # the current token may still be valid, try again soon; get_token refreshes it if it expires first
+                delay = REFRESH_RETRY_INTERVAL
+
+    def close(self):
+        """
+        Stop the background refresh thread. The current token can still be used, and is refreshed on demand.
+        """
+        self._closed.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
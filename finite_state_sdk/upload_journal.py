@@ -0,0 +1,136 @@
+"""
+A journal of multipart upload progress, so an interrupted upload can be resumed without re-uploading the parts that
+already succeeded. Used by finite_state_sdk.upload_file_for_binary_analysis when resume=True.
+
+Example Usage
+---
+finite_state_sdk.upload_file_for_binary_analysis(token, ORGANIZATION_CONTEXT, test_id=TEST_ID, file_path=FILE_PATH,
+                                                 resume=True)
+"""
+import json
+import os
+import threading
+
+"""
+DEFAULT JOURNAL DIR: directory the upload journals are written to
+"""
+DEFAULT_JOURNAL_DIR = '.uploadjournal'
+
+
+def file_sha256(file_path, block_size=1024**2):
+    """
+    Compute the SHA-256 hash of a file, reading it in blocks.
+
+    Args:
+        file_path (str):
+            Local path to the file to hash.
+        block_size (int, optional):
+            The size of the blocks to read. Defaults to 1 MiB.
+
+    Returns:
+        str: The hex digest of the file
+    """
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadJournal():
+    """
+    Persists the uploadId, key and completed (PartNumber, ETag) pairs of a multipart upload to a JSON file keyed by the
+    test ID and the SHA-256 of the file. A journal written with a different chunk size is ignored, because its part
+    numbers would not line up with the new parts.
+
+    Args:
+        test_id (str):
+            Test ID the file is being uploaded for.
+        file_path (str):
+            Local path to the file being uploaded.
+        chunk_size (int):
+            The size of each uploaded part.
+        journal_dir (str, optional):
+            Directory to write the journal to. Defaults to DEFAULT_JOURNAL_DIR.
+    """
+
+    def __init__(self, test_id, file_path, chunk_size, journal_dir=DEFAULT_JOURNAL_DIR):
+        self.test_id = test_id
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.file_hash = file_sha256(file_path)
+        self.journal_file = os.path.join(journal_dir, f'{test_id}-{self.file_hash}.json')
+
+        self.upload_id = None
+        self.upload_key = None
+        self.parts = {}
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.journal_file):
+            return
+
+        with open(self.journal_file, 'r') as f:
+            state = json.load(f)
+
+        if state.get('chunkSize') != self.chunk_size:
+            return
+
+        self.upload_id = state['uploadId']
+        self.upload_key = state['key']
+        self.parts = {int(part_number): etag for part_number, etag in state['parts'].items()}
+
+    def _save(self):
+        state = {
+            "testId": self.test_id,
+            "fileHash": self.file_hash,
+            "chunkSize": self.chunk_size,
+            "uploadId": self.upload_id,
+            "key": self.upload_key,
+            "parts": {str(part_number): etag for part_number, etag in self.parts.items()},
+        }
+
+        # write to a temporary file and rename it, so an interrupted write never leaves a corrupt journal
+        os.makedirs(os.path.dirname(self.journal_file) or '.', exist_ok=True)
+        temp_file = f'{self.journal_file}.tmp'
+        with open(temp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_file, self.journal_file)
+
+    @property
+    def started(self):
+        """True if the journal has a multipart upload to resume."""
+        return self.upload_id is not None
+
+    def start(self, upload_id, upload_key):
+        """
+        Record a new multipart upload, discarding any parts from a previous one.
+        """
+        with self._lock:
+            self.upload_id = upload_id
+            self.upload_key = upload_key
+            self.parts = {}
+            self._save()
+
+    def record_part(self, part_number, etag):
+        """
+        Record a part that was uploaded successfully. Safe to call from multiple threads.
+        """
+        with self._lock:
+            self.parts[part_number] = etag
+            self._save()
+
+    def delete(self):
+        """
+        Delete the journal, once the upload has been completed.
+        """
+        with self._lock:
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
@@ -1,5 +1,22 @@
-from gql import gql
-from graphql.language.ast import OperationDefinitionNode, OperationType
+import functools
+import gzip
+import io
+import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
+
+_PREFETCH_ITEM = "item"
+_PREFETCH_ERROR = "error"
+_PREFETCH_DONE = "done"
+
+# a document that never mentions the keyword cannot contain a mutation
+_MUTATION_KEYWORD = re.compile(r'\bmutation\b')
+# the first token of a document, skipping whitespace, commas and comments
+_FIRST_TOKEN = re.compile(r'(?:[\s,\ufeff]|#[^\n]*)*(\{|[_A-Za-z][_0-9A-Za-z]*)')
+
+_operation_type_table = None
 
 
 class BreakoutException(Exception):
@@ -13,28 +30,297 @@ def is_not_breakout_exception(exception):
     return not isinstance(exception, BreakoutException)
 
 
+class FileSlice(io.RawIOBase):
+    """
+    A read-only, seekable view of `length` bytes of a file starting at `offset`. Reads go straight to the file in small
+    blocks, so a part of a very large file can be uploaded without loading the part into memory. len() returns the
+    length of the slice, which HTTP clients use for the Content-Length header.
+
+    Example Usage
+    ---
+    with FileSlice(file_path, offset=0, length=1024**3) as part:
+        finite_state_sdk.upload_bytes_to_url(url, part)
+    """
+
+    block_size = 1024**2
+
+    def __init__(self, file_path, offset, length):
+        super().__init__()
+        if offset < 0:
+            raise ValueError("offset cannot be less than 0")
+        if length < 0:
+            raise ValueError("length cannot be less than 0")
+
+        self.file_path = file_path
+        self.offset = offset
+        self.length = length
+        self._position = 0
+        self._file = open(file_path, 'rb')
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        while True:
+            block = self.read(self.block_size)
+            if not block:
+                return
+            yield block
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.length + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError("Cannot seek before the start of the slice")
+
+        self._position = position
+        return self._position
+
+    def readinto(self, buffer):
+        remaining = self.length - self._position
+        if remaining <= 0:
+            return 0
+
+        view = memoryview(buffer)
+        if len(view) > remaining:
+            view = view[:remaining]
+
+        self._file.seek(self.offset + self._position)
+        read = self._file.readinto(view)
+        self._position += read
+        return read
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+@contextmanager
+def open_output_file(output_filename, atomic=True, compress=False):
+    """
+    Open a local file for writing a download to. With atomic=True the data is written to a uniquely named temporary
+    file next to output_filename, which is renamed over output_filename only once the block completes, so readers never
+    see a partially written file and concurrent downloads to the same output_filename do not write to the same file. If
+    the block raises, the partial file is removed.
+
+    Args:
+        output_filename (str):
+            The local filename to write to.
+        atomic (bool, optional):
+            If True, write to a temporary file and rename it when done. Defaults to True.
+        compress (bool, optional):
+            If True, gzip the data as it is written. Defaults to False.
+
+    Yields:
+        file: A binary file object to write to.
+    """
+    if atomic:
+        import tempfile
+
+        directory, name = os.path.split(output_filename)
+        fd, path = tempfile.mkstemp(dir=directory or '.', prefix=f'{name}.', suffix='.part')
+        # reopen by name, so file.name is the path of the temporary file
+        os.close(fd)
+    else:
+        path = output_filename
+    try:
+        with (gzip.open(path, 'wb') if compress else open(path, 'wb')) as file:
+            yield file
+        if atomic:
+            os.replace(path, output_filename)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+
+def prefetch(iterable, depth=1):
+    """
+    Consume an iterable on a background thread, keeping up to `depth` items buffered ahead of the caller. This overlaps
+    the work of producing the next item (e.g. fetching the next page from the API) with the caller's processing of the
+    current one. Exceptions raised by the iterable are re-raised to the caller. If the caller stops iterating early,
+    the background thread stops after the item it is currently producing.
+
+    Args:
+        iterable (iterable):
+            The iterable to consume.
+        depth (int, optional):
+            The maximum number of items to buffer ahead of the caller. Defaults to 1.
+
+    Yields:
+        The items of the iterable, in order.
+    """
+    if depth < 1:
+        raise ValueError("depth must be greater than 0")
+
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(kind, value=None):
+        while not stop.is_set():
+            try:
+                buffer.put((kind, value), timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put(_PREFETCH_ITEM, item):
+                    return
+        except Exception as e:
+            put(_PREFETCH_ERROR, e)
+            return
+        finally:
+            if hasattr(iterator, "close"):
+                iterator.close()
+        put(_PREFETCH_DONE)
+
+    def consume():
+        thread = threading.Thread(target=worker, name="finite-state-sdk-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                kind, value = buffer.get()
+                if kind == _PREFETCH_DONE:
+                    return
+                if kind == _PREFETCH_ERROR:
+                    raise value
+                yield value
+        finally:
+            stop.set()
+
+    return consume()
+
+
 def is_mutation(query_string):
     """
-    Check if the provided GraphQL query string contains any mutations.
+    Check if the provided GraphQL query string contains any mutations. The query constants in finite_state_sdk.queries
+    are looked up in a precomputed table, and most other documents are classified from their first token, so a full
+    parse only happens for unusual documents, and then only once per document.
 
     Args:
         query_string (str): The GraphQL query string.
 
     Returns:
-        bool: True if there is a mutation, False otherwise.
+        bool: True if there is a mutation, False otherwise. A document that cannot be parsed is not treated as a
+            mutation, so it is sent as is and the API reports the error.
     """
-    operation_types = determine_operation_types(query_string)
-    return OperationType.MUTATION in operation_types
+    operation_types = get_operation_type_table().get(query_string)
+    if operation_types is not None:
+        return 'mutation' in operation_types
+
+    if not _MUTATION_KEYWORD.search(query_string):
+        return False
+
+    first_token = _FIRST_TOKEN.match(query_string)
+    if first_token and first_token.group(1) == 'mutation':
+        return True
+
+    from graphql import GraphQLError
+
+    # e.g. a document starting with a fragment, or with several operations
+    try:
+        return 'mutation' in _parse_operation_types(query_string)
+    except GraphQLError:
+        return False
+
+
+def get_operation_type_table():
+    """
+    Get the operation types of every query and mutation string in finite_state_sdk.queries, built on first use. The
+    operation type of each constant is known from the key it is stored under, so no parsing is needed.
+
+    Returns:
+        dict: Maps each query string to a tuple of its operation types, e.g. ('query',)
+    """
+    global _operation_type_table
+    if _operation_type_table is None:
+        import finite_state_sdk.queries as queries
+
+        table = {}
+        for value in vars(queries).values():
+            if not isinstance(value, dict):
+                continue
+            for operation_type in ('query', 'mutation'):
+                if isinstance(value.get(operation_type), str):
+                    table[value[operation_type]] = (operation_type,)
+        _operation_type_table = table
+    return _operation_type_table
 
 
 def determine_operation_types(query_string):
-    # Parse the query string
+    from graphql.language.ast import OperationType
+
+    # Parse the query string, at most once per distinct string
+    return [OperationType(operation_type) for operation_type in _parse_operation_types(query_string)]
+
+
+def gql(query_string):
+    """
+    Parse a GraphQL document with gql.gql. gql and graphql-core are slow to import, so they are only imported the
+    first time a document actually needs to be parsed.
+    """
+    from gql import gql as parse
+
+    return parse(query_string)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_operation_types(query_string):
+    from graphql.language.ast import OperationDefinitionNode
+
     query_doc = gql(query_string)
     operation_types = []
 
     # Check the type of the first operation in the document
     for definition in query_doc.definitions:
         if isinstance(definition, OperationDefinitionNode):
-            operation_types.append(definition.operation)
+            operation_types.append(definition.operation.value)
+
+    return tuple(operation_types)
+
+
+@functools.lru_cache(maxsize=256)
+def get_root_fields(query_string):
+    """
+    Get the names of the root fields selected by the operations in a GraphQL document, parsing each distinct string at
+    most once.
+
+    Args:
+        query_string (str): The GraphQL query string.
+
+    Returns:
+        tuple: The root field names, e.g. ('allUsers',), or None if an operation selects root fields through fragments
+    """
+    from graphql.language.ast import FieldNode, OperationDefinitionNode
+
+    root_fields = []
+    for definition in gql(query_string).definitions:
+        if isinstance(definition, OperationDefinitionNode):
+            for selection in definition.selection_set.selections:
+                if not isinstance(selection, FieldNode):
+                    return None
+                root_fields.append(selection.name.value)
 
-    return operation_types
+    return tuple(dict.fromkeys(root_fields))
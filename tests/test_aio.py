@@ -0,0 +1,342 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+pytest.importorskip("aiohttp")
+
+import finite_state_sdk
+from finite_state_sdk import aio, queries
+from finite_state_sdk.cache import InMemoryCacheBackend, ResponseCache
+from finite_state_sdk.utils import BreakoutException
+
+
+def mock_response(status=200, json_data=None, text="", headers=None):
+    response = MagicMock()
+    response.status = status
+    response.json = AsyncMock(return_value=json_data)
+    response.text = AsyncMock(return_value=text)
+    response.headers = headers or {}
+    return response
+
+
+class TestAio:
+    token = "mock_token"
+    organization_context = "mock_organization_context"
+    query = "query { someField }"
+    mutation = "mutation { createItem { id } }"
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_send_graphql_query_success(self, mock_post):
+        mock_post.return_value = mock_response(json_data={"data": {"someField": "value"}})
+
+        result = asyncio.run(aio.send_graphql_query(self.token, self.organization_context, self.query, {"a": 1}))
+
+        mock_post.assert_called_once_with(
+            finite_state_sdk.API_URL,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.token}",
+                "Organization-Context": self.organization_context,
+            },
+            json={"query": self.query, "variables": {"a": 1}},
+            idempotent=True,
+        )
+        assert result == {"data": {"someField": "value"}}
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_send_graphql_query_graphql_error(self, mock_post):
+        mock_post.return_value = mock_response(json_data={"errors": [{"message": "boom"}]})
+
+        with pytest.raises(BreakoutException):
+            asyncio.run(aio.send_graphql_query(self.token, self.organization_context, self.query, {}))
+
+        mock_post.assert_called_once()
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_send_graphql_query_mutation_error_is_not_retried(self, mock_post):
+        mock_post.return_value = mock_response(status=500, text="Internal Server Error")
+
+        with pytest.raises(BreakoutException) as excinfo:
+            asyncio.run(aio.send_graphql_query(self.token, self.organization_context, self.mutation, {}))
+
+        assert "Error: 500 - Internal Server Error" in str(excinfo.value)
+        mock_post.assert_called_once()
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_send_graphql_query_refreshes_token_on_401(self, mock_post):
+        mock_post.side_effect = [mock_response(status=401, text="Unauthorized"),
+                                 mock_response(json_data={"data": {"someField": "value"}})]
+        token_provider = finite_state_sdk.TokenProvider(fetch_token=MagicMock(side_effect=["expired", "refreshed"]),
+                                                        background_refresh=False)
+
+        result = asyncio.run(aio.send_graphql_query(token_provider, self.organization_context, self.query, {}))
+
+        assert result == {"data": {"someField": "value"}}
+        assert mock_post.call_args_list[0][1]["headers"]["Authorization"] == "Bearer expired"
+        assert mock_post.call_args_list[1][1]["headers"]["Authorization"] == "Bearer refreshed"
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_send_graphql_query_string_token_401_is_raised(self, mock_post):
+        mock_post.return_value = mock_response(status=401, text="Unauthorized")
+        fetch_token = MagicMock(return_value="client_token")
+        client = aio.AsyncFiniteStateClient(
+            token_provider=finite_state_sdk.TokenProvider(fetch_token=fetch_token, background_refresh=False))
+
+        with aio.use_client(client):
+            with pytest.raises(Exception, match="Error: 401"):
+                asyncio.run(aio.send_graphql_query(self.token, self.organization_context, self.query, {}))
+
+        mock_post.assert_called_once()
+        fetch_token.assert_not_called()
+
+    @patch("finite_state_sdk.aio.send_graphql_query", new_callable=AsyncMock)
+    def test_get_all_paginated_results(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = [
+            {"data": {"allThings": [{"id": "1", "_cursor": "c1"}, {"id": "2", "_cursor": "c2"}]}},
+            {"data": {"allThings": [{"id": "3", "_cursor": "c3"}]}},
+            {"data": {"allThings": []}},
+        ]
+        variables = {"after": None, "first": 2}
+
+        result = asyncio.run(aio.get_all_paginated_results(self.token, self.organization_context, self.query,
+                                                           variables, "allThings"))
+
+        assert [r["id"] for r in result] == ["1", "2", "3"]
+        assert mock_send_graphql_query.call_count == 3
+        assert [call[0][3]["after"] for call in mock_send_graphql_query.call_args_list] == [None, "c2", "c3"]
+        assert variables == {"after": None, "first": 2}
+
+    @patch("finite_state_sdk.aio.get_all_paginated_results", new_callable=AsyncMock)
+    def test_get_findings(self, mock_get_all_paginated_results):
+        mock_get_all_paginated_results.return_value = [{"id": "finding1"}]
+
+        result = asyncio.run(aio.get_findings(self.token, self.organization_context, asset_version_id="av1"))
+
+        mock_get_all_paginated_results.assert_called_once_with(
+            self.token, self.organization_context, queries.GET_FINDINGS['query'],
+            queries.GET_FINDINGS['variables'](asset_version_id="av1"), 'allFindings', limit=None)
+        assert result == [{"id": "finding1"}]
+
+    @patch("finite_state_sdk.aio.get_all_paginated_results", new_callable=AsyncMock)
+    def test_get_findings_for_asset_versions(self, mock_get_all_paginated_results):
+        mock_get_all_paginated_results.side_effect = [[{"id": "f1", "assetVersionRefId": "av1"}],
+                                                      [{"id": "f2", "assetVersionRefId": "av3"}]]
+
+        result = asyncio.run(aio.get_findings_for_asset_versions(self.token, self.organization_context,
+                                                                 ["av1", "av2", "av3"], batch_size=2))
+
+        assert result == {"av1": [{"id": "f1", "assetVersionRefId": "av1"}], "av2": [],
+                          "av3": [{"id": "f2", "assetVersionRefId": "av3"}]}
+        assert [call[0][3]["filter"]["assetVersionRefId_in"] for call in mock_get_all_paginated_results.call_args_list] \
+            == [["av1", "av2"], ["av3"]]
+
+    def test_get_software_components_requires_asset_version(self):
+        with pytest.raises(Exception) as excinfo:
+            asyncio.run(aio.get_software_components(self.token, self.organization_context))
+
+        assert str(excinfo.value) == "Asset Version ID is required"
+
+    @patch("finite_state_sdk.aio.asyncio.sleep", new_callable=AsyncMock)
+    @patch("finite_state_sdk.aio.send_graphql_query", new_callable=AsyncMock)
+    def test_generate_sbom_download_url(self, mock_send_graphql_query, mock_sleep):
+        mock_send_graphql_query.side_effect = [
+            {"data": {"launchCycloneDxExport": {"exportJobId": "job1"}}},
+            {"data": {"generateExportDownloadPresignedUrl": {"status": "PENDING", "downloadLink": None}}},
+            {"data": {"generateExportDownloadPresignedUrl": {"status": "COMPLETED", "downloadLink": "mock_url"}}},
+        ]
+
+        result = asyncio.run(aio.generate_sbom_download_url(self.token, self.organization_context,
+                                                            sbom_type="CYCLONEDX", sbom_subtype="SBOM_ONLY",
+                                                            asset_version_id="av1"))
+
+        assert result == "mock_url"
+        assert mock_sleep.call_count == 2
+
+    @patch("finite_state_sdk.aio.asyncio.sleep", new_callable=AsyncMock)
+    @patch("finite_state_sdk.aio.send_graphql_query", new_callable=AsyncMock)
+    def test_generate_sbom_download_url_failed_export(self, mock_send_graphql_query, mock_sleep):
+        mock_send_graphql_query.side_effect = [
+            {"data": {"launchCycloneDxExport": {"exportJobId": "job1"}}},
+            {"data": {"generateExportDownloadPresignedUrl": {"status": "FAILED", "downloadLink": None}}},
+        ]
+
+        with pytest.raises(Exception) as excinfo:
+            asyncio.run(aio.generate_sbom_download_url(self.token, self.organization_context, sbom_type="CYCLONEDX",
+                                                       sbom_subtype="SBOM_ONLY", asset_version_id="av1"))
+
+        assert str(excinfo.value) == "Error: Export job job1 failed"
+        assert mock_send_graphql_query.call_count == 2
+
+    @patch("finite_state_sdk.aio.generate_sbom_download_url", new_callable=AsyncMock)
+    def test_download_sbom_streams_to_file(self, mock_generate_url, tmp_path):
+        mock_generate_url.return_value = "mock_url"
+        output_filename = tmp_path / "sbom.json"
+        progress = []
+
+        async def iter_chunked(chunk_size):
+            for chunk in [b"ab", b"cd"]:
+                yield chunk
+
+        response = mock_response()
+        response.content_length = 4
+        response.content.iter_chunked = iter_chunked
+
+        @asynccontextmanager
+        async def stream(method, url, **kwargs):
+            assert (method, url) == ("GET", "mock_url")
+            yield response
+
+        with patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.stream", side_effect=stream):
+            asyncio.run(aio.download_sbom(self.token, self.organization_context, asset_version_id="av1",
+                                          output_filename=str(output_filename),
+                                          progress_callback=lambda written, total: progress.append((written, total))))
+
+        assert output_filename.read_bytes() == b"abcd"
+        assert progress == [(2, 4), (4, 4)]
+
+    @patch("finite_state_sdk.aio.upload_bytes_to_url", new_callable=AsyncMock)
+    @patch("finite_state_sdk.aio.send_graphql_query", new_callable=AsyncMock)
+    def test_upload_file_for_binary_analysis(self, mock_send_graphql_query, mock_upload_bytes_to_url, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"x" * 10)
+        uploaded = []
+
+        async def upload_bytes_to_url(url, data):
+            uploaded.append((url, data.read()))
+            return mock_response(headers={"ETag": "etag1"})
+
+        mock_upload_bytes_to_url.side_effect = upload_bytes_to_url
+        mock_send_graphql_query.side_effect = [
+            {"data": {"startMultipartUploadV2": {"uploadId": "upload1", "key": "key1"}}},
+            {"data": {"generateUploadPartUrlV2": {"uploadUrl": "part_url"}}},
+            {"data": {"completeMultipartUploadV2": {"key": "key1"}}},
+            {"data": {"launchBinaryUploadProcessing": {"key": "key1"}}},
+        ]
+
+        result = asyncio.run(aio.upload_file_for_binary_analysis(self.token, self.organization_context,
+                                                                 test_id="test1", file_path=str(file_path)))
+
+        assert uploaded == [("part_url", b"x" * 10)]
+        complete_variables = mock_send_graphql_query.call_args_list[2][0][3]
+        assert complete_variables["partData"] == [{"ETag": "etag1", "PartNumber": 1}]
+        assert result == {"launchBinaryUploadProcessing": {"key": "key1"}}
+
+    def test_client_limits_concurrency(self):
+        client = aio.AsyncFiniteStateClient(max_concurrency=2)
+        in_flight = 0
+        max_in_flight = 0
+
+        def release():
+            nonlocal in_flight
+            in_flight -= 1
+
+        async def fake_request(*args, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            response = mock_response()
+            response.read = AsyncMock()
+            response.release.side_effect = release
+            return response
+
+        async def run():
+            session = await client._get_session()
+            with patch.object(session, "request", side_effect=fake_request):
+                await asyncio.gather(*[client.get("https://example.com") for _ in range(6)])
+            await client.close()
+
+        asyncio.run(run())
+        assert max_in_flight == 2
+
+    def test_client_rate_limits_only_api_requests(self):
+        limiter = MagicMock()
+        limiter.try_acquire.return_value = 0
+        client = aio.AsyncFiniteStateClient(rate_limiter=limiter)
+
+        async def fake_request(*args, **kwargs):
+            response = mock_response()
+            response.read = AsyncMock()
+            return response
+
+        async def run():
+            session = await client._get_session()
+            with patch.object(session, "request", side_effect=fake_request):
+                await client.put("https://bucket.s3.amazonaws.com/firmware.bin?partNumber=1", data=b"data")
+                limiter.try_acquire.assert_not_called()
+                limiter.record.assert_not_called()
+
+                await client.post(finite_state_sdk.API_URL, json={"query": self.query})
+            await client.close()
+
+        asyncio.run(run())
+        limiter.try_acquire.assert_called_once()
+        limiter.record.assert_called_once()
+
+    def test_client_closes_session_of_closed_event_loop(self):
+        client = aio.AsyncFiniteStateClient()
+        first_session = asyncio.run(client._get_session())
+
+        second_session = asyncio.run(client._get_session())
+
+        assert first_session.closed
+        assert second_session is not first_session
+        asyncio.run(client.close())
+        assert second_session.closed
+
+    def test_client_cannot_be_shared_with_open_event_loop(self):
+        client = aio.AsyncFiniteStateClient()
+        loop = asyncio.new_event_loop()
+        try:
+            session = loop.run_until_complete(client._get_session())
+
+            with pytest.raises(RuntimeError):
+                asyncio.run(client._get_session())
+
+            assert not session.closed
+            loop.run_until_complete(client.close())
+        finally:
+            loop.close()
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_blocking_cache_and_rate_limiter_run_off_the_event_loop(self, mock_post, tmp_path):
+        mock_post.return_value = mock_response(json_data={"data": {"someField": "value"}})
+        threads = []
+
+        class Backend(InMemoryCacheBackend):
+            blocking = True
+
+            def get(self, key):
+                threads.append(threading.get_ident())
+                return super().get(key)
+
+        cache = ResponseCache(backend=Backend())
+        client = aio.AsyncFiniteStateClient(cache=cache)
+
+        async def run():
+            loop_thread = threading.get_ident()
+            with aio.use_client(client):
+                await aio.send_graphql_query(self.token, self.organization_context, self.query, {})
+            limiter = finite_state_sdk.AdaptiveRateLimiter(
+                backend=finite_state_sdk.FileRateLimitBackend(str(tmp_path / "rate")))
+            with patch.object(limiter.backend, "update", side_effect=lambda func: threads.append(
+                    threading.get_ident()) or 0):
+                await aio.AsyncFiniteStateClient(rate_limiter=limiter)._acquire_rate_limit()
+            return loop_thread
+
+        loop_thread = asyncio.run(run())
+        assert len(threads) == 2
+        assert loop_thread not in threads
+
+    @patch("finite_state_sdk.aio.client.AsyncFiniteStateClient.post", new_callable=AsyncMock)
+    def test_in_memory_cache_runs_on_the_event_loop(self, mock_post):
+        mock_post.return_value = mock_response(json_data={"data": {"someField": "value"}})
+        client = aio.AsyncFiniteStateClient(cache=ResponseCache())
+
+        with aio.use_client(client), patch("asyncio.BaseEventLoop.run_in_executor") as mock_run_in_executor:
+            result = asyncio.run(aio.send_graphql_query(self.token, self.organization_context, self.query, {}))
+
+        assert result == {"data": {"someField": "value"}}
+        mock_run_in_executor.assert_not_called()
@@ -0,0 +1,160 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from finite_state_sdk import FiniteStateClient, GraphQLBatcher, send_graphql_query, use_client
+from finite_state_sdk.utils import BreakoutException
+
+pytest.importorskip("graphql")
+
+
+def mock_response(json_data, status_code=200):
+    response = MagicMock(status_code=status_code, text="Internal Server Error")
+    response.json.return_value = json_data
+    return response
+
+
+def run_concurrently(*calls):
+    """Run each call on its own thread, returning the result or exception of each in order."""
+    results = [None] * len(calls)
+
+    def run(i, call):
+        try:
+            results[i] = call()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+class TestGraphQLBatcher:
+    token = "mock_token"
+    organization_context = "mock_organization_context"
+    asset_query = "query GetAsset($id: ID) { allAssets(filter: {id: $id}) { id name } }"
+    user_query = "query GetUser($id: ID) { allUsers(filter: {id: $id}) { ...UserFields } } fragment UserFields on User { id email }"
+
+    def _execute(self, query, variables, delay=0):
+        def execute():
+            # the delayed query joins the batch opened by the first one
+            time.sleep(delay)
+            return send_graphql_query(self.token, self.organization_context, query, variables)
+        return execute
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            GraphQLBatcher(window=-1)
+        with pytest.raises(ValueError):
+            GraphQLBatcher(max_batch_size=0)
+
+    @patch("requests.Session.post")
+    def test_concurrent_queries_are_coalesced(self, mock_post):
+        mock_post.return_value = mock_response({"data": {
+            "b0_allAssets": [{"id": "a1", "name": "Asset"}],
+            "b1_allUsers": [{"id": "u1", "email": "user@example.com"}],
+        }})
+        batcher = GraphQLBatcher(window=5, max_batch_size=2)
+
+        with use_client(FiniteStateClient(batcher=batcher)):
+            results = run_concurrently(self._execute(self.asset_query, {"id": "a1"}),
+                                       self._execute(self.user_query, {"id": "u1"}, delay=0.1))
+
+        assert results == [{"data": {"allAssets": [{"id": "a1", "name": "Asset"}]}},
+                           {"data": {"allUsers": [{"id": "u1", "email": "user@example.com"}]}}]
+        mock_post.assert_called_once()
+        sent = mock_post.call_args[1]["json"]
+        assert "b0_allAssets: allAssets(filter: {id: $b0_id})" in sent["query"]
+        assert "...b1_UserFields" in sent["query"] and "fragment b1_UserFields on User" in sent["query"]
+        assert sent["variables"] == {"b0_id": "a1", "b1_id": "u1"}
+
+        metrics = batcher.metrics.snapshot()
+        assert metrics["queries"] == 2
+        assert metrics["requests"] == 1
+        assert metrics["average_batch_size"] == 2
+        assert metrics["max_latency"] < 5
+
+    @patch("requests.Session.post")
+    def test_single_query_is_sent_unchanged(self, mock_post):
+        mock_post.return_value = mock_response({"data": {"allAssets": []}})
+
+        with use_client(FiniteStateClient(batcher=GraphQLBatcher(window=0))):
+            result = send_graphql_query(self.token, self.organization_context, self.asset_query, {"id": "a1"})
+
+        assert result == {"data": {"allAssets": []}}
+        assert mock_post.call_args[1]["json"] == {"query": self.asset_query, "variables": {"id": "a1"}}
+
+    @patch("requests.Session.post")
+    def test_mutations_are_not_batched(self, mock_post):
+        mutation = "mutation { createItem { id } }"
+        mock_post.return_value = mock_response({"data": {"createItem": {"id": "1"}}})
+        batcher = GraphQLBatcher(window=5)
+
+        with use_client(FiniteStateClient(batcher=batcher)):
+            send_graphql_query(self.token, self.organization_context, mutation)
+
+        assert mock_post.call_args[1]["json"]["query"] == mutation
+        assert batcher.metrics.snapshot()["queries"] == 0
+
+    @patch("requests.Session.post")
+    def test_errors_are_returned_to_their_query(self, mock_post):
+        mock_post.return_value = mock_response({
+            "data": {"b0_allAssets": [{"id": "a1", "name": "Asset"}], "b1_allUsers": None},
+            "errors": [{"message": "boom", "path": ["b1_allUsers", 0, "email"]}],
+        })
+        with use_client(FiniteStateClient(batcher=GraphQLBatcher(window=5, max_batch_size=2))):
+            results = run_concurrently(self._execute(self.asset_query, {"id": "a1"}),
+                                       self._execute(self.user_query, {"id": "u1"}, delay=0.1))
+
+        assert results[0] == {"data": {"allAssets": [{"id": "a1", "name": "Asset"}]}}
+        assert isinstance(results[1], BreakoutException)
+        assert "['allUsers', 0, 'email']" in str(results[1])
+
+    @patch("requests.Session.post")
+    def test_document_errors_fall_back_to_single_queries(self, mock_post):
+        mock_post.side_effect = [
+            mock_response({"errors": [{"message": "Cannot query field"}]}),
+            mock_response({"data": {"allAssets": []}}),
+            mock_response({"errors": [{"message": "Cannot query field"}]}),
+        ]
+        batcher = GraphQLBatcher(window=5, max_batch_size=2)
+
+        with use_client(FiniteStateClient(batcher=batcher)):
+            results = run_concurrently(self._execute(self.asset_query, {"id": "a1"}),
+                                       self._execute(self.user_query, {"id": "u1"}, delay=0.1))
+
+        assert results[0] == {"data": {"allAssets": []}}
+        assert isinstance(results[1], BreakoutException)
+        assert mock_post.call_count == 3
+        assert batcher.metrics.snapshot()["fallbacks"] == 1
+
+    @patch("requests.Session.post")
+    def test_nulled_data_falls_back_to_single_queries(self, mock_post):
+        mock_post.side_effect = [
+            mock_response({"data": None, "errors": [{"message": "boom", "path": ["b1_allUsers"]}]}),
+            mock_response({"data": {"allAssets": [{"id": "a1", "name": "Asset"}]}}),
+        ]
+        batcher = GraphQLBatcher(window=5, max_batch_size=2)
+
+        with use_client(FiniteStateClient(batcher=batcher)):
+            results = run_concurrently(self._execute(self.asset_query, {"id": "a1"}),
+                                       self._execute(self.user_query, {"id": "u1"}, delay=0.1))
+
+        assert results[0] == {"data": {"allAssets": [{"id": "a1", "name": "Asset"}]}}
+        assert isinstance(results[1], BreakoutException)
+        assert mock_post.call_count == 2
+        assert mock_post.call_args_list[1][1]["json"] == {"query": self.asset_query, "variables": {"id": "a1"}}
+        assert batcher.metrics.snapshot()["fallbacks"] == 1
+
+    @patch("requests.Session.post")
+    def test_failed_request_fails_every_query(self, mock_post):
+        mock_post.return_value = mock_response({}, status_code=400)
+        with use_client(FiniteStateClient(batcher=GraphQLBatcher(window=5, max_batch_size=2))):
+            results = run_concurrently(self._execute(self.asset_query, {"id": "a1"}),
+                                       self._execute(self.user_query, {"id": "u1"}, delay=0.1))
+
+        assert all(isinstance(result, Exception) and "Error: 400" in str(result) for result in results)
+        mock_post.assert_called_once()
@@ -0,0 +1,196 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from finite_state_sdk import FiniteStateClient, queries, send_graphql_query, use_client
+from finite_state_sdk.cache import MUTATION_INVALIDATIONS, InMemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+from finite_state_sdk.utils import get_root_fields
+
+pytest.importorskip("graphql")
+
+ORG = "mock_organization_context"
+ASSETS_QUERY = "query GetAssets($first: Int) { allAssets(first: $first) { id name } }"
+FINDINGS_QUERY = "query GetFindings($first: Int) { allFindings(first: $first) { id } }"
+EXPORT_URL_QUERY = "query GetExportUrl($exportId: ID!) { generateExportDownloadPresignedUrl(exportId: $exportId) { downloadLink status } }"
+UPDATE_FINDINGS_MUTATION = "mutation UpdateFindings($ids: [ID!]!) { updateFindingsStatuses(ids: $ids) { ids } }"
+TEST_RESULT_MUTATION = "mutation CompleteTestResultUpload_SDK($key: String!, $testId: ID!) { launchTestResultProcessing(key: $key, testId: $testId) { key } }"
+
+
+def mock_response(json_data, status_code=200):
+    response = MagicMock(status_code=status_code, text="Internal Server Error")
+    response.json.return_value = json_data
+    return response
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryCacheBackend(max_entries=2)
+    else:
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2)
+        yield backend
+        backend.close()
+
+
+class TestGetRootFields:
+
+    def test_get_root_fields(self):
+        assert get_root_fields(ASSETS_QUERY) == ("allAssets",)
+        assert get_root_fields("{ allAssets { id } allUsers { id } allAssets { name } }") == ("allAssets", "allUsers")
+
+    def test_get_root_fields_with_root_fragment(self):
+        assert get_root_fields("query { ...Root } fragment Root on Query { allAssets { id } }") is None
+
+
+class TestCacheBackends:
+
+    @patch("finite_state_sdk.cache.time")
+    def test_get_set_and_expiry(self, mock_time, backend):
+        mock_time.time.return_value = 1000
+        backend.set("key", ORG, ("allAssets",), '{"a": 1}', 1010)
+
+        assert backend.get("key") == '{"a": 1}'
+        assert backend.get("missing") is None
+        mock_time.time.return_value = 1010
+        assert backend.get("key") is None
+
+    @patch("finite_state_sdk.cache.time")
+    def test_least_recently_used_entry_is_evicted(self, mock_time, backend):
+        for i, key in enumerate(["a", "b"]):
+            mock_time.time.return_value = 1000 + i
+            backend.set(key, ORG, ("allAssets",), key, 2000)
+        mock_time.time.return_value = 1002
+        assert backend.get("a") == "a"
+
+        mock_time.time.return_value = 1003
+        backend.set("c", ORG, ("allAssets",), "c", 2000)
+
+        assert backend.get("a") == "a"
+        assert backend.get("b") is None
+        assert backend.get("c") == "c"
+        assert len(backend) == 2
+
+    def test_invalidate(self, backend):
+        backend.set("assets", ORG, ("allAssets",), "1", 1e12)
+        backend.set("findings", ORG, ("allFindings", "_allFindingsMeta"), "2", 1e12)
+
+        backend.invalidate("other_org", {"allFindings"})
+        assert backend.get("findings") == "2"
+        backend.invalidate(ORG, {"_allFindingsMeta"})
+        assert backend.get("findings") is None
+        assert backend.get("assets") == "1"
+        backend.invalidate(ORG)
+        assert backend.get("assets") is None
+
+    def test_in_memory_max_bytes(self):
+        backend = InMemoryCacheBackend(max_bytes=10)
+        backend.set("a", ORG, (), "x" * 6, 1e12)
+        backend.set("b", ORG, (), "y" * 6, 1e12)
+
+        assert backend.get("a") is None
+        assert backend.get("b") == "y" * 6
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            InMemoryCacheBackend(max_entries=0)
+        with pytest.raises(ValueError):
+            ResponseCache(ttl=-1)
+
+
+class TestResponseCache:
+
+    def test_key_ignores_whitespace_and_variable_order(self):
+        cache = ResponseCache()
+        cache.set(ORG, ASSETS_QUERY, {"first": 1, "after": None}, {"data": {"allAssets": []}})
+
+        assert cache.get(ORG, "  query GetAssets($first: Int) {\n allAssets(first: $first) { id name }\n}",
+                         {"after": None, "first": 1}) == {"data": {"allAssets": []}}
+        assert cache.get(ORG, ASSETS_QUERY, {"first": 2}) is None
+        assert cache.get("other_org", ASSETS_QUERY, {"first": 1, "after": None}) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    @patch("finite_state_sdk.cache.time")
+    def test_per_field_ttl(self, mock_time):
+        mock_time.time.return_value = 1000
+        cache = ResponseCache(ttl=300, ttls={"allFindings": 10})
+        cache.set(ORG, ASSETS_QUERY, None, {"data": {"allAssets": []}})
+        cache.set(ORG, FINDINGS_QUERY, None, {"data": {"allFindings": []}})
+
+        mock_time.time.return_value = 1010
+        assert cache.get(ORG, ASSETS_QUERY) is not None
+        assert cache.get(ORG, FINDINGS_QUERY) is None
+
+    def test_export_urls_are_not_cached(self):
+        cache = ResponseCache()
+        cache.set(ORG, EXPORT_URL_QUERY, {"exportId": "1"}, {"data": {}})
+
+        assert cache.get(ORG, EXPORT_URL_QUERY, {"exportId": "1"}) is None
+
+    def test_mutation_invalidates_its_root_fields(self):
+        cache = ResponseCache()
+        cache.set(ORG, ASSETS_QUERY, None, {"data": {"allAssets": []}})
+        cache.set(ORG, FINDINGS_QUERY, None, {"data": {"allFindings": []}})
+
+        cache.invalidate(ORG, UPDATE_FINDINGS_MUTATION)
+        assert cache.get(ORG, FINDINGS_QUERY) is None
+        assert cache.get(ORG, ASSETS_QUERY) is not None
+
+        cache.invalidate(ORG, "mutation { somethingNew { id } }")
+        assert cache.get(ORG, ASSETS_QUERY) is None
+
+    def test_invalidations_name_queried_root_fields(self):
+        queried = {root_field for value in vars(queries).values()
+                   if isinstance(value, dict) and isinstance(value.get("query"), str)
+                   for root_field in get_root_fields(value["query"])}
+
+        for mutation, tags in MUTATION_INVALIDATIONS.items():
+            assert set(tags) <= queried, mutation
+
+    def test_test_result_upload_invalidates_findings_only(self):
+        cache = ResponseCache()
+        cache.set(ORG, ASSETS_QUERY, None, {"data": {"allAssets": []}})
+        cache.set(ORG, FINDINGS_QUERY, None, {"data": {"allFindings": []}})
+
+        cache.invalidate(ORG, TEST_RESULT_MUTATION)
+        assert cache.get(ORG, FINDINGS_QUERY) is None
+        assert cache.get(ORG, ASSETS_QUERY) is not None
+
+
+class TestSendGraphqlQueryWithCache:
+    token = "mock_token"
+
+    @patch("requests.Session.post")
+    def test_repeated_query_is_served_from_cache(self, mock_post):
+        mock_post.return_value = mock_response({"data": {"allAssets": [{"id": "1"}]}})
+
+        with use_client(FiniteStateClient(cache=ResponseCache())):
+            first = send_graphql_query(self.token, ORG, ASSETS_QUERY, {"first": 1})
+            second = send_graphql_query(self.token, ORG, ASSETS_QUERY, {"first": 1})
+
+        assert first == second == {"data": {"allAssets": [{"id": "1"}]}}
+        mock_post.assert_called_once()
+
+    @patch("requests.Session.post")
+    def test_failed_query_is_not_cached(self, mock_post):
+        mock_post.side_effect = [mock_response({}, status_code=400), mock_response({"data": {"allAssets": []}})]
+
+        with use_client(FiniteStateClient(cache=ResponseCache())):
+            with pytest.raises(Exception, match="Error: 400"):
+                send_graphql_query(self.token, ORG, ASSETS_QUERY)
+            assert send_graphql_query(self.token, ORG, ASSETS_QUERY) == {"data": {"allAssets": []}}
+
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_mutation_is_sent_and_invalidates_cache(self, mock_post):
+        mock_post.side_effect = [
+            mock_response({"data": {"allFindings": [{"id": "1", "status": "OPEN"}]}}),
+            mock_response({"data": {"updateFindingsStatuses": {"ids": ["1"]}}}),
+            mock_response({"data": {"allFindings": [{"id": "1", "status": "RESOLVED"}]}}),
+        ]
+
+        with use_client(FiniteStateClient(cache=ResponseCache())):
+            send_graphql_query(self.token, ORG, FINDINGS_QUERY)
+            send_graphql_query(self.token, ORG, UPDATE_FINDINGS_MUTATION, {"ids": ["1"]})
+            result = send_graphql_query(self.token, ORG, FINDINGS_QUERY)
+
+        assert result == {"data": {"allFindings": [{"id": "1", "status": "RESOLVED"}]}}
+        assert mock_post.call_count == 3
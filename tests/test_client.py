@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import finite_state_sdk
+from finite_state_sdk import FiniteStateClient, get_default_client, send_graphql_query, set_default_client, use_client
+
+
+class TestFiniteStateClient:
+    token = "mock_token"
+    organization_context = "mock_organization_context"
+    query = "query { someField }"
+
+    def test_client_mounts_pooled_adapter(self):
+        client = FiniteStateClient(pool_connections=4, pool_maxsize=32, pool_block=True, timeout=(1, 2))
+
+        adapter = client.session.get_adapter("https://platform.finitestate.io/api/v1/graphql")
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+        assert adapter.timeout == (1, 2)
+        client.close()
+
+    @pytest.mark.parametrize("argument", ["pool_connections", "pool_maxsize"])
+    def test_client_invalid_pool_size(self, argument):
+        with pytest.raises(ValueError):
+            FiniteStateClient(**{argument: 0})
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_client_applies_default_timeout(self, mock_send):
+        client = FiniteStateClient(timeout=(3, 30))
+        adapter = client.session.get_adapter("https://example.com")
+        request = MagicMock()
+
+        adapter.send(request, timeout=None)
+        assert mock_send.call_args[1]["timeout"] == (3, 30)
+
+        adapter.send(request, timeout=5)
+        assert mock_send.call_args[1]["timeout"] == 5
+
+    def test_default_client_is_shared(self):
+        assert get_default_client() is get_default_client()
+
+    def test_use_client_restores_previous_default(self):
+        previous = get_default_client()
+        client = FiniteStateClient()
+
+        with use_client(client):
+            assert get_default_client() is client
+
+        assert get_default_client() is previous
+
+    def test_set_default_client_returns_previous(self):
+        previous = get_default_client()
+        client = FiniteStateClient()
+
+        assert set_default_client(client) is previous
+        assert finite_state_sdk.get_default_client() is client
+        set_default_client(previous)
+
+    def test_send_graphql_query_uses_active_client(self):
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {"data": {"someField": "value"}}
+        client = FiniteStateClient()
+        client.post = MagicMock(return_value=mock_response)
+
+        with use_client(client):
+            result = send_graphql_query(self.token, self.organization_context, self.query, {})
+
+        client.post.assert_called_once()
+        assert client.post.call_args[0][0] == finite_state_sdk.API_URL
+        assert result == {"data": {"someField": "value"}}
@@ -0,0 +1,103 @@
+import pytest
+from unittest.mock import patch
+from finite_state_sdk.component_index import ComponentIndex
+
+ORG = "mock_organization_context"
+
+COMPONENTS = {
+    "av1": [
+        {"_cursor": None, "id": "c1", "name": "log4j-core", "version": "2.14.1", "type": "LIBRARY", "hashes": [],
+         "softwareIdentifiers": {"cpes": [], "purl": "pkg:maven/org.apache.logging.log4j/log4j-core@2.14.1"}},
+        {"_cursor": None, "id": "c2", "name": "openssl", "version": "1.1.1k", "type": "LIBRARY", "hashes": [],
+         "softwareIdentifiers": None},
+    ],
+    "av2": [
+        {"_cursor": None, "id": "c3", "name": "Log4j", "version": "1.2.17", "type": "LIBRARY", "hashes": [],
+         "softwareIdentifiers": None},
+        {"_cursor": None, "id": "c4", "name": "zlib", "version": "1.2.11", "type": "LIBRARY", "hashes": [],
+         "softwareIdentifiers": None},
+    ],
+}
+
+
+def fake_iter_software_components(token, organization_context, asset_version_id=None, fields=None, **kwargs):
+    return iter(COMPONENTS[asset_version_id])
+
+
+@pytest.fixture
+def index():
+    with ComponentIndex() as index:
+        with patch("finite_state_sdk.iter_software_components", side_effect=fake_iter_software_components):
+            index.refresh("token", ORG, [{"id": "av1", "name": "1.0", "asset": {"id": "a1", "name": "Firmware"}},
+                                         "av2"])
+        yield index
+
+
+def names(results):
+    return sorted(result["name"] for result in results)
+
+
+class TestComponentIndex:
+
+    def test_exact_search(self, index):
+        assert names(index.search(ORG, name="log4j")) == ["Log4j"]
+        assert index.search(ORG, name="log4j", case_sensitive=True) == []
+        assert names(index.search(ORG, name="Log4j", version="1.2.17")) == ["Log4j"]
+        assert index.search(ORG, name="Log4j", version="1.2") == []
+
+    def test_contains_search(self, index):
+        assert names(index.search(ORG, name="LOG4", search_method="CONTAINS")) == ["Log4j", "log4j-core"]
+        assert names(index.search(ORG, name="j-c", search_method="CONTAINS")) == ["log4j-core"]
+        assert len(index.search(ORG, name="l", search_method="CONTAINS")) == 4
+        assert names(index.search(ORG, name="Log", search_method="CONTAINS", case_sensitive=True)) == ["Log4j"]
+        assert names(index.search(ORG, name="log4j", version="2.14", search_method="CONTAINS")) == ["log4j-core"]
+
+    def test_prefix_search(self, index):
+        assert names(index.search(ORG, name="log", search_method="PREFIX")) == ["Log4j", "log4j-core"]
+        assert names(index.search(ORG, name="log4j-", search_method="PREFIX")) == ["log4j-core"]
+
+    def test_search_scope_and_asset_version(self, index):
+        results = index.search(ORG, name="log4j-core", asset_version_id="av1")
+        assert results[0]["assetVersion"] == {"id": "av1", "name": "1.0", "asset": {"id": "a1", "name": "Firmware"}}
+        assert index.search(ORG, name="log4j-core", asset_version_id="av2") == []
+        assert index.search("other_org", name="log4j-core") == []
+        assert index.search(ORG, name="log4j", search_method="CONTAINS",
+                            asset_version_id="av2")[0]["assetVersion"] == {"id": "av2"}
+
+    def test_search_by_purl(self, index):
+        assert names(index.search(ORG, purl="pkg:maven/org.apache.logging.log4j/log4j-core@2.14.1")) == ["log4j-core"]
+
+    def test_invalid_search(self, index):
+        with pytest.raises(ValueError):
+            index.search(ORG)
+        with pytest.raises(ValueError):
+            index.search(ORG, name="log4j", search_method="FUZZY")
+
+    def test_refresh_is_incremental(self, index):
+        with patch("finite_state_sdk.iter_software_components",
+                   side_effect=fake_iter_software_components) as mock_iter:
+            assert index.refresh("token", ORG, ["av1", "av2"]) == []
+            assert index.refresh("token", ORG, ["av1", "av2"], max_age=0) == ["av1", "av2"]
+            assert index.refresh("token", ORG, ["av2"]) == []
+
+        assert mock_iter.call_count == 2
+        assert index.refreshed_at(ORG, "av1") is None
+        assert names(index.search(ORG, name="log", search_method="CONTAINS")) == ["Log4j"]
+
+    def test_failed_index_keeps_previous_components(self, index):
+        def failing(*args, **kwargs):
+            yield COMPONENTS["av1"][0]
+            raise Exception("Error: 500 - Internal Server Error")
+
+        with patch("finite_state_sdk.iter_software_components", side_effect=failing):
+            with pytest.raises(Exception, match="500"):
+                index.index_asset_version("token", ORG, "av1")
+
+        assert names(index.search(ORG, name="openssl")) == ["openssl"]
+
+    def test_removing_components_uses_trigram_component_index(self, index):
+        plan = index._connection.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM trigrams WHERE component IN (SELECT key FROM components "
+            "WHERE organization_context = ? AND asset_version_id = ?)", (ORG, "av1")).fetchall()
+
+        assert any("trigrams_component" in row[-1] for row in plan)
@@ -18,14 +18,15 @@ class TestDownloadAssetVersionReport:
     mock_response_status_code = 200
 
     @patch("finite_state_sdk.generate_report_download_url", return_value="mock_download_url")
-    @patch("finite_state_sdk.requests.get")
-    @patch("builtins.open", MagicMock())
-    def test_download_asset_version_report_success(self, mock_get, mock_generate_url):
+    @patch("requests.Session.get")
+    def test_download_asset_version_report_success(self, mock_get, mock_generate_url, tmp_path):
         # Mock the response from the requests.get call
         mock_response = MagicMock()
         mock_response.status_code = self.mock_response_status_code
-        mock_response.content = self.mock_response_content
+        mock_response.headers = {"Content-Length": str(len(self.mock_response_content))}
+        mock_response.iter_content.return_value = [self.mock_response_content]
         mock_get.return_value = mock_response
+        output_filename = str(tmp_path / self.output_filename)
 
         # Call the function
         download_asset_version_report(
@@ -34,7 +35,7 @@ class TestDownloadAssetVersionReport:
             asset_version_id=self.asset_version_id,
             report_type=self.report_type,
             report_subtype=self.report_subtype,
-            output_filename=self.output_filename,
+            output_filename=output_filename,
             verbose=self.verbose
         )
 
@@ -45,14 +46,17 @@ class TestDownloadAssetVersionReport:
             asset_version_id=self.asset_version_id,
             report_type=self.report_type,
             report_subtype=self.report_subtype,
-            verbose=self.verbose
+            verbose=self.verbose,
+            polling=None
         )
-        mock_get.assert_called_once_with("mock_download_url")
-        assert mock_response.status_code == self.mock_response_status_code
-        assert mock_response.content == self.mock_response_content
+        mock_get.assert_called_once_with("mock_download_url", stream=True)
+        with open(output_filename, "rb") as f:
+            assert f.read() == self.mock_response_content
+        assert [path.name for path in tmp_path.iterdir()] == [self.output_filename]
+        mock_response.close.assert_called_once()
 
     @patch("finite_state_sdk.generate_report_download_url", return_value="mock_download_url")
-    @patch("finite_state_sdk.requests.get")
+    @patch("requests.Session.get")
     @patch("builtins.open", MagicMock())
     def test_download_asset_version_report_failure(self, mock_get, mock_generate_url):
         # Mock the response from the requests.get call
@@ -79,7 +83,8 @@ class TestDownloadAssetVersionReport:
             asset_version_id=self.asset_version_id,
             report_type=self.report_type,
             report_subtype=self.report_subtype,
-            verbose=self.verbose
+            verbose=self.verbose,
+            polling=None
         )
-        mock_get.assert_called_once_with("mock_download_url")
+        mock_get.assert_called_once_with("mock_download_url", stream=True)
         assert str(e.value) == f"Failed to download the file. Status code: {mock_response.status_code}"
@@ -1,6 +1,8 @@
+import gzip
 import pytest
 from unittest.mock import patch, MagicMock
 from finite_state_sdk import download_sbom
+from finite_state_sdk.utils import open_output_file
 
 
 class TestDownloadSBOM:
@@ -18,14 +20,15 @@ class TestDownloadSBOM:
     mock_response_status_code = 200
 
     @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
-    @patch("finite_state_sdk.requests.get")
-    @patch("builtins.open", MagicMock())
-    def test_download_sbom_success(self, mock_get, mock_generate_url):
+    @patch("requests.Session.get")
+    def test_download_sbom_success(self, mock_get, mock_generate_url, tmp_path):
         # Mock the response from the requests.get call
         mock_response = MagicMock()
         mock_response.status_code = self.mock_response_status_code
-        mock_response.content = self.mock_response_content
+        mock_response.headers = {"Content-Length": str(len(self.mock_response_content))}
+        mock_response.iter_content.return_value = [self.mock_response_content]
         mock_get.return_value = mock_response
+        output_filename = str(tmp_path / self.output_filename)
 
         # Call the function
         download_sbom(
@@ -34,7 +37,7 @@ class TestDownloadSBOM:
             sbom_type=self.sbom_type,
             sbom_subtype=self.sbom_subtype,
             asset_version_id=self.asset_version_id,
-            output_filename=self.output_filename,
+            output_filename=output_filename,
             verbose=self.verbose
         )
 
@@ -45,14 +48,17 @@ class TestDownloadSBOM:
             sbom_type=self.sbom_type,
             sbom_subtype=self.sbom_subtype,
             asset_version_id=self.asset_version_id,
-            verbose=self.verbose
+            verbose=self.verbose,
+            polling=None
         )
-        mock_get.assert_called_once_with("mock_download_url")
-        assert mock_response.status_code == self.mock_response_status_code
-        assert mock_response.content == self.mock_response_content
+        mock_get.assert_called_once_with("mock_download_url", stream=True)
+        with open(output_filename, "rb") as f:
+            assert f.read() == self.mock_response_content
+        assert [path.name for path in tmp_path.iterdir()] == [self.output_filename]
+        mock_response.close.assert_called_once()
 
     @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
-    @patch("finite_state_sdk.requests.get")
+    @patch("requests.Session.get")
     @patch("builtins.open", MagicMock())
     def test_download_sbom_failure(self, mock_get, mock_generate_url):
         # Mock the response from the requests.get call
@@ -79,7 +85,146 @@ class TestDownloadSBOM:
             sbom_type=self.sbom_type,
             sbom_subtype=self.sbom_subtype,
             asset_version_id=self.asset_version_id,
-            verbose=self.verbose
+            verbose=self.verbose,
+            polling=None
         )
-        mock_get.assert_called_once_with("mock_download_url")
+        mock_get.assert_called_once_with("mock_download_url", stream=True)
         assert str(e.value) == f"Failed to download the file. Status code: {mock_response.status_code}"
+
+    @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
+    @patch("requests.Session.get")
+    def test_download_sbom_streams_compressed_with_progress(self, mock_get, mock_generate_url, tmp_path):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Length": "6"}
+        mock_response.iter_content.return_value = [b"ab", b"cd", b"ef"]
+        mock_get.return_value = mock_response
+        output_filename = str(tmp_path / "sbom.json.gz")
+        progress = []
+
+        download_sbom(self.auth_token, self.organization_context, asset_version_id=self.asset_version_id,
+                      output_filename=output_filename, chunk_size=2, compress=True,
+                      progress_callback=lambda written, total: progress.append((written, total)))
+
+        mock_response.iter_content.assert_called_once_with(chunk_size=2)
+        with gzip.open(output_filename, "rb") as f:
+            assert f.read() == b"abcdef"
+        assert progress == [(2, 6), (4, 6), (6, 6)]
+
+    @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
+    @patch("requests.Session.get")
+    def test_download_sbom_interrupted_leaves_no_file(self, mock_get, mock_generate_url, tmp_path):
+        def iter_content(chunk_size):
+            yield b"partial"
+            raise ConnectionError("Connection reset by peer")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.headers = {}
+        mock_response.iter_content.side_effect = iter_content
+        mock_get.return_value = mock_response
+        output_filename = tmp_path / "sbom.json"
+
+        with pytest.raises(ConnectionError):
+            download_sbom(self.auth_token, self.organization_context, asset_version_id=self.asset_version_id,
+                          output_filename=str(output_filename))
+
+        assert list(tmp_path.iterdir()) == []
+        mock_response.close.assert_called_once()
+
+    def test_concurrent_atomic_writes_use_separate_files(self, tmp_path):
+        output_filename = str(tmp_path / "sbom.json")
+
+        with open_output_file(output_filename) as first, open_output_file(output_filename) as second:
+            assert first.name != second.name
+            first.write(b"first")
+            second.write(b"second")
+
+        assert [path.name for path in tmp_path.iterdir()] == ["sbom.json"]
+        with open(output_filename, "rb") as f:
+            assert f.read() == b"first"
+
+    @staticmethod
+    def ranged_get(content, requests_seen):
+        def get(url, headers=None, stream=False):
+            range_header = (headers or {}).get("Range")
+            requests_seen.append(range_header)
+            response = MagicMock()
+            if range_header is None:
+                body = content
+                response.status_code = 200
+                response.headers = {"Content-Length": str(len(content))}
+            else:
+                start, end = (int(n) for n in range_header[len("bytes="):].split("-"))
+                body = content[start:end + 1]
+                response.status_code = 206
+                response.headers = {"Content-Range": f"bytes {start}-{end}/{len(content)}"}
+            response.iter_content.side_effect = lambda chunk_size: (
+                body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+            return response
+        return get
+
+    @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
+    @patch("requests.Session.get")
+    def test_download_sbom_ranged(self, mock_get, mock_generate_url, tmp_path):
+        content = bytes(range(256)) * 40
+        requests_seen = []
+        mock_get.side_effect = self.ranged_get(content, requests_seen)
+        output_filename = tmp_path / "sbom.json"
+        progress = []
+
+        download_sbom(self.auth_token, self.organization_context, asset_version_id=self.asset_version_id,
+                      output_filename=str(output_filename), chunk_size=1000, max_workers=4, part_size=3000,
+                      progress_callback=lambda written, total: progress.append((written, total)))
+
+        assert output_filename.read_bytes() == content
+        assert requests_seen[0] == "bytes=0-0"
+        assert sorted(requests_seen[1:]) == ["bytes=0-2999", "bytes=3000-5999", "bytes=6000-8999", "bytes=9000-10239"]
+        assert progress[-1] == (len(content), len(content))
+        assert list(tmp_path.iterdir()) == [output_filename]
+
+    @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
+    @patch("requests.Session.get")
+    def test_download_sbom_ranged_falls_back_without_range_support(self, mock_get, mock_generate_url, tmp_path):
+        content = b"x" * 10000
+        requests_seen = []
+        ranged_get = self.ranged_get(content, requests_seen)
+        # the server ignores the Range header
+        mock_get.side_effect = lambda url, headers=None, stream=False: ranged_get(url, stream=stream)
+        output_filename = tmp_path / "sbom.json"
+
+        download_sbom(self.auth_token, self.organization_context, asset_version_id=self.asset_version_id,
+                      output_filename=str(output_filename), max_workers=4, part_size=3000)
+
+        assert output_filename.read_bytes() == content
+        assert mock_get.call_count == 2
+
+    @patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url")
+    @patch("requests.Session.get")
+    def test_download_sbom_ranged_part_failure(self, mock_get, mock_generate_url, tmp_path):
+        content = b"x" * 10000
+        ranged_get = self.ranged_get(content, [])
+
+        def get(url, headers=None, stream=False):
+            if headers["Range"] == "bytes=3000-5999":
+                response = MagicMock()
+                response.status_code = 403
+                return response
+            return ranged_get(url, headers=headers, stream=stream)
+
+        mock_get.side_effect = get
+
+        with pytest.raises(Exception) as e:
+            download_sbom(self.auth_token, self.organization_context, asset_version_id=self.asset_version_id,
+                          output_filename=str(tmp_path / "sbom.json"), max_workers=2, part_size=3000)
+
+        assert str(e.value) == "Failed to download bytes 3000-5999 of the file. Status code: 403"
+        assert list(tmp_path.iterdir()) == []
+
+    def test_download_sbom_ranged_cannot_compress(self):
+        with pytest.raises(ValueError) as e:
+            with patch("finite_state_sdk.generate_sbom_download_url", return_value="mock_download_url"):
+                download_sbom(self.auth_token, self.organization_context, asset_version_id=self.asset_version_id,
+                              max_workers=2, compress=True)
+
+        assert str(e.value) == "compress cannot be used with max_workers greater than 1"
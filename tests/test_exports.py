@@ -0,0 +1,145 @@
+import pytest
+from unittest.mock import patch
+from finite_state_sdk import (
+    ExportJob,
+    ExportJobsFailedError,
+    PollingStrategy,
+    generate_sbom_download_url,
+    launch_report_export,
+    launch_sbom_export,
+    queries,
+    wait_for_exports,
+)
+
+
+def export_status(status, download_link=None):
+    return {"data": {"generateExportDownloadPresignedUrl": {"status": status, "downloadLink": download_link}}}
+
+
+class TestExports:
+    token = "mock_token"
+    organization_context = "mock_organization_context"
+    polling = PollingStrategy(initial_interval=1, multiplier=1, max_interval=1, jitter=0)
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_launch_sbom_export_does_not_wait(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = {"data": {"launchCycloneDxExport": {"exportJobId": "job1"}}}
+
+        export_job = launch_sbom_export(self.token, self.organization_context, sbom_type="CYCLONEDX",
+                                        sbom_subtype="SBOM_ONLY", asset_version_id="av1")
+
+        assert isinstance(export_job, ExportJob)
+        assert export_job.export_job_id == "job1"
+        mock_send_graphql_query.assert_called_once()
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_launch_report_export_does_not_wait(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = {"data": {"launchProductCSVExport": {"exportJobId": "job1"}}}
+
+        export_job = launch_report_export(self.token, self.organization_context, product_id="p1", report_type="CSV",
+                                          report_subtype="ALL_FINDINGS")
+
+        assert export_job.export_job_id == "job1"
+        mock_send_graphql_query.assert_called_once()
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_status_and_result_url(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = [export_status("PENDING"), export_status("COMPLETED", "mock_url")]
+        export_job = ExportJob(self.token, self.organization_context, "job1")
+
+        assert export_job.status() == "PENDING"
+        assert not export_job.done()
+        assert export_job.result_url() == "mock_url"
+        assert export_job.done()
+        # once complete, the URL is kept and no more queries are sent
+        assert export_job.status() == "COMPLETED"
+        assert mock_send_graphql_query.call_count == 2
+        mock_send_graphql_query.assert_called_with(
+            self.token, self.organization_context, queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['query'],
+            queries.GENERATE_EXPORT_DOWNLOAD_PRESIGNED_URL['variables']("job1"))
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_result_url_not_complete(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = export_status("PENDING")
+        export_job = ExportJob(self.token, self.organization_context, "job1")
+
+        with pytest.raises(Exception) as excinfo:
+            export_job.result_url()
+
+        assert str(excinfo.value) == "Error: Export job job1 is not complete"
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_status_failed(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = export_status("FAILED")
+        export_job = ExportJob(self.token, self.organization_context, "job1")
+
+        with pytest.raises(Exception) as excinfo:
+            export_job.status()
+
+        assert str(excinfo.value) == "Error: Export job job1 failed"
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_wait_for_exports_polls_jobs_together(self, mock_send_graphql_query, mock_sleep):
+        # job1 completes on the first round, job2 on the third and job3 on the second
+        rounds = {
+            "job1": [export_status("COMPLETED", "url1")],
+            "job2": [export_status("PENDING"), export_status("PENDING"), export_status("COMPLETED", "url2")],
+            "job3": [export_status("PENDING"), export_status("COMPLETED", "url3")],
+        }
+        mock_send_graphql_query.side_effect = lambda token, organization_context, query, variables: \
+            rounds[variables["exportId"]].pop(0)
+        export_jobs = [ExportJob(self.token, self.organization_context, job_id) for job_id in ["job1", "job2", "job3"]]
+
+        urls = wait_for_exports(export_jobs, polling=self.polling)
+
+        assert urls == ["url1", "url2", "url3"]
+        assert mock_sleep.call_count == 3
+        assert mock_send_graphql_query.call_count == 6
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_wait_for_exports_failed_job_does_not_stop_other_jobs(self, mock_send_graphql_query, mock_sleep):
+        # job2 fails on the first round, job1 and job3 complete on the second
+        rounds = {
+            "job1": [export_status("PENDING"), export_status("COMPLETED", "url1")],
+            "job2": [export_status("FAILED")],
+            "job3": [export_status("PENDING"), export_status("COMPLETED", "url3")],
+        }
+        mock_send_graphql_query.side_effect = lambda token, organization_context, query, variables: \
+            rounds[variables["exportId"]].pop(0)
+        export_jobs = [ExportJob(self.token, self.organization_context, job_id) for job_id in ["job1", "job2", "job3"]]
+
+        with pytest.raises(ExportJobsFailedError) as excinfo:
+            wait_for_exports(export_jobs, polling=self.polling)
+
+        assert str(excinfo.value) == "Error: 1 of 3 export jobs failed. job2: Error: Export job job2 failed"
+        assert list(excinfo.value.failures) == ["job2"]
+        assert excinfo.value.results == ["url1", None, "url3"]
+        assert mock_send_graphql_query.call_count == 5
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_export_job_wait_raises_job_failure(self, mock_send_graphql_query, mock_sleep):
+        mock_send_graphql_query.return_value = export_status("FAILED")
+        export_job = ExportJob(self.token, self.organization_context, "job1")
+
+        with pytest.raises(Exception) as excinfo:
+            export_job.wait(polling=self.polling)
+
+        assert str(excinfo.value) == "Error: Export job job1 failed"
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_generate_sbom_download_url_waits_for_export_job(self, mock_send_graphql_query, mock_sleep):
+        mock_send_graphql_query.side_effect = [
+            {"data": {"launchCycloneDxExport": {"exportJobId": "job1"}}},
+            export_status("PENDING"),
+            export_status("COMPLETED", "mock_url"),
+        ]
+
+        url = generate_sbom_download_url(self.token, self.organization_context, sbom_type="CYCLONEDX",
+                                         sbom_subtype="SBOM_ONLY", asset_version_id="av1", polling=self.polling)
+
+        assert url == "mock_url"
+        assert mock_sleep.call_count == 2
@@ -0,0 +1,77 @@
+import threading
+import time
+import pytest
+from finite_state_sdk import fan_out
+
+
+class TestFanOut:
+
+    def test_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            fan_out(str.upper, ["a"], max_workers=0)
+
+    def test_calls_run_concurrently(self):
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def func(asset_version_id):
+            with lock:
+                running.append(asset_version_id)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.remove(asset_version_id)
+            return asset_version_id.upper()
+
+        start = time.monotonic()
+        results = list(fan_out(func, [f"av{i}" for i in range(8)], max_workers=4))
+
+        assert time.monotonic() - start < 0.3
+        assert max(peak) == 4
+        assert sorted(result.value for result in results) == [f"AV{i}" for i in range(8)]
+
+    def test_unordered_results_are_yielded_as_they_complete(self):
+        delays = {"slow": 0.2, "fast": 0}
+
+        def func(asset_version_id):
+            time.sleep(delays[asset_version_id])
+            return asset_version_id
+
+        assert [result.value for result in fan_out(func, ["slow", "fast"], max_workers=2)] == ["fast", "slow"]
+        assert [result.value for result in fan_out(func, ["slow", "fast"], max_workers=2, ordered=True)] == \
+            ["slow", "fast"]
+
+    def test_failures_are_isolated(self):
+        def func(asset_version_id):
+            if asset_version_id == "bad":
+                raise Exception("Error: 500 - Internal Server Error")
+            return asset_version_id
+
+        results = {result.asset_version_id: result for result in fan_out(func, ["a", "bad", "b"], max_workers=2)}
+
+        assert results["a"].value == "a" and results["a"].error is None
+        assert results["bad"].value is None and "500" in str(results["bad"].error)
+        assert results["b"].value == "b"
+
+    def test_progress_callback(self):
+        progress = []
+
+        list(fan_out(lambda asset_version_id: asset_version_id, ["a", "b", "c"], max_workers=1,
+                     progress_callback=lambda completed, total: progress.append((completed, total))))
+
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    def test_stopping_early_cancels_queued_calls(self):
+        calls = []
+
+        def func(asset_version_id):
+            calls.append(asset_version_id)
+            time.sleep(0.05)
+            return asset_version_id
+
+        results = fan_out(func, [f"av{i}" for i in range(100)], max_workers=1, ordered=True)
+        assert next(results).value == "av0"
+        results.close()
+
+        assert len(calls) < 5
@@ -0,0 +1,52 @@
+import io
+import pytest
+from finite_state_sdk import file_slices
+from finite_state_sdk.utils import FileSlice
+
+
+class TestFileSlice:
+    content = b"0123456789abcdefghij"
+
+    def test_file_slice_reads_only_its_range(self, tmp_path):
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(self.content)
+
+        with FileSlice(str(file_path), 5, 10) as part:
+            assert len(part) == 10
+            assert part.read(3) == b"567"
+            assert part.tell() == 3
+            assert part.read() == b"89abcde"
+            assert part.read() == b""
+
+    def test_file_slice_seek_and_iterate(self, tmp_path):
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(self.content)
+
+        with FileSlice(str(file_path), 10, 10) as part:
+            part.block_size = 4
+            assert b"".join(part) == b"abcdefghij"
+            part.seek(0)
+            assert list(part) == [b"abcd", b"efgh", b"ij"]
+            assert part.seek(-2, io.SEEK_END) == 8
+            assert part.read() == b"ij"
+
+    def test_file_slice_invalid_arguments(self, tmp_path):
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(self.content)
+
+        with pytest.raises(ValueError):
+            FileSlice(str(file_path), -1, 10)
+        with FileSlice(str(file_path), 0, 10) as part:
+            with pytest.raises(ValueError):
+                part.seek(-1)
+
+    def test_file_slices_covers_the_file(self, tmp_path):
+        file_path = tmp_path / "data.bin"
+        file_path.write_bytes(self.content)
+
+        parts = []
+        for part in file_slices(str(file_path), chunk_size=8):
+            with part:
+                parts.append(part.read())
+
+        assert parts == [b"01234567", b"89abcdef", b"ghij"]
@@ -0,0 +1,157 @@
+import threading
+import pytest
+from unittest.mock import patch
+from finite_state_sdk import queries
+from finite_state_sdk.mirror import FindingsMirror
+
+ORG = "mock_organization_context"
+ASSET_VERSION_ID = "asset_version_1"
+
+
+def finding(id, updated_at, created_at="2024-01-01T00:00:00.000Z", **fields):
+    return dict(_cursor=None, id=id, createdAt=created_at, updatedAt=updated_at, **fields)
+
+
+class FakeAPI:
+    """Answers GetFindingsForAnAssetVersion_SDK and GetRemovedFindings_SDK with a single page each."""
+
+    def __init__(self, changed=(), removed=()):
+        self.changed = list(changed)
+        self.removed = list(removed)
+        self.calls = []
+
+    def __call__(self, token, organization_context, query, variables=None):
+        self.calls.append((query, variables))
+        if "GetRemovedFindings_SDK" in query:
+            return {"data": {"allFindings": self.removed}}
+        return {"data": {"allFindings": self.changed}}
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    with FindingsMirror(str(tmp_path / "findings.db"), overlap=60) as mirror:
+        yield mirror
+
+
+class TestFindingsMirror:
+
+    def test_first_sync_downloads_everything(self, mirror):
+        api = FakeAPI(changed=[finding("1", "2024-03-01T00:00:00.000Z"), finding("2", "2024-02-01T00:00:00.000Z")])
+
+        with patch("finite_state_sdk.send_graphql_query", side_effect=api):
+            result = mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        assert result == {"full": True, "upserted": 2, "removed": 0, "high_water_mark": "2024-03-01T00:00:00.000Z"}
+        assert len(api.calls) == 1
+        variables = api.calls[0][1]
+        assert variables["filter"]["assetVersionRefId"] == ASSET_VERSION_ID
+        assert "OR" not in variables["filter"]
+        assert [f["id"] for f in mirror.get_findings(ORG, ASSET_VERSION_ID)] == ["2", "1"]
+        assert mirror.get_findings(ORG) == []
+
+    def test_incremental_sync_fetches_changes_since_high_water_mark(self, mirror):
+        with patch("finite_state_sdk.send_graphql_query", side_effect=FakeAPI(changed=[
+                finding("1", "2024-03-01T00:00:00.000Z", title="old"),
+                finding("2", "2024-03-01T00:00:00.000Z"),
+                finding("3", "2024-03-01T00:00:00.000Z")])):
+            mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        api = FakeAPI(changed=[finding("1", "2024-03-02T00:00:00.000Z", title="new"),
+                               finding("4", None, created_at="2024-03-03T00:00:00.000Z")],
+                      removed=[{"_cursor": None, "id": "2", "updatedAt": "2024-03-02T00:00:00.000Z",
+                                "deletedAt": "2024-03-02T12:00:00.000Z"}])
+        with patch("finite_state_sdk.send_graphql_query", side_effect=api):
+            result = mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        assert result == {"full": False, "upserted": 2, "removed": 1, "high_water_mark": "2024-03-03T00:00:00.000Z"}
+        changed_filter = api.calls[0][1]["filter"]
+        assert changed_filter["OR"] == [{"updatedAt_gte": "2024-02-29T23:59:00+00:00"},
+                                        {"createdAt_gte": "2024-02-29T23:59:00+00:00"}]
+        assert changed_filter["deletedAt"] is None
+        removed_filter = api.calls[1][1]["filter"]
+        assert "deletedAt" not in removed_filter
+        assert removed_filter["OR"][0] == {"deletedAt_gte": "2024-02-29T23:59:00+00:00"}
+
+        findings = {f["id"]: f for f in mirror.get_findings(ORG, ASSET_VERSION_ID)}
+        assert sorted(findings) == ["1", "3", "4"]
+        assert findings["1"]["title"] == "new"
+        assert mirror.high_water_mark(ORG, ASSET_VERSION_ID) == "2024-03-03T00:00:00.000Z"
+
+    def test_failed_sync_leaves_mirror_unchanged(self, mirror):
+        with patch("finite_state_sdk.send_graphql_query",
+                   side_effect=FakeAPI(changed=[finding("1", "2024-03-01T00:00:00.000Z")])):
+            mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        api = FakeAPI(changed=[finding("2", "2024-03-05T00:00:00.000Z")])
+        with patch("finite_state_sdk.send_graphql_query",
+                   side_effect=[api("token", ORG, ""), Exception("Error: 500 - Internal Server Error")]):
+            with pytest.raises(Exception, match="500"):
+                mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        assert [f["id"] for f in mirror.get_findings(ORG, ASSET_VERSION_ID)] == ["1"]
+        assert mirror.high_water_mark(ORG, ASSET_VERSION_ID) == "2024-03-01T00:00:00.000Z"
+        assert mirror._connection.execute("SELECT COUNT(*) FROM staged_findings").fetchone()[0] == 0
+
+    def test_mirror_is_readable_while_pages_are_fetched(self, mirror):
+        api = FakeAPI(changed=[finding("1", "2024-03-01T00:00:00.000Z")])
+        reads = []
+
+        def send_graphql_query(*args):
+            # another thread reads the mirror while the sync is waiting on the API
+            reader = threading.Thread(target=lambda: reads.append(mirror.get_findings(ORG, ASSET_VERSION_ID)))
+            reader.start()
+            reader.join(5)
+            return api(*args)
+
+        with patch("finite_state_sdk.send_graphql_query", side_effect=send_graphql_query):
+            mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        assert reads == [[]]
+        assert [f["id"] for f in mirror.get_findings(ORG, ASSET_VERSION_ID)] == ["1"]
+
+    def test_pages_are_staged_in_batches_until_the_sync_completes(self, mirror):
+        with patch("finite_state_sdk.send_graphql_query",
+                   side_effect=FakeAPI(changed=[finding("1", "2024-03-01T00:00:00.000Z")])):
+            mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        api = FakeAPI(changed=[finding("2", "2024-03-02T00:00:00.000Z"), finding("3", "2024-03-02T00:00:00.000Z")])
+        staged = []
+
+        def send_graphql_query(token, organization_context, query, variables=None):
+            if "GetRemovedFindings_SDK" in query:
+                # the changed findings are already written to the staging table, but not yet to the mirror
+                staged.append(mirror._connection.execute("SELECT COUNT(*) FROM staged_findings").fetchone()[0])
+                staged.append([f["id"] for f in mirror.get_findings(ORG, ASSET_VERSION_ID)])
+            return api(token, organization_context, query, variables)
+
+        with patch("finite_state_sdk.mirror.SYNC_BATCH_SIZE", 1), \
+                patch("finite_state_sdk.send_graphql_query", side_effect=send_graphql_query):
+            result = mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+
+        assert staged == [2, ["1"]]
+        assert result["upserted"] == 2
+        assert [f["id"] for f in mirror.get_findings(ORG, ASSET_VERSION_ID)] == ["1", "2", "3"]
+        assert mirror._connection.execute("SELECT COUNT(*) FROM staged_findings").fetchone()[0] == 0
+
+    def test_full_sync_and_reset(self, mirror):
+        with patch("finite_state_sdk.send_graphql_query",
+                   side_effect=FakeAPI(changed=[finding("1", "2024-03-01T00:00:00.000Z")])):
+            mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID)
+        with patch("finite_state_sdk.send_graphql_query",
+                   side_effect=FakeAPI(changed=[finding("2", "2024-02-01T00:00:00.000Z")])):
+            result = mirror.sync("token", ORG, asset_version_id=ASSET_VERSION_ID, full=True)
+
+        assert result["full"] is True
+        assert [f["id"] for f in mirror.get_findings(ORG, ASSET_VERSION_ID)] == ["2"]
+
+        mirror.reset(ORG, ASSET_VERSION_ID)
+        assert mirror.get_findings(ORG, ASSET_VERSION_ID) == []
+        assert mirror.high_water_mark(ORG, ASSET_VERSION_ID) is None
+
+    def test_fields_always_include_sync_fields(self, tmp_path):
+        with FindingsMirror(str(tmp_path / "findings.db"), fields=["severity"]) as mirror:
+            query = queries.GET_CHANGED_FINDINGS["query"](mirror.fields)
+
+        assert "severity" in query and "updatedAt" in query and "createdAt" in query
+        with pytest.raises(ValueError):
+            FindingsMirror(str(tmp_path / "findings.db"), fields=["notAField"])
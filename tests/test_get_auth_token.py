@@ -9,7 +9,7 @@ class TestGetAuthToken:
     client_secret = "your_client_secret"
     mock_access_token = "mock_access_token"
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_get_auth_token_success(self, mock_post):
         # Mock response object
         mock_response = MagicMock()
@@ -28,7 +28,7 @@ class TestGetAuthToken:
         )
         assert result == self.mock_access_token
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_get_auth_token_error(self, mock_post):
         # Mock response object
         mock_response = MagicMock()
@@ -1,3 +1,4 @@
+import pytest
 from unittest.mock import patch
 from finite_state_sdk import get_findings, queries
 
@@ -72,3 +73,36 @@ class TestGetFindings:
             limit=self.limit
         )
         assert result == [{"id": "finding1"}, {"id": "finding2"}, {"id": "finding3"}]
+
+    @patch("finite_state_sdk.get_all_paginated_results")
+    def test_get_findings_with_field_profile(self, mock_get_all_paginated_results):
+        mock_get_all_paginated_results.return_value = []
+
+        get_findings(self.auth_token, self.organization_context, self.asset_version_id, fields="minimal")
+
+        query = mock_get_all_paginated_results.call_args[0][2]
+        assert query == queries.GET_FINDINGS['fields_query']("minimal")
+        assert "currentStatus {" in query
+        assert "cves" not in query and "originalFindings" not in query
+
+    def test_findings_fields_query(self):
+        assert queries.GET_FINDINGS['fields_query']() is queries.GET_FINDINGS['query']
+        assert queries.GET_FINDINGS['fields_query']("full") is queries.GET_FINDINGS['query']
+
+        query = queries.GET_FINDINGS['fields_query'](["severity", "id"])
+        assert query is queries.GET_FINDINGS['fields_query'](["id", "severity"])
+
+        selection = query.split("orderBy: $orderBy\n    ) {")[1].split()
+        assert selection[:3] == ["_cursor", "id", "severity"]
+        assert len(query) < len(queries.GET_FINDINGS['query']) / 2
+
+    def test_findings_fields_query_parses(self):
+        gql = pytest.importorskip("gql")
+
+        for profile in queries.FINDING_FIELD_PROFILES:
+            gql.gql(queries.GET_FINDINGS['fields_query'](profile))
+
+    @pytest.mark.parametrize("fields", ["everything", ["id", "notAField"], []])
+    def test_findings_fields_query_invalid(self, fields):
+        with pytest.raises(ValueError):
+            queries.GET_FINDINGS['fields_query'](fields)
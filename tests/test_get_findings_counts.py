@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import patch
+from finite_state_sdk import get_findings_counts, queries
+
+
+def count_response(*counts):
+    return {"data": {f"count{i}": {"count": count} for i, count in enumerate(counts)}}
+
+
+class TestGetFindingsCounts:
+    auth_token = "mock_auth_token"
+    organization_context = "mock_organization_context"
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_get_findings_counts_by_asset_version(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = count_response(3, 5)
+
+        result = get_findings_counts(self.auth_token, self.organization_context, ["av1", "av2"])
+
+        assert result == {"av1": 3, "av2": 5}
+        mock_send_graphql_query.assert_called_once_with(
+            self.auth_token,
+            self.organization_context,
+            queries.GET_FINDINGS_COUNTS['query'](2),
+            {
+                "filter0": queries.GET_FINDINGS_COUNT['variables'](asset_version_id="av1")['filter'],
+                "filter1": queries.GET_FINDINGS_COUNT['variables'](asset_version_id="av2")['filter'],
+            },
+        )
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_get_findings_counts_by_severity_and_category(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = count_response(1, 2, 3, 4)
+
+        result = get_findings_counts(self.auth_token, self.organization_context, ["av1"],
+                                     severities=["CRITICAL", "HIGH"], categories=["CVE", "CREDENTIALS"],
+                                     status="AFFECTED")
+
+        assert result == {"av1": {"CRITICAL": {"CVE": 1, "CREDENTIALS": 2}, "HIGH": {"CVE": 3, "CREDENTIALS": 4}}}
+        variables = mock_send_graphql_query.call_args[0][3]
+        assert variables["filter1"] == queries.GET_FINDINGS_COUNT['variables'](
+            asset_version_id="av1", severity="CRITICAL", category="CREDENTIALS", status="AFFECTED")['filter']
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_get_findings_counts_is_batched(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = [count_response(*range(0, 5)), count_response(*range(5, 10)),
+                                               count_response(10, 11)]
+
+        result = get_findings_counts(self.auth_token, self.organization_context, ["av1", "av2", "av3"],
+                                     severities=["CRITICAL", "HIGH", "MEDIUM", "LOW"], batch_size=5)
+
+        # 12 counts in batches of 5
+        assert mock_send_graphql_query.call_count == 3
+        assert [len(call[0][3]) for call in mock_send_graphql_query.call_args_list] == [5, 5, 2]
+        assert result == {
+            "av1": {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3},
+            "av2": {"CRITICAL": 4, "HIGH": 5, "MEDIUM": 6, "LOW": 7},
+            "av3": {"CRITICAL": 8, "HIGH": 9, "MEDIUM": 10, "LOW": 11},
+        }
+
+    @pytest.mark.parametrize("asset_version_ids, batch_size", [([], 100), (None, 100), (["av1"], 0)])
+    def test_get_findings_counts_invalid_arguments(self, asset_version_ids, batch_size):
+        with pytest.raises(ValueError):
+            get_findings_counts(self.auth_token, self.organization_context, asset_version_ids, batch_size=batch_size)
+
+    def test_findings_counts_query_parses(self):
+        gql = pytest.importorskip("gql")
+
+        gql.gql(queries.GET_FINDINGS_COUNTS['query'](3))
+        assert queries.GET_FINDINGS_COUNTS['query'](3) is queries.GET_FINDINGS_COUNTS['query'](3)
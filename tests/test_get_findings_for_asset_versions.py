@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+from finite_state_sdk import get_findings_for_asset_versions, queries
+
+
+def page(*findings, cursor=None):
+    return {"data": {"allFindings": [dict(finding, _cursor=cursor) for finding in findings]}}
+
+
+class TestGetFindingsForAssetVersions:
+    auth_token = "mock_auth_token"
+    organization_context = "mock_organization_context"
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_findings_are_grouped_by_asset_version(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = [
+            page({"id": "f1", "assetVersionRefId": "av1"}, {"id": "f2", "assetVersionRefId": "av2"}, cursor="c1"),
+            page({"id": "f3", "assetVersionRefId": "av1"}),
+        ]
+
+        result = get_findings_for_asset_versions(self.auth_token, self.organization_context, ["av1", "av2", "av3"],
+                                                 severity="CRITICAL")
+
+        assert {key: [finding["id"] for finding in findings] for key, findings in result.items()} == \
+            {"av1": ["f1", "f3"], "av2": ["f2"], "av3": []}
+        assert mock_send_graphql_query.call_count == 2
+        query, variables = mock_send_graphql_query.call_args_list[0][0][2:]
+        assert query == queries.GET_FINDINGS['fields_query']((*queries.FINDING_FIELD_PROFILES["full"], "assetVersionRefId"))
+        assert "assetVersionRefId" in query
+        assert variables["filter"]["assetVersionRefId_in"] == ["av1", "av2", "av3"]
+        assert variables["filter"]["severity"] == "CRITICAL"
+        assert variables["first"] == queries.DEFAULT_PAGE_SIZE
+        assert mock_send_graphql_query.call_args_list[1][0][3]["after"] == "c1"
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_asset_versions_are_batched(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = [page({"id": "f1", "assetVersionRefId": "av1"}), page(), page()]
+
+        result = get_findings_for_asset_versions(self.auth_token, self.organization_context,
+                                                 ["av1", "av2", "av3", "av2", "av4", "av5"], group_by=False,
+                                                 batch_size=2)
+
+        assert [finding["id"] for finding in result] == ["f1"]
+        assert [call[0][3]["filter"]["assetVersionRefId_in"] for call in mock_send_graphql_query.call_args_list] == \
+            [["av1", "av2"], ["av3", "av4"], ["av5"]]
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_asset_version_is_always_selected(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = page()
+
+        get_findings_for_asset_versions(self.auth_token, self.organization_context, ["av1"], fields="minimal")
+
+        query = mock_send_graphql_query.call_args[0][2]
+        assert query == queries.GET_FINDINGS['fields_query'](["id", "severity", "currentStatus", "assetVersionRefId"])
+
+    def test_default_get_findings_query_is_unchanged(self):
+        assert "assetVersionRefId" not in queries.GET_FINDINGS['query']
+        assert queries.GET_FINDINGS['fields_query']() == queries.GET_FINDINGS['query']
+
+    @pytest.mark.parametrize("asset_version_ids, kwargs", [
+        ([], {}),
+        (None, {}),
+        (["av1"], {"batch_size": 0}),
+        (["av1"], {"fields": "unknown"}),
+        (["av1"], {"fields": ["notAField"]}),
+    ])
+    def test_invalid_arguments(self, asset_version_ids, kwargs):
+        with pytest.raises(ValueError):
+            get_findings_for_asset_versions(self.auth_token, self.organization_context, asset_version_ids, **kwargs)
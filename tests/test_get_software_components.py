@@ -1,3 +1,4 @@
+import pytest
 from unittest.mock import patch
 from finite_state_sdk import get_software_components, queries
 
@@ -29,3 +30,18 @@ class TestGetSoftwareComponents:
             'allSoftwareComponentInstances'
         )
         assert result == mock_get_all_paginated_results.return_value
+
+    @patch("finite_state_sdk.get_all_paginated_results")
+    def test_get_software_components_with_fields(self, mock_get_all_paginated_results):
+        get_software_components(self.auth_token, self.organization_context, self.asset_version_id,
+                                fields=["name", "version"])
+
+        query = mock_get_all_paginated_results.call_args[0][2]
+        assert query == queries.GET_SOFTWARE_COMPONENTS['fields_query'](["name", "version"])
+        assert "_cursor" in query
+        assert "licenses" not in query and "softwareComponent" not in query
+
+    def test_get_software_components_with_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_software_components(self.auth_token, self.organization_context, self.asset_version_id,
+                                    fields="everything")
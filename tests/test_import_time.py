@@ -0,0 +1,39 @@
+import subprocess
+import sys
+
+
+def run_python(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+class TestImportTime:
+
+    def test_import_does_not_load_heavy_dependencies(self):
+        loaded = run_python(
+            "import sys, finite_state_sdk; "
+            "print(','.join(m for m in ('requests', 'urllib3', 'gql', 'graphql', 'tenacity', 'concurrent.futures') "
+            "if m in sys.modules))"
+        )
+
+        assert loaded == ""
+
+    def test_import_does_not_load_lazy_modules(self):
+        loaded = run_python(
+            "import sys, finite_state_sdk; "
+            "print(','.join(m for m in ('sqlite3', 'finite_state_sdk.batching', 'finite_state_sdk.cache', "
+            "'finite_state_sdk.component_index', 'finite_state_sdk.concurrency', 'finite_state_sdk.exports', "
+            "'finite_state_sdk.mirror', 'finite_state_sdk.rate_limit', 'finite_state_sdk.token_provider') "
+            "if m in sys.modules))"
+        )
+
+        assert loaded == ""
+
+    def test_lazy_attributes_are_available(self):
+        output = run_python(
+            "import finite_state_sdk; "
+            "print(finite_state_sdk.ExportJob.__name__, finite_state_sdk.UploadJournal.__name__, "
+            "finite_state_sdk.AdaptiveRateLimiter.__name__, 'ExportJob' in dir(finite_state_sdk))"
+        )
+
+        assert output == "ExportJob UploadJournal AdaptiveRateLimiter True"
@@ -0,0 +1,54 @@
+import pytest
+from unittest.mock import patch
+from gql import gql
+from finite_state_sdk import queries
+from finite_state_sdk.utils import determine_operation_types, get_operation_type_table, is_mutation, _parse_operation_types
+from graphql.language.ast import OperationType
+
+
+class TestIsMutation:
+
+    def setup_method(self):
+        _parse_operation_types.cache_clear()
+
+    def test_operation_type_table_matches_parsed_queries(self):
+        table = get_operation_type_table()
+
+        assert queries.GET_FINDINGS['query'] in table
+        assert queries.UPDATE_FINDING_STATUSES['mutation'] in table
+        for query_string, operation_types in table.items():
+            assert list(operation_types) == [t.value for t in determine_operation_types(query_string)]
+
+    @pytest.mark.parametrize("query_string, expected", [
+        (queries.GET_FINDINGS['query'], False),
+        (queries.START_MULTIPART_UPLOAD['mutation'], True),
+        ("query { someField }", False),
+        ("{ someField }", False),
+        ("  # create an item\n  mutation { createItem { id } }", True),
+        ('query { search(text: "mutation") { id } }', False),
+        ('fragment F on Item { id } mutation { createItem { ...F }', False),
+    ])
+    def test_is_mutation(self, query_string, expected):
+        assert is_mutation(query_string) is expected
+
+    def test_is_mutation_does_not_parse_common_documents(self):
+        with patch("finite_state_sdk.utils.gql") as mock_gql:
+            assert is_mutation(queries.GET_SOFTWARE_COMPONENTS['query']) is False
+            assert is_mutation("query GetThings { allThings { id } }") is False
+            assert is_mutation("mutation CreateThing { createThing { id } }") is True
+            assert is_mutation(queries.LAUNCH_REPORT_EXPORT['mutation']("av1", None, "CSV", "ALL_FINDINGS")) is True
+
+        mock_gql.assert_not_called()
+
+    def test_is_mutation_parses_other_documents_once(self):
+        query_string = """
+            fragment ItemFields on Item { id }
+            mutation CreateItem { createItem { ...ItemFields } }
+        """
+
+        with patch("finite_state_sdk.utils.gql", wraps=gql) as mock_gql:
+            assert is_mutation(query_string) is True
+            assert is_mutation(query_string) is True
+
+        mock_gql.assert_called_once()
+        assert determine_operation_types(query_string) == [OperationType.MUTATION]
@@ -0,0 +1,128 @@
+import threading
+import pytest
+from unittest.mock import patch
+from finite_state_sdk import get_all_paginated_results, iter_findings, iter_paginated_results, queries
+
+
+class TestIterPaginatedResults:
+    token = "mock_token"
+    organization_context = "mock_organization_context"
+    query = "query { allThings { _cursor id } }"
+
+    pages = [
+        {"data": {"allThings": [{"id": "1", "_cursor": "c1"}, {"id": "2", "_cursor": "c2"}]}},
+        {"data": {"allThings": [{"id": "3", "_cursor": "c3"}]}},
+        {"data": {"allThings": []}},
+    ]
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_iter_paginated_results_fetches_pages_lazily(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = self.pages
+
+        results = iter_paginated_results(self.token, self.organization_context, self.query,
+                                         {"after": None, "first": 2}, "allThings")
+
+        assert mock_send_graphql_query.call_count == 0
+        assert next(results)["id"] == "1"
+        assert mock_send_graphql_query.call_count == 1
+        assert next(results)["id"] == "2"
+        assert next(results)["id"] == "3"
+        assert mock_send_graphql_query.call_count == 2
+        assert list(results) == []
+        assert mock_send_graphql_query.call_count == 3
+
+        # the cursor of the last record of each page is passed to the next query
+        assert mock_send_graphql_query.call_args_list[1][0][3]["after"] == "c2"
+        assert mock_send_graphql_query.call_args_list[2][0][3]["after"] == "c3"
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_iter_paginated_results_does_not_modify_variables(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = self.pages
+        variables = {"after": None, "first": 2}
+
+        list(iter_paginated_results(self.token, self.organization_context, self.query, variables, "allThings"))
+
+        assert variables == {"after": None, "first": 2}
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_iter_paginated_results_limit(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = self.pages
+
+        results = list(iter_paginated_results(self.token, self.organization_context, self.query,
+                                              {"after": None, "first": 2}, "allThings", limit=2))
+
+        assert [r["id"] for r in results] == ["1", "2"]
+        mock_send_graphql_query.assert_called_once()
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_iter_paginated_results_missing_field(self, mock_send_graphql_query):
+        mock_send_graphql_query.return_value = {"data": {"somethingElse": []}}
+
+        with pytest.raises(Exception) as excinfo:
+            list(iter_paginated_results(self.token, self.organization_context, self.query,
+                                        {"after": None, "first": 2}, "allThings"))
+
+        assert str(excinfo.value) == "Error: allThings not in response JSON"
+
+    def test_iter_paginated_results_validates_arguments_eagerly(self):
+        with pytest.raises(Exception) as excinfo:
+            iter_paginated_results(self.token, self.organization_context, self.query, {"after": None, "first": 2})
+
+        assert str(excinfo.value) == "Error: field is required"
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_get_all_paginated_results_collects_every_page(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = self.pages
+
+        results = get_all_paginated_results(self.token, self.organization_context, self.query,
+                                            {"after": None, "first": 2}, "allThings")
+
+        assert [r["id"] for r in results] == ["1", "2", "3"]
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_iter_paginated_results_prefetch_fetches_ahead(self, mock_send_graphql_query):
+        second_page_requested = threading.Event()
+
+        def send(*args):
+            if args[3]["after"] == "c2":
+                second_page_requested.set()
+            return self.pages[mock_send_graphql_query.call_count - 1]
+
+        mock_send_graphql_query.side_effect = send
+
+        results = iter_paginated_results(self.token, self.organization_context, self.query,
+                                         {"after": None, "first": 2}, "allThings", prefetch=1)
+
+        assert next(results)["id"] == "1"
+        # the next page is requested while the caller is still processing the first one
+        assert second_page_requested.wait(timeout=5)
+        assert [r["id"] for r in results] == ["2", "3"]
+
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_iter_paginated_results_prefetch_raises_errors(self, mock_send_graphql_query):
+        mock_send_graphql_query.side_effect = [self.pages[0], Exception("Error: 500 - Internal Server Error")]
+
+        results = iter_paginated_results(self.token, self.organization_context, self.query,
+                                         {"after": None, "first": 2}, "allThings", prefetch=2)
+
+        assert next(results)["id"] == "1"
+        assert next(results)["id"] == "2"
+        with pytest.raises(Exception) as excinfo:
+            next(results)
+
+        assert str(excinfo.value) == "Error: 500 - Internal Server Error"
+
+    def test_iter_paginated_results_invalid_prefetch(self):
+        with pytest.raises(Exception) as excinfo:
+            iter_paginated_results(self.token, self.organization_context, self.query, {"after": None, "first": 2},
+                                   "allThings", prefetch=-1)
+
+        assert str(excinfo.value) == "Error: prefetch cannot be less than 0"
+
+    @patch("finite_state_sdk.iter_paginated_results")
+    def test_iter_findings(self, mock_iter_paginated_results):
+        iter_findings(self.token, self.organization_context, asset_version_id="av1", severity="HIGH")
+
+        mock_iter_paginated_results.assert_called_once_with(
+            self.token, self.organization_context, queries.GET_FINDINGS['query'],
+            queries.GET_FINDINGS['variables'](asset_version_id="av1", severity="HIGH"), 'allFindings', limit=None, prefetch=0)
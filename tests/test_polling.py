@@ -0,0 +1,94 @@
+import itertools
+import pytest
+from unittest.mock import patch
+from finite_state_sdk import PollingCancelledError, PollingStrategy, PollingTimeoutError, generate_sbom_download_url
+
+
+class TestPollingStrategy:
+    token = "mock_token"
+    organization_context = "mock_organization_context"
+
+    def test_intervals_grow_exponentially_up_to_max_interval(self):
+        polling = PollingStrategy(initial_interval=0.5, multiplier=2, max_interval=3, jitter=0)
+
+        intervals = list(itertools.islice(polling.intervals(), 5))
+
+        assert intervals == [0.5, 1, 2, 3, 3]
+
+    def test_intervals_are_jittered(self):
+        polling = PollingStrategy(initial_interval=10, multiplier=1, max_interval=10, jitter=0.2)
+
+        intervals = list(itertools.islice(polling.intervals(), 50))
+
+        assert all(8 <= interval <= 12 for interval in intervals)
+        assert len(set(intervals)) > 1
+
+    @patch("finite_state_sdk.polling.time.monotonic")
+    def test_intervals_stop_at_timeout(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        polling = PollingStrategy(initial_interval=4, multiplier=1, max_interval=4, jitter=0, timeout=10)
+        intervals = polling.intervals()
+
+        assert next(intervals) == 4
+        mock_monotonic.return_value = 108
+        # the last wait is shortened so the final poll happens at the deadline
+        assert next(intervals) == 2
+        mock_monotonic.return_value = 110
+
+        with pytest.raises(PollingTimeoutError) as excinfo:
+            next(intervals)
+
+        assert str(excinfo.value) == "Error: job did not complete within 10 seconds"
+
+    def test_intervals_stop_when_cancelled(self):
+        cancelled = [False, False, True]
+        polling = PollingStrategy(jitter=0, cancel=lambda: cancelled.pop(0))
+        intervals = polling.intervals()
+
+        next(intervals)
+        next(intervals)
+        with pytest.raises(PollingCancelledError):
+            next(intervals)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"initial_interval": -1},
+        {"multiplier": 0.5},
+        {"initial_interval": 10, "max_interval": 5},
+        {"jitter": 1.5},
+        {"timeout": 0},
+    ])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            PollingStrategy(**kwargs)
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_generate_sbom_download_url_uses_polling_strategy(self, mock_send_graphql_query, mock_sleep):
+        mock_send_graphql_query.side_effect = [
+            {"data": {"launchCycloneDxExport": {"exportJobId": "job1"}}},
+            {"data": {"generateExportDownloadPresignedUrl": {"status": "PENDING", "downloadLink": None}}},
+            {"data": {"generateExportDownloadPresignedUrl": {"status": "COMPLETED", "downloadLink": "mock_url"}}},
+        ]
+        polling = PollingStrategy(initial_interval=0.25, multiplier=2, jitter=0)
+
+        url = generate_sbom_download_url(self.token, self.organization_context, sbom_type="CYCLONEDX",
+                                         sbom_subtype="SBOM_ONLY", asset_version_id="av1", polling=polling)
+
+        assert url == "mock_url"
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [0.25, 0.5]
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_generate_sbom_download_url_cancelled(self, mock_send_graphql_query, mock_sleep):
+        mock_send_graphql_query.side_effect = [
+            {"data": {"launchCycloneDxExport": {"exportJobId": "job1"}}},
+            {"data": {"generateExportDownloadPresignedUrl": {"status": "PENDING", "downloadLink": None}}},
+        ]
+        cancelled = [False, True]
+        polling = PollingStrategy(cancel=lambda: cancelled.pop(0))
+
+        with pytest.raises(PollingCancelledError):
+            generate_sbom_download_url(self.token, self.organization_context, sbom_type="CYCLONEDX",
+                                       sbom_subtype="SBOM_ONLY", asset_version_id="av1", polling=polling)
+
+        assert mock_send_graphql_query.call_count == 2
@@ -0,0 +1,31 @@
+import threading
+import pytest
+from finite_state_sdk.utils import prefetch
+
+
+class TestPrefetch:
+    def test_prefetch_preserves_order(self):
+        assert list(prefetch(iter(range(10)), depth=3)) == list(range(10))
+
+    def test_prefetch_invalid_depth(self):
+        with pytest.raises(ValueError):
+            prefetch([1, 2, 3], depth=0)
+
+    def test_prefetch_stops_producer_when_closed_early(self):
+        produced = []
+        finished = threading.Event()
+
+        def producer():
+            try:
+                for i in range(1000):
+                    produced.append(i)
+                    yield i
+            finally:
+                finished.set()
+
+        items = prefetch(producer(), depth=1)
+        assert next(items) == 0
+        items.close()
+
+        assert finished.wait(timeout=5)
+        assert len(produced) < 1000
@@ -0,0 +1,118 @@
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from finite_state_sdk import API_URL, AdaptiveRateLimiter, FileRateLimitBackend, FiniteStateClient
+
+
+class TestAdaptiveRateLimiter:
+
+    @patch("finite_state_sdk.rate_limit.time.time")
+    def test_token_bucket(self, mock_time):
+        mock_time.return_value = 1000.0
+        limiter = AdaptiveRateLimiter(rate=2, burst=2)
+
+        assert limiter.try_acquire() == 0
+        assert limiter.try_acquire() == 0
+        assert limiter.try_acquire() == pytest.approx(0.5)
+
+        mock_time.return_value = 1000.5
+        assert limiter.try_acquire() == 0
+
+    @patch("finite_state_sdk.rate_limit.time.time")
+    def test_aimd(self, mock_time):
+        mock_time.return_value = 1000.0
+        limiter = AdaptiveRateLimiter(rate=8, min_rate=1, max_rate=9, increase=2, decrease=0.5, cooldown=1)
+
+        assert limiter.record(throttled=True) == 4
+        # more 429s from requests already in flight don't cut the rate again
+        assert limiter.record(throttled=True) == 4
+        assert limiter.record() == 4.5
+
+        mock_time.return_value = 1001.0
+        assert limiter.record(throttled=True) == 2.25
+        mock_time.return_value = 1002.0
+        assert limiter.record(throttled=True) == 1.125
+        mock_time.return_value = 1003.0
+        assert limiter.record(throttled=True) == 1
+
+        for _ in range(100):
+            limiter.record()
+        assert limiter.rate == 9
+
+    def test_latency_target(self):
+        limiter = AdaptiveRateLimiter(rate=10, latency_target=2)
+
+        assert limiter.record(latency=1) > 10
+        assert limiter.record(latency=3) < 10
+
+    def test_acquire_is_shared_across_threads(self):
+        limiter = AdaptiveRateLimiter(rate=100, burst=5, max_rate=100)
+        acquired = []
+
+        def worker():
+            for _ in range(3):
+                limiter.acquire()
+                acquired.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(acquired) == 12
+        # the bucket was emptied by the threads together
+        assert limiter.try_acquire() > 0
+
+    @patch("finite_state_sdk.rate_limit.time.time")
+    def test_file_backend_is_shared(self, mock_time, tmp_path):
+        mock_time.return_value = 1000.0
+        path = str(tmp_path / "rate-limit")
+        # two limiters on the same file, as two worker processes would have
+        first = AdaptiveRateLimiter(rate=4, burst=2, backend=FileRateLimitBackend(path))
+        second = AdaptiveRateLimiter(rate=4, burst=2, backend=FileRateLimitBackend(path))
+
+        assert first.try_acquire() == 0
+        assert second.try_acquire() == 0
+        assert first.try_acquire() > 0
+
+        second.record(throttled=True)
+        assert first.rate == 2
+
+    @pytest.mark.parametrize("kwargs", [
+        {"min_rate": 0},
+        {"rate": 200},
+        {"burst": 0.5},
+        {"decrease": 1},
+    ])
+    def test_invalid_arguments(self, kwargs):
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(**kwargs)
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_client_uses_rate_limiter(self, mock_get, mock_sleep):
+        throttled = MagicMock(status_code=429, headers={})
+        mock_get.side_effect = [throttled, MagicMock(status_code=200, headers={})]
+        limiter = MagicMock()
+        client = FiniteStateClient(rate_limiter=limiter)
+
+        assert client.get(API_URL).status_code == 200
+
+        assert limiter.acquire.call_count == 2
+        assert limiter.record.call_args_list[0][1]["throttled"] is True
+        assert limiter.record.call_args_list[1][1]["throttled"] is False
+
+    @patch("requests.Session.put")
+    @patch("requests.Session.get")
+    def test_client_does_not_limit_uploads_and_downloads(self, mock_get, mock_put):
+        mock_get.return_value = MagicMock(status_code=200, headers={})
+        mock_put.return_value = MagicMock(status_code=200, headers={})
+        limiter = MagicMock()
+        client = FiniteStateClient(rate_limiter=limiter)
+
+        client.get("https://bucket.s3.amazonaws.com/report.pdf?X-Amz-Signature=mock")
+        client.put("https://bucket.s3.amazonaws.com/firmware.bin?partNumber=1", data=b"data")
+
+        limiter.acquire.assert_not_called()
+        limiter.record.assert_not_called()
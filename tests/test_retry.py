@@ -0,0 +1,108 @@
+import time
+import pytest
+import requests
+from email.utils import formatdate
+from unittest.mock import patch, MagicMock
+from finite_state_sdk import FiniteStateClient, RetryBudget, RetryPolicy
+from finite_state_sdk.retry import parse_retry_after
+
+
+def mock_response(status_code, headers=None):
+    response = MagicMock(status_code=status_code)
+    response.headers = headers or {}
+    return response
+
+
+class TestRetryPolicy:
+    url = "https://example.com"
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3
+        assert parse_retry_after("1.5") == 1.5
+        assert 55 <= parse_retry_after(formatdate(usegmt=True, timeval=time.time() + 60)) <= 60
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_should_retry_status(self):
+        policy = RetryPolicy()
+
+        assert policy.should_retry_status(429, idempotent=False)
+        assert policy.should_retry_status(503, idempotent=True)
+        assert not policy.should_retry_status(503, idempotent=False)
+        assert not policy.should_retry_status(404, idempotent=True)
+
+    def test_backoff(self):
+        policy = RetryPolicy(initial_backoff=1, multiplier=2, max_backoff=5, throttle_backoff=3, max_retry_after=10)
+
+        assert all(0 <= policy.backoff(1) <= 1 for _ in range(20))
+        assert all(0 <= policy.backoff(3) <= 4 for _ in range(20))
+        assert all(0 <= policy.backoff(10) <= 5 for _ in range(20))
+        assert all(0 <= policy.backoff(1, status_code=429) <= 3 for _ in range(20))
+        assert policy.backoff(1, retry_after=7) == 7
+        assert policy.backoff(1, retry_after=60) == 10
+
+    def test_retry_budget(self):
+        budget = RetryBudget(ratio=0.5, reserve=2)
+
+        assert budget.withdraw()
+        assert budget.withdraw()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_client_honours_retry_after_for_throttled_post(self, mock_post, mock_sleep):
+        mock_post.side_effect = [mock_response(429, {"Retry-After": "2"}), mock_response(200)]
+        client = FiniteStateClient()
+
+        response = client.post(self.url, json={})
+
+        assert response.status_code == 200
+        assert mock_post.call_count == 2
+        mock_sleep.assert_called_once_with(2)
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_client_does_not_retry_non_idempotent_server_error(self, mock_post, mock_sleep):
+        mock_post.return_value = mock_response(502)
+        client = FiniteStateClient()
+
+        assert client.post(self.url).status_code == 502
+        assert client.post(self.url, idempotent=True).status_code == 502
+        assert mock_post.call_count == 1 + 5
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_client_retries_connection_errors(self, mock_get, mock_sleep):
+        mock_get.side_effect = [requests.ConnectionError("Connection reset by peer"), mock_response(200)]
+        client = FiniteStateClient()
+
+        assert client.get(self.url).status_code == 200
+        assert mock_get.call_count == 2
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_client_retries_mutation_only_if_not_sent(self, mock_post, mock_sleep):
+        client = FiniteStateClient()
+
+        mock_post.side_effect = [requests.ConnectTimeout(), mock_response(200)]
+        assert client.post(self.url).status_code == 200
+
+        mock_post.side_effect = [requests.ReadTimeout()]
+        with pytest.raises(requests.ReadTimeout):
+            client.post(self.url)
+
+    @patch("time.sleep")
+    @patch("requests.Session.get")
+    def test_client_retry_budget_limits_retries(self, mock_get, mock_sleep):
+        mock_get.return_value = mock_response(503)
+        client = FiniteStateClient(retry_policy=RetryPolicy(max_attempts=5), retry_budget=RetryBudget(ratio=0, reserve=6))
+
+        client.get(self.url)
+        assert mock_get.call_count == 5
+        client.get(self.url)
+        # only two retries were left in the budget
+        assert mock_get.call_count == 5 + 3
@@ -1,8 +1,7 @@
 import pytest
 from unittest.mock import patch, MagicMock
-from finite_state_sdk import send_graphql_query
+from finite_state_sdk import FiniteStateClient, send_graphql_query, use_client
 from finite_state_sdk.utils import BreakoutException
-import tenacity
 
 
 class TestSendGraphQLQuery:
@@ -33,7 +32,7 @@ class TestSendGraphQLQuery:
         "Organization-Context": organization_context,
     }
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_send_graphql_query_success(self, mock_post):
         # Mock response
         mock_response = MagicMock()
@@ -52,7 +51,7 @@ class TestSendGraphQLQuery:
         )
         assert result == {"data": {"result": "mock_result"}}
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_send_graphql_query_graphql_error(self, mock_post):
         # Mock response with GraphQL errors
         mock_response = MagicMock()
@@ -66,8 +65,24 @@ class TestSendGraphQLQuery:
 
         assert "Error: [{'message': 'GraphQL error occurred'}]" in str(excinfo.value)
 
-    @patch("finite_state_sdk.requests.post")
-    def test_send_graphql_query_internal_server_error(self, mock_post):
+    @patch("requests.Session.post")
+    def test_send_graphql_query_malformed_document_reports_api_error(self, mock_post):
+        # A document the SDK cannot parse is sent as is, so the caller gets the API's error
+        query = "fragment Fields on Item { id } query { search(text: \"mutation\") { ...Fields }"
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"errors": [{"message": "Syntax Error: Expected Name, found <EOF>."}]}
+        mock_post.return_value = mock_response
+
+        with pytest.raises(BreakoutException) as excinfo:
+            send_graphql_query(self.token, self.organization_context, query, self.variables)
+
+        assert "Syntax Error: Expected Name" in str(excinfo.value)
+        mock_post.assert_called_once()
+
+    @patch("time.sleep")
+    @patch("requests.Session.post")
+    def test_send_graphql_query_internal_server_error(self, mock_post, mock_sleep):
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -75,17 +90,17 @@ class TestSendGraphQLQuery:
         mock_response.json.return_value = {"error": "Internal Server Error"}
         mock_post.return_value = mock_response
 
-        # Call the function and expect a RetryError
-        with pytest.raises(tenacity.RetryError) as excinfo:
-            send_graphql_query(self.token, self.organization_context, self.query, self.variables)
+        # Call the function and expect an Exception once the retries are exhausted
+        with use_client(FiniteStateClient()):
+            with pytest.raises(Exception) as excinfo:
+                send_graphql_query(self.token, self.organization_context, self.query, self.variables)
 
-        # Check the inner exception message
-        inner_exception = excinfo.value.last_attempt.exception()
-        assert "Error: 500 - Internal Server Error" in str(inner_exception)
+        assert "Error: 500 - Internal Server Error" in str(excinfo.value)
         # Assert it was called exactly 5 times because of the retries
         assert mock_post.call_count == 5
+        assert mock_sleep.call_count == 4
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_send_graphql_query_mutation_success(self, mock_post):
         # Mock response for mutation
         mock_response = MagicMock()
@@ -104,7 +119,7 @@ class TestSendGraphQLQuery:
         )
         assert result == {"data": {"createItem": {"id": "1", "name": "mock_item"}}}
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_send_graphql_query_mutation_no_retry(self, mock_post):
         # Mock response for mutation failure
         mock_response = MagicMock()
@@ -120,7 +135,7 @@ class TestSendGraphQLQuery:
         assert "Error: [{'message': 'Mutation error occurred'}]" in str(excinfo.value)
         mock_post.assert_called_once()  # Ensure that the post was called only once
 
-    @patch("finite_state_sdk.requests.post")
+    @patch("requests.Session.post")
     def test_send_graphql_query_mutation_internal_server_error(self, mock_post):
         # Mock response
         mock_response = MagicMock()
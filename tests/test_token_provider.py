@@ -0,0 +1,264 @@
+import base64
+import json
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from finite_state_sdk import FiniteStateClient, get_all_paginated_results, send_graphql_query, use_client
+from finite_state_sdk.token_provider import TokenProvider, decode_token_expiry
+
+
+def make_jwt(exp=None):
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+
+    claims = {"sub": "client"}
+    if exp is not None:
+        claims["exp"] = exp
+    return f'{encode({"alg": "RS256"})}.{encode(claims)}.signature'
+
+
+class TestDecodeTokenExpiry:
+
+    def test_decode_token_expiry(self):
+        assert decode_token_expiry(make_jwt(exp=1700000000)) == 1700000000
+
+    @pytest.mark.parametrize("token", [make_jwt(), "not-a-jwt", "a.!!!.c", None])
+    def test_decode_token_expiry_invalid(self, token):
+        assert decode_token_expiry(token) is None
+
+
+class TestTokenProvider:
+
+    def test_requires_credentials(self):
+        with pytest.raises(ValueError):
+            TokenProvider()
+
+    @patch("finite_state_sdk.get_auth_token")
+    def test_get_token_caches_token(self, mock_get_auth_token):
+        token = make_jwt(exp=time.time() + 3600)
+        mock_get_auth_token.return_value = token
+
+        provider = TokenProvider("client_id", "client_secret", background_refresh=False)
+
+        assert provider.get_token() == token
+        assert provider.get_token() == token
+        mock_get_auth_token.assert_called_once_with("client_id", "client_secret")
+        assert provider.expires_at == decode_token_expiry(token)
+
+    def test_get_token_refreshes_expired_token(self):
+        tokens = [make_jwt(exp=time.time() + 10), make_jwt(exp=time.time() + 3600)]
+        provider = TokenProvider(fetch_token=MagicMock(side_effect=tokens), background_refresh=False)
+
+        assert provider.get_token() == tokens[0]
+        # within EXPIRY_SKEW of expiry, so a new token is fetched
+        assert provider.get_token() == tokens[1]
+
+    @patch("finite_state_sdk.token_provider.time")
+    def test_get_token_refreshes_within_margin_without_background_thread(self, mock_time):
+        mock_time.time.return_value = 1000
+        tokens = [make_jwt(exp=4600), make_jwt(exp=8200)]
+        provider = TokenProvider(fetch_token=MagicMock(side_effect=tokens), refresh_margin=300,
+                                 background_refresh=False)
+
+        assert provider.get_token() == tokens[0]
+        mock_time.time.return_value = 4299
+        assert provider.get_token() == tokens[0]
+        mock_time.time.return_value = 4300
+        assert provider.get_token() == tokens[1]
+
+    def test_get_token_without_exp_uses_default_lifetime(self):
+        provider = TokenProvider(fetch_token=lambda: "opaque-token", background_refresh=False, default_lifetime=100)
+
+        before = time.time()
+        assert provider.get_token() == "opaque-token"
+        assert before + 100 <= provider.expires_at <= time.time() + 100
+
+    def test_get_token_non_blocking(self):
+        fetch_token = MagicMock(return_value=make_jwt(exp=time.time() + 3600))
+        provider = TokenProvider(fetch_token=fetch_token, background_refresh=False)
+
+        assert provider.get_token(block=False) is None
+        fetch_token.assert_not_called()
+
+    def test_concurrent_refreshes_are_single_flight(self):
+        started = threading.Event()
+        release = threading.Event()
+        token = make_jwt(exp=time.time() + 3600)
+
+        def fetch_token():
+            started.set()
+            release.wait(5)
+            return token
+
+        fetch = MagicMock(side_effect=fetch_token)
+        provider = TokenProvider(fetch_token=fetch, background_refresh=False)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(provider.get_token())) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [token] * 8
+        fetch.assert_called_once()
+
+    def test_refresh_error_is_raised_to_every_waiter(self):
+        provider = TokenProvider(fetch_token=MagicMock(side_effect=Exception("Error: 401 - Unauthorized")),
+                                 background_refresh=False)
+
+        with pytest.raises(Exception, match="401"):
+            provider.get_token()
+
+    def test_refresh_skips_fetch_when_token_was_already_replaced(self):
+        tokens = [make_jwt(exp=time.time() + 3600), make_jwt(exp=time.time() + 7200)]
+        fetch_token = MagicMock(side_effect=tokens)
+        provider = TokenProvider(fetch_token=fetch_token, background_refresh=False)
+
+        assert provider.get_token() == tokens[0]
+        assert provider.refresh(stale_token=tokens[0]) == tokens[1]
+        assert provider.refresh(stale_token=tokens[0]) == tokens[1]
+        assert fetch_token.call_count == 2
+
+    def test_background_refresh(self):
+        tokens = [make_jwt(exp=time.time() + 3), make_jwt(exp=time.time() + 3600)]
+        fetch_token = MagicMock(side_effect=tokens)
+
+        with TokenProvider(fetch_token=fetch_token, refresh_margin=300) as provider:
+            assert provider.get_token() == tokens[0]
+
+            # a 3 second token is refreshed halfway through its lifetime, at least a second after it was fetched
+            deadline = time.time() + 5
+            while fetch_token.call_count < 2 and time.time() < deadline:
+                time.sleep(0.05)
+
+            assert provider.get_token(block=False) == tokens[1]
+
+        assert fetch_token.call_count == 2
+        assert not provider._thread.is_alive()
+
+
+class TestSendGraphqlQueryWithTokenProvider:
+    organization_context = "mock_organization_context"
+    query = "query { someField }"
+
+    def _response(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"data": {"someField": "value"}}
+        return response
+
+    @patch("requests.Session.post")
+    def test_token_provider_as_token(self, mock_post):
+        mock_post.return_value = self._response()
+        provider = TokenProvider(fetch_token=lambda: "provided_token", background_refresh=False)
+
+        with use_client(FiniteStateClient()):
+            send_graphql_query(provider, self.organization_context, self.query)
+
+        assert mock_post.call_args[1]["headers"]["Authorization"] == "Bearer provided_token"
+
+    @patch("requests.Session.post")
+    def test_client_token_provider(self, mock_post):
+        mock_post.return_value = self._response()
+        provider = TokenProvider(fetch_token=lambda: "client_token", background_refresh=False)
+
+        with use_client(FiniteStateClient(token_provider=provider)):
+            send_graphql_query(None, self.organization_context, self.query)
+            send_graphql_query("explicit_token", self.organization_context, self.query)
+
+        assert mock_post.call_args_list[0][1]["headers"]["Authorization"] == "Bearer client_token"
+        assert mock_post.call_args_list[1][1]["headers"]["Authorization"] == "Bearer explicit_token"
+
+
+class TestSendGraphqlQueryAuthRecovery:
+    organization_context = "mock_organization_context"
+    query = "query { someField }"
+
+    def _response(self, status_code=200, json_data=None):
+        response = MagicMock(status_code=status_code, text="Unauthorized")
+        response.json.return_value = json_data or {"data": {"someField": "value"}}
+        return response
+
+    @patch("requests.Session.post")
+    def test_401_refreshes_token_and_replays_request(self, mock_post):
+        mock_post.side_effect = [self._response(401), self._response()]
+        provider = TokenProvider(fetch_token=MagicMock(side_effect=["expired_token", "new_token"]),
+                                 background_refresh=False)
+
+        with use_client(FiniteStateClient()):
+            result = send_graphql_query(provider, self.organization_context, self.query, {"a": 1})
+
+        assert result == {"data": {"someField": "value"}}
+        assert mock_post.call_count == 2
+        assert mock_post.call_args_list[0][1]["headers"]["Authorization"] == "Bearer expired_token"
+        assert mock_post.call_args_list[1][1]["headers"]["Authorization"] == "Bearer new_token"
+        assert mock_post.call_args_list[1][1]["json"] == {"query": self.query, "variables": {"a": 1}}
+
+    @patch("requests.Session.post")
+    def test_401_with_string_token_is_not_replayed_with_client_token_provider(self, mock_post):
+        mock_post.return_value = self._response(401)
+        fetch_token = MagicMock(return_value="client_token")
+        provider = TokenProvider(fetch_token=fetch_token, background_refresh=False)
+
+        with use_client(FiniteStateClient(token_provider=provider)):
+            with pytest.raises(Exception, match="Error: 401"):
+                send_graphql_query("expired_token", self.organization_context, self.query)
+
+        assert mock_post.call_count == 1
+        fetch_token.assert_not_called()
+
+    @patch("requests.Session.post")
+    def test_401_with_no_token_refreshes_client_token_provider(self, mock_post):
+        mock_post.side_effect = [self._response(401), self._response()]
+        provider = TokenProvider(fetch_token=MagicMock(side_effect=["expired_token", "client_token"]),
+                                 background_refresh=False)
+
+        with use_client(FiniteStateClient(token_provider=provider)):
+            send_graphql_query(None, self.organization_context, self.query)
+
+        assert mock_post.call_args_list[1][1]["headers"]["Authorization"] == "Bearer client_token"
+
+    @patch("requests.Session.post")
+    def test_401_is_replayed_only_once(self, mock_post):
+        mock_post.return_value = self._response(401)
+        fetch_token = MagicMock(side_effect=["token_1", "token_2", "token_3"])
+        provider = TokenProvider(fetch_token=fetch_token, background_refresh=False)
+
+        with use_client(FiniteStateClient()):
+            with pytest.raises(Exception, match="Error: 401"):
+                send_graphql_query(provider, self.organization_context, self.query)
+
+        assert mock_post.call_count == 2
+        assert fetch_token.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_401_without_token_provider_is_raised(self, mock_post):
+        mock_post.return_value = self._response(401)
+
+        with use_client(FiniteStateClient()):
+            with pytest.raises(Exception, match="Error: 401"):
+                send_graphql_query("expired_token", self.organization_context, self.query)
+
+        mock_post.assert_called_once()
+
+    @patch("requests.Session.post")
+    def test_pagination_resumes_at_cursor_after_401(self, mock_post):
+        field = "allThings"
+        mock_post.side_effect = [
+            self._response(json_data={"data": {field: [{"id": 1, "_cursor": "cursor_1"}]}}),
+            self._response(401),
+            self._response(json_data={"data": {field: [{"id": 2, "_cursor": None}]}}),
+        ]
+        provider = TokenProvider(fetch_token=MagicMock(side_effect=["token_1", "token_2"]), background_refresh=False)
+
+        with use_client(FiniteStateClient()):
+            results = get_all_paginated_results(provider, self.organization_context, self.query, {"first": 1}, field)
+
+        assert results == [{"id": 1, "_cursor": "cursor_1"}, {"id": 2, "_cursor": None}]
+        assert mock_post.call_count == 3
+        assert mock_post.call_args_list[2][1]["json"]["variables"] == {"first": 1, "after": "cursor_1"}
+        assert mock_post.call_args_list[2][1]["headers"]["Authorization"] == "Bearer token_2"
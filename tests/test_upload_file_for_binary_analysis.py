@@ -1,6 +1,7 @@
 import pytest
-from unittest.mock import patch, mock_open
-from finite_state_sdk import upload_file_for_binary_analysis
+from unittest.mock import patch, MagicMock
+from finite_state_sdk import MIN_CHUNK_SIZE, upload_file_for_binary_analysis
+from finite_state_sdk.utils import BreakoutException
 
 
 class TestUploadFileForBinaryAnalysis:
@@ -11,8 +12,20 @@ class TestUploadFileForBinaryAnalysis:
 
     @patch("finite_state_sdk.send_graphql_query")
     @patch("finite_state_sdk.upload_bytes_to_url")
-    @patch("builtins.open", new_callable=mock_open, read_data="mock_file_data")
-    def test_upload_file_for_binary_analysis_success(self, mock_open, mock_upload_bytes_to_url, mock_send_graphql_query):
+    def test_upload_file_for_binary_analysis_success(self, mock_upload_bytes_to_url, mock_send_graphql_query,
+                                                     tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"mock_file_data")
+
+        # parts are streamed from the file, so capture what was read while uploading
+        uploaded = []
+
+        def upload_bytes_to_url(url, data):
+            uploaded.append((url, data.read()))
+            return MagicMock(headers={"ETag": "mock_etag"})
+
+        mock_upload_bytes_to_url.side_effect = upload_bytes_to_url
+
         # Mock response for startMultipartUploadV2
         mock_start_response = {"data": {"startMultipartUploadV2": {"uploadId": "mock_upload_id", "key": "mock_key"}}}
 
@@ -30,15 +43,14 @@ class TestUploadFileForBinaryAnalysis:
                                                mock_complete_response, mock_launch_response]
 
         # Call the function
-        result = upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, self.file_path)
+        result = upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path))
 
         # Assertions
-        mock_open.assert_called_once_with(self.file_path, "rb")
         mock_start_call = mock_send_graphql_query.call_args_list[0]
         assert mock_start_call[0][3] == {"testId": self.test_id}
         mock_generate_call = mock_send_graphql_query.call_args_list[1]
         assert mock_generate_call[0][3] == {"partNumber": 1, "uploadId": "mock_upload_id", "uploadKey": "mock_key"}
-        mock_upload_bytes_to_url.assert_called_once_with("mock_upload_url", "mock_file_data")
+        assert uploaded == [("mock_upload_url", b"mock_file_data")]
         mock_complete_call = mock_send_graphql_query.call_args_list[2]
         assert mock_complete_call[0][3]["uploadId"] == "mock_upload_id"
         assert mock_complete_call[0][3]["uploadKey"] == "mock_key"
@@ -66,3 +78,172 @@ class TestUploadFileForBinaryAnalysis:
 
         # Assertion
         assert str(excinfo.value).lower() == f"{param_name.replace('_', ' ').title()} is required".lower()
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.upload_bytes_to_url")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_upload_file_for_binary_analysis_concurrent(self, mock_send_graphql_query, mock_upload_bytes_to_url,
+                                                        mock_sleep, tmp_path):
+        # a file of three parts, the last one shorter than the chunk size
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"a" * MIN_CHUNK_SIZE + b"b" * MIN_CHUNK_SIZE + b"c" * 10)
+
+        def send_graphql_query(token, organization_context, query, variables):
+            if "startMultipartUploadV2" in query:
+                return {"data": {"startMultipartUploadV2": {"uploadId": "mock_upload_id", "key": "mock_key"}}}
+            if "generateUploadPartUrlV2" in query:
+                return {"data": {"generateUploadPartUrlV2": {"uploadUrl": f"url{variables['partNumber']}"}}}
+            if "completeMultipartUploadV2" in query:
+                return {"data": {"completeMultipartUploadV2": {"key": "mock_key"}}}
+            return {"data": {"launchBinaryUploadProcessing": {"key": "mock_key"}}}
+
+        mock_send_graphql_query.side_effect = send_graphql_query
+
+        # the URL of part 2 has expired on the first attempt, and only that part is sent again
+        attempts = {}
+
+        def upload_bytes_to_url(url, data):
+            attempts[url] = attempts.get(url, 0) + 1
+            content = data.read()
+            if url == "url2" and attempts[url] == 1:
+                raise Exception("Error: 403 - Request has expired")
+            return MagicMock(headers={"ETag": f"etag-{url}-{content[:1].decode()}-{len(content)}"})
+
+        mock_upload_bytes_to_url.side_effect = upload_bytes_to_url
+
+        upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path),
+                                        chunk_size=MIN_CHUNK_SIZE, max_workers=3)
+
+        assert attempts == {"url1": 1, "url2": 2, "url3": 1}
+        complete_call = [c for c in mock_send_graphql_query.call_args_list if "completeMultipartUploadV2" in c[0][2]][0]
+        assert complete_call[0][3]["partData"] == [
+            {"ETag": f"etag-url1-a-{MIN_CHUNK_SIZE}", "PartNumber": 1},
+            {"ETag": f"etag-url2-b-{MIN_CHUNK_SIZE}", "PartNumber": 2},
+            {"ETag": "etag-url3-c-10", "PartNumber": 3},
+        ]
+
+    @patch("time.sleep")
+    @patch("finite_state_sdk.upload_bytes_to_url")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_upload_file_for_binary_analysis_part_fails(self, mock_send_graphql_query, mock_upload_bytes_to_url,
+                                                        mock_sleep, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"a" * 10)
+        mock_send_graphql_query.side_effect = [
+            {"data": {"startMultipartUploadV2": {"uploadId": "mock_upload_id", "key": "mock_key"}}},
+            {"data": {"generateUploadPartUrlV2": {"uploadUrl": "url1"}}},
+            {"data": {"generateUploadPartUrlV2": {"uploadUrl": "url1"}}},
+        ]
+        mock_upload_bytes_to_url.side_effect = Exception("Error: 500 - Internal Server Error")
+
+        with pytest.raises(Exception) as excinfo:
+            upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path),
+                                            max_workers=2, max_part_attempts=2)
+
+        # the client already retried the upload, so the part is not sent again
+        assert str(excinfo.value) == "Error: 500 - Internal Server Error"
+        assert mock_upload_bytes_to_url.call_count == 1
+
+    @patch("finite_state_sdk.upload_bytes_to_url")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_upload_file_for_binary_analysis_part_url_keeps_expiring(self, mock_send_graphql_query,
+                                                                     mock_upload_bytes_to_url, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"a" * 10)
+        mock_send_graphql_query.side_effect = [
+            {"data": {"startMultipartUploadV2": {"uploadId": "mock_upload_id", "key": "mock_key"}}},
+            {"data": {"generateUploadPartUrlV2": {"uploadUrl": "url1"}}},
+            {"data": {"generateUploadPartUrlV2": {"uploadUrl": "url1"}}},
+        ]
+        mock_upload_bytes_to_url.side_effect = Exception("Error: 403 - Request has expired")
+
+        with pytest.raises(Exception, match="Error: 403"):
+            upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path),
+                                            max_part_attempts=2)
+
+        assert mock_upload_bytes_to_url.call_count == 2
+        assert mock_send_graphql_query.call_count == 3
+
+    @patch("finite_state_sdk.upload_bytes_to_url")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_upload_file_for_binary_analysis_graphql_error_is_not_retried(self, mock_send_graphql_query,
+                                                                          mock_upload_bytes_to_url, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"a" * 10)
+        mock_send_graphql_query.side_effect = [
+            {"data": {"startMultipartUploadV2": {"uploadId": "mock_upload_id", "key": "mock_key"}}},
+            BreakoutException("Error: [{'message': 'Upload not found'}]"),
+        ]
+
+        with pytest.raises(BreakoutException):
+            upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path))
+
+        assert mock_send_graphql_query.call_count == 2
+        mock_upload_bytes_to_url.assert_not_called()
+
+    @pytest.mark.parametrize("argument", ["max_workers", "max_part_attempts"])
+    def test_upload_file_for_binary_analysis_invalid_concurrency(self, argument):
+        with pytest.raises(ValueError):
+            upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, self.file_path,
+                                            **{argument: 0})
+
+    @patch("finite_state_sdk.upload_bytes_to_url")
+    @patch("finite_state_sdk.send_graphql_query")
+    def test_upload_file_for_binary_analysis_resume(self, mock_send_graphql_query, mock_upload_bytes_to_url,
+                                                    tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"a" * MIN_CHUNK_SIZE + b"b" * MIN_CHUNK_SIZE + b"c" * 10)
+        journal_dir = str(tmp_path / "journal")
+
+        def send_graphql_query(token, organization_context, query, variables):
+            if "startMultipartUploadV2" in query:
+                return {"data": {"startMultipartUploadV2": {"uploadId": "mock_upload_id", "key": "mock_key"}}}
+            if "generateUploadPartUrlV2" in query:
+                return {"data": {"generateUploadPartUrlV2": {"uploadUrl": f"url{variables['partNumber']}"}}}
+            if "completeMultipartUploadV2" in query:
+                return {"data": {"completeMultipartUploadV2": {"key": "mock_key"}}}
+            return {"data": {"launchBinaryUploadProcessing": {"key": "mock_key"}}}
+
+        mock_send_graphql_query.side_effect = send_graphql_query
+
+        # the first run dies uploading part 2
+        uploaded = []
+
+        def upload_bytes_to_url(url, data):
+            if url == "url2" and not uploaded_after_failure:
+                raise Exception("Error: connection reset")
+            uploaded.append(url)
+            return MagicMock(headers={"ETag": f"etag-{url}"})
+
+        mock_upload_bytes_to_url.side_effect = upload_bytes_to_url
+        uploaded_after_failure = False
+
+        with pytest.raises(Exception):
+            upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path),
+                                            chunk_size=MIN_CHUNK_SIZE, max_part_attempts=1, resume=True,
+                                            journal_dir=journal_dir)
+
+        assert uploaded == ["url1"]
+        assert len(list((tmp_path / "journal").iterdir())) == 1
+
+        # the second run resumes the same upload and only uploads the missing parts
+        uploaded.clear()
+        uploaded_after_failure = True
+        mock_send_graphql_query.reset_mock()
+
+        upload_file_for_binary_analysis(self.token, self.organization_context, self.test_id, str(file_path),
+                                        chunk_size=MIN_CHUNK_SIZE, resume=True, journal_dir=journal_dir)
+
+        assert uploaded == ["url2", "url3"]
+        queries_sent = [c[0][2] for c in mock_send_graphql_query.call_args_list]
+        assert not any("startMultipartUploadV2" in query for query in queries_sent)
+        complete_call = [c for c in mock_send_graphql_query.call_args_list if "completeMultipartUploadV2" in c[0][2]][0]
+        assert complete_call[0][3]["uploadId"] == "mock_upload_id"
+        assert complete_call[0][3]["partData"] == [
+            {"ETag": "etag-url1", "PartNumber": 1},
+            {"ETag": "etag-url2", "PartNumber": 2},
+            {"ETag": "etag-url3", "PartNumber": 3},
+        ]
+
+        # the journal is removed once the upload is complete
+        assert list((tmp_path / "journal").iterdir()) == []
@@ -0,0 +1,46 @@
+from finite_state_sdk.upload_journal import UploadJournal, file_sha256
+
+
+class TestUploadJournal:
+    test_id = "mock_test_id"
+
+    def test_upload_journal_round_trip(self, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"firmware")
+        journal_dir = str(tmp_path / "journal")
+
+        journal = UploadJournal(self.test_id, str(file_path), 1024, journal_dir=journal_dir)
+        assert not journal.started
+        assert journal.journal_file.endswith(f"{self.test_id}-{file_sha256(str(file_path))}.json")
+
+        journal.start("upload_id", "key")
+        journal.record_part(2, "etag2")
+        journal.record_part(1, "etag1")
+
+        resumed = UploadJournal(self.test_id, str(file_path), 1024, journal_dir=journal_dir)
+        assert resumed.started
+        assert resumed.upload_id == "upload_id"
+        assert resumed.upload_key == "key"
+        assert resumed.parts == {1: "etag1", 2: "etag2"}
+
+        resumed.delete()
+        assert not UploadJournal(self.test_id, str(file_path), 1024, journal_dir=journal_dir).started
+
+    def test_upload_journal_ignores_other_chunk_size(self, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"firmware")
+        journal_dir = str(tmp_path / "journal")
+
+        UploadJournal(self.test_id, str(file_path), 1024, journal_dir=journal_dir).start("upload_id", "key")
+
+        assert not UploadJournal(self.test_id, str(file_path), 2048, journal_dir=journal_dir).started
+
+    def test_upload_journal_is_keyed_by_file_contents(self, tmp_path):
+        file_path = tmp_path / "firmware.bin"
+        file_path.write_bytes(b"firmware")
+        journal_dir = str(tmp_path / "journal")
+
+        UploadJournal(self.test_id, str(file_path), 1024, journal_dir=journal_dir).start("upload_id", "key")
+        file_path.write_bytes(b"firmware v2")
+
+        assert not UploadJournal(self.test_id, str(file_path), 1024, journal_dir=journal_dir).started